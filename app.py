@@ -1,8 +1,9 @@
 import streamlit as st
 import app_logic
-from steelpy import aisc
+from modules.catalog import load_catalog
+from modules.render import render_beam_section_png
 
-w_shapes_list = list(aisc.W_shapes.sections.keys())[::-1]
+w_shapes_list = load_catalog('W_shapes').names[::-1]
 
 st.header('Composite Beam Design')
 
@@ -45,7 +46,35 @@ with st.sidebar.expander(label='Uniform Loads', expanded=True):
     uniform_live = st.number_input(label='Live Load (kip/ft)', format=format_str, key='uniform_live', value=1.300) 
     uniform_const_live = st.number_input(label='Construction Live Load (kip/ft)', format=format_str, key='uniform_const_live', value=0.200) #amount of LL present during construction
 
+with st.sidebar.expander(label='Project', expanded=False):
+    st.file_uploader('Open project', type=['cbproj'], key='project_upload', on_change=app_logic.restore_project_inputs, args=(st.session_state,))
+    if st.session_state.get('project_error'):
+        st.error(st.session_state['project_error'])
+
 # st.write(st.session_state)
 
-calc_data = app_logic.calc_beam(st.session_state)
-st.write(calc_data)
\ No newline at end of file
+# The beam is calculated in the background so the inputs stay responsive. Results poll only while a calculation is pending.
+runner = app_logic.analysis_runner(st.session_state)
+app_logic.submit_calc_beam(st.session_state, runner)
+polling = runner.state().pending
+
+@st.fragment(run_every=0.5 if polling else None)
+def show_results():
+    state = runner.state()
+    if state.key is None:
+        with st.spinner('Calculating...'):
+            state = runner.wait()
+    elif polling and not state.pending:
+        st.rerun() # newest result is in, rerun once to stop polling
+
+    if state.pending:
+        st.caption('Recomputing...')
+    if state.error is not None:
+        st.error(f'Calculation failed: {state.error}')
+    if state.result is not None:
+        st.image(render_beam_section_png(state.result), caption=f'{state.result.shape.name} section')
+        st.write(state.result)
+        if not state.pending and state.error is None: # the result is of the current inputs
+            st.download_button('Save project', data=app_logic.project_bytes(state.result, dict(state.key)), file_name='composite_beam.cbproj')
+
+show_results()
\ No newline at end of file
@@ -1,8 +1,41 @@
 from modules.beam import CompositeSteelBeam
 from modules.load import UniformLoad
-from steelpy import aisc
+from modules.catalog import load_catalog
 from modules.material import Steel, Concrete
 import modules.load_factors as load_factors
+from modules.cache import LRUCache
+from modules.background import BackgroundRunner
+from modules.project import Project, ProjectWriter, beam_record
+from concurrent.futures import ThreadPoolExecutor
+import io
+import math
+import modules.instrument as instrument
+
+# Streamlit session_state keys read by generate_comp_beam. Together they fully define a design.
+DESIGN_INPUT_KEYS = (
+    'beam_length', 'beam_section', 'beam_fy', 'shored',
+    'left_cond', 'left_dist', 'right_cond', 'right_dist',
+    'stud_fu', 'stud_dia', 'stud_length', 'min_comp', 'max_comp',
+    'conc_thickness', 'fc', 'lightweight', 'deck_dir', 'deck_height',
+    'uniform_dead', 'uniform_const_dead', 'uniform_live', 'uniform_const_live',
+)
+
+# Design inputs shown by integer streamlit widgets, and the options of the stud diameter widget.
+INTEGER_INPUT_KEYS = ('beam_length', 'beam_fy', 'stud_fu', 'min_comp', 'max_comp', 'deck_dir')
+STUD_DIAMETERS = ('3/4"', '5/8"', '1/2"')
+
+# Load cases of the uniform load inputs, as created by generate_loads.
+UNIFORM_LOAD_INPUTS = {'D': 'uniform_dead', 'CD': 'uniform_const_dead', 'L': 'uniform_live', 'CL': 'uniform_const_live'}
+
+# Calculated beams shared by every session of the server process.
+calc_beam_cache = LRUCache(maxsize=256, max_age=60 * 60)
+
+# Seconds the background analysis waits for further input changes before it starts.
+ANALYSIS_DEBOUNCE = 0.3
+
+# Background analysis threads shared by every session of the server process. Streamlit drops sessions without a hook,
+# so per-session executors would never be shut down.
+analysis_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='calc_beam')
 
 def generate_loads(data: dict) -> list:
     '''
@@ -121,7 +154,7 @@ def generate_comp_beam(data: dict) -> CompositeSteelBeam:
     beam = CompositeSteelBeam(
         name = 'Composite Beam',
         span=data['beam_length'],
-        shape=getattr(aisc.W_shapes, data['beam_section']),
+        shape=load_catalog('W_shapes').section(data['beam_section']),
         shored=data['shored'],
         layout=((data['left_cond'], data['left_dist']), (data['right_cond'], data['right_dist'])),
         studs=studs,
@@ -133,38 +166,209 @@ def generate_comp_beam(data: dict) -> CompositeSteelBeam:
     
     return beam
 
-def calc_beam(data: dict) -> dict:
+def beam_summary(beam: CompositeSteelBeam) -> dict:
     '''
-    Calculates beam capacity and returns dictionary of outputs to be added to Streamlit App
+    Returns a flat dictionary of the governing results of an analyzed beam, suitable for tabular output.
+
+    Parameters:
+        beam (CompositeSteelBeam): analyzed CompositeSteelBeam object.
+
+    Returns:
+        dict: dictionary with the keys in SUMMARY_FIELDS.
     '''
-    comp_beam = generate_comp_beam(data)
-    comp_beam.analyze()
-    print('--------')
-    print(f'Flange is compact: {comp_beam.flange_is_compact()}')
-    print(f'Pre-composite moment strength: {comp_beam.calc_pre_comp_strength()} k*ft')
-    print(f'Pre-composite moment demand: {comp_beam.fea_beam.Members[comp_beam.name].max_moment('Mz', 'pre_comp_factored')} k*ft')
-    print(f'Full composite compression force: {comp_beam.calc_full_comp_C()} kips')
-    print(f'Depth of compressive stress block, a: {comp_beam.calc_stress_block_depth(comp_beam.calc_full_comp_C())} in')
-    print(f'Full Composite moment strength: {comp_beam.calc_full_comp_moment_capacity()} k*ft')
-    
-    
+    pre_comp_phi_Mn = beam.calc_pre_comp_strength()
+    pre_comp_Mu = beam.results.max_moment('pre_comp_factored')
+    full_comp_phi_Mn = beam.calc_full_comp_moment_capacity()
+    comp_Mu = beam.results.max_moment('comp_factored')
+    min_studs = beam.calc_min_studs(comp_Mu)
+
+    return {
+        'section': beam.shape.name,
+        'flange_is_compact': beam.flange_is_compact(),
+        'web_is_compact': beam.web_is_compact(),
+        'pre_comp_phi_Mn': pre_comp_phi_Mn,
+        'pre_comp_Mu': pre_comp_Mu,
+        'pre_comp_ratio': pre_comp_Mu / pre_comp_phi_Mn,
+        'full_comp_phi_Mn': full_comp_phi_Mn,
+        'comp_Mu': comp_Mu,
+        'comp_ratio': comp_Mu / full_comp_phi_Mn,
+        'studs_per_half_span': min_studs['studs_per_half_span'],
+        'percent_comp': min_studs['percent_comp'],
+        'passes': pre_comp_Mu <= pre_comp_phi_Mn and min_studs['adequate'],
+    }
+
+SUMMARY_FIELDS = (
+    'section', 'flange_is_compact', 'web_is_compact',
+    'pre_comp_phi_Mn', 'pre_comp_Mu', 'pre_comp_ratio',
+    'full_comp_phi_Mn', 'comp_Mu', 'comp_ratio',
+    'studs_per_half_span', 'percent_comp', 'passes',
+)
+
+def design_key(data: dict) -> tuple:
+    '''
+    Returns a canonical, hashable projection of the design inputs in the provided streamlit session data.
+    Keys other than DESIGN_INPUT_KEYS are ignored and numbers are normalized to float, so equal designs give equal keys.
+
+    Parameters:
+        data (dict): streamlit session_state dictionary of all data.
+
+    Returns:
+        tuple: design key.
+    '''
+    key = []
+    for name in DESIGN_INPUT_KEYS:
+        value = data[name]
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = float(value)
+        key.append((name, value))
+
+    return tuple(key)
+
+def calc_beam(data: dict) -> CompositeSteelBeam:
+    '''
+    Calculates beam capacity and returns the analyzed beam to be added to Streamlit App.
+    Results are memoized on design_key(data) in calc_beam_cache, so repeat evaluations of a design are returned from the cache.
+    Cached beams are shared between sessions and background threads, so they are frozen; refer to CompositeSteelBeam.freeze.
+    '''
+    return calc_beam_cache.get_or_compute(design_key(data), lambda: _calc_beam(data).freeze())
+
+def calc_beam_cache_info() -> dict:
+    '''
+    Returns hit, miss and size statistics of the calc_beam cache.
+    '''
+    return calc_beam_cache.info()
+
+def analysis_runner(session_state) -> BackgroundRunner:
+    '''
+    Returns the background calc_beam runner of a streamlit session, creating it on first use. Runners share analysis_executor.
+    '''
+    runner = session_state.get('analysis_runner')
+    if runner is None:
+        runner = session_state['analysis_runner'] = BackgroundRunner(calc_beam, debounce=ANALYSIS_DEBOUNCE, executor=analysis_executor)
+
+    return runner
+
+def submit_calc_beam(data: dict, runner: BackgroundRunner) -> bool:
+    '''
+    Submits the design in the provided streamlit session data to a background runner. Unchanged designs are not resubmitted.
+    The first design of a runner starts without waiting out the debounce window, since there is no result to show yet.
+
+    Returns:
+        bool: whether a new calculation was scheduled.
+    '''
+    key = design_key(data)
+    delay = 0.0 if runner.state().key is None else None
+    return runner.submit(key, dict(key), delay=delay)
+
+def project_bytes(beam: CompositeSteelBeam, inputs: dict) -> bytes:
+    '''
+    Returns a one beam project file of an analyzed beam, with its summary results and the design inputs it was calculated from.
+
+    Parameters:
+        beam (CompositeSteelBeam): analyzed beam.
+        inputs (dict): design inputs of the beam, e.g. dict(key) of the background run that produced it. Keys other than DESIGN_INPUT_KEYS are ignored.
+    '''
+    buffer = io.BytesIO()
+    with ProjectWriter(buffer) as writer:
+        writer.add(beam, summary=beam_summary(beam), inputs={name: inputs[name] for name in DESIGN_INPUT_KEYS})
+
+    return buffer.getvalue()
+
+def record_inputs(record: dict) -> dict:
+    '''
+    Returns the design inputs of a project record. Records written without inputs, e.g. by batch.py or write_project,
+    have their inputs derived from the stored beam.
+
+    Raises:
+        ValueError: the stored beam cannot be entered in the app, e.g. it has point loads or materials the app does not expose.
+    '''
+    if record['inputs']:
+        return {name: record['inputs'][name] for name in DESIGN_INPUT_KEYS if name in record['inputs']}
+
+    if record['section']['profile'] != 'W_shapes':
+        raise ValueError(f"its section is from the {record['section']['profile']} profile; the app designs W shapes.")
+
+    loads = dict.fromkeys(UNIFORM_LOAD_INPUTS, 0.0)
+    for load in record['loads']:
+        if load['type'] != 'UniformLoad' or load['start_loc'] > 0 or load['end_loc'] < record['span'] or load['load_case'] not in loads:
+            raise ValueError(f"its {load['name']} load is not a full length uniform {'/'.join(UNIFORM_LOAD_INPUTS)} load.")
+        loads[load['load_case']] += load['magnitude']
+
+    diameters = {str_fraction_to_float(diameter): diameter for diameter in STUD_DIAMETERS}
+    if record['studs']['dia'] not in diameters:
+        raise ValueError(f"its {record['studs']['dia']} in. stud diameter is not one of {', '.join(STUD_DIAMETERS)}.")
+
+    (left_cond, left_dist), (right_cond, right_dist) = record['layout']
+    inputs = {
+        'beam_length': record['span'],
+        'beam_section': record['section']['name'],
+        'beam_fy': record['steel_material']['fy'],
+        'shored': record['shored'],
+        'left_cond': left_cond, 'left_dist': left_dist, 'right_cond': right_cond, 'right_dist': right_dist,
+        'stud_fu': record['studs']['fu'],
+        'stud_dia': diameters[record['studs']['dia']],
+        'stud_length': record['studs']['length'],
+        'min_comp': record['studs']['min_comp'] * 100,
+        'max_comp': record['studs']['max_comp'] * 100,
+        'conc_thickness': record['deck']['t_s'],
+        'fc': record['concrete_material']['fc'],
+        'lightweight': record['concrete_material']['lw_mod_factor'] < 1.0,
+        'deck_dir': record['deck']['orientation'],
+        'deck_height': record['deck']['deck_height'],
+        **{name: loads[case] for case, name in UNIFORM_LOAD_INPUTS.items()},
+    }
+
+    for name in INTEGER_INPUT_KEYS:
+        if not math.isclose(inputs[name], round(inputs[name])):
+            raise ValueError(f'its {name} of {inputs[name]} is not a whole number.')
+
+    # Inputs the app does not expose, such as the material densities, must match the app's fixed values.
+    rebuilt = beam_record(generate_comp_beam(inputs))
+    for field in ('shored', 'layout', 'studs', 'deck', 'steel_material', 'concrete_material'):
+        stored = record[field]
+        if isinstance(stored, dict):
+            stored, expected = ({key: value for key, value in values.items() if key != 'name'} for values in (stored, rebuilt[field]))
+        else:
+            expected = rebuilt[field]
+        if stored != expected:
+            raise ValueError(f'its {field} {stored} cannot be entered in the app, which uses {expected}.')
 
-    # PNA = comp_beam.calc_PNA()
-    # C = comp_beam.calc_full_comp_C()
-    # a_full_comp = comp_beam.calc_stress_block_depth(C)
-    # print(f'{C=}')     
-    # print(f'{a_full_comp=}')
+    return inputs
 
-    # full_comp_phi_Mn = comp_beam.calc_full_comp_moment_capacity()
-    # print(f'{full_comp_phi_Mn=}')
+def restore_project_inputs(session_state, upload_key: str = 'project_upload') -> None:
+    '''
+    Copies the design inputs of the first beam of an uploaded project file into the streamlit session, so the widgets show the saved design.
+    Meant as the on_change callback of the upload widget, which runs before the widgets are created.
+    If the file cannot be opened in the app, the inputs are left unchanged and the reason is stored in session_state['project_error'].
+    '''
+    session_state['project_error'] = None
+    upload = session_state.get(upload_key)
+    if upload is None:
+        return
+
+    try:
+        project = Project.from_bytes(upload.getvalue())
+        if not len(project):
+            raise ValueError('it has no beams.')
+        inputs = record_inputs(project.record(0))
+    except ValueError as error:
+        session_state['project_error'] = f'{getattr(upload, "name", "The project")} cannot be opened: {error}'
+        return
+
+    for name, value in inputs.items():
+        session_state[name] = round(value) if name in INTEGER_INPUT_KEYS else value
+
+def _calc_beam(data: dict) -> CompositeSteelBeam:
+    '''
+    Calculates beam capacity without the cache.
+    '''
+    with instrument.span('calc_beam'):
+        comp_beam = generate_comp_beam(data)
+        comp_beam.analyze()
 
     #TODO: Consider adding button to run the analysis so that PyniteFEA doesn't have to run at each 
     # comp_beam.generate_analysis_model()
 
-    # load_combo = 'comp_factored'
-    # Mu = comp_beam.fea_beam.Members[comp_beam.name].max_moment('Mz', combo_name=load_combo)
-    # print(f'Max Bending Moment for {load_combo} = {Mu}')
-
     return comp_beam
     
 
@@ -0,0 +1,170 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+import app_logic
+import modules.instrument as instrument
+
+# Design inputs parsed as booleans or kept as text. Every other design input is parsed as a number.
+BOOL_INPUTS = ('shored', 'lightweight')
+TEXT_INPUTS = ('beam_section', 'left_cond', 'right_cond', 'stud_dia')
+
+RESULT_FIELDS = ('row', 'id') + app_logic.SUMMARY_FIELDS + ('error',)
+
+def read_rows(path: str):
+    '''
+    Yields (row number, design dict) for each design row of a CSV or JSONL file, one row at a time.
+    Rows use the streamlit session_state keys in app_logic.DESIGN_INPUT_KEYS, plus an optional 'id' column.
+    A JSONL line that cannot be decoded is yielded as {'error': ...}, so one bad line does not stop the batch.
+
+    Parameters:
+        path (str): path of a .csv or .jsonl file.
+    '''
+    with open(path, newline='') as f:
+        if path.endswith('.csv'):
+            for row_number, row in enumerate(csv.DictReader(f), start=1):
+                yield row_number, row
+        else:
+            for row_number, line in enumerate((line for line in f if line.strip()), start=1):
+                try:
+                    yield row_number, json.loads(line)
+                except json.JSONDecodeError as error:
+                    yield row_number, {'error': f'{type(error).__name__}: {error}'}
+
+def parse_design(row: dict) -> dict:
+    '''
+    Converts the values of a design row read from CSV text to the types generate_comp_beam expects. Values that already have the right type are kept.
+    '''
+    data = dict(row)
+    for key in app_logic.DESIGN_INPUT_KEYS:
+        value = data[key]
+        if not isinstance(value, str) or key in TEXT_INPUTS:
+            continue
+        if key in BOOL_INPUTS:
+            data[key] = value.strip().lower() in ('1', 'true', 'yes', 'y')
+        else:
+            data[key] = float(value)
+
+    return data
+
+def run_row(row_number: int, row: dict) -> dict:
+    '''
+    Builds and analyzes one beam through app_logic.generate_comp_beam and returns its result record.
+    Errors are returned as a record with an 'error' field instead of being raised. Rows read_rows could not decode
+    already hold their 'error' and are passed through.
+    '''
+    record = {'row': row_number, 'id': row.get('id')}
+    if 'error' in row:
+        record['error'] = row['error']
+        return record
+
+    try:
+        beam = app_logic.generate_comp_beam(parse_design(row))
+        beam.analyze()
+        record.update(app_logic.beam_summary(beam))
+    except Exception as error:
+        record['error'] = f'{type(error).__name__}: {error}'
+
+    return record
+
+def run_chunk(chunk: list) -> list:
+    '''
+    Runs a list of (row number, row) pairs in a worker process.
+    '''
+    return [run_row(row_number, row) for row_number, row in chunk]
+
+def run_batch(rows, workers: int = None, chunksize: int = 64, max_pending: int = None):
+    '''
+    Runs design rows over a process pool and yields result records as each chunk completes, not in input order.
+    Rows are read lazily and at most max_pending chunks are in flight, so memory stays bounded for any number of rows.
+
+    Parameters:
+        rows (iterable): (row number, design dict) pairs, e.g. from read_rows.
+        workers (int) Optional: number of worker processes. Defaults to the CPU count. 0 runs every row in this process.
+        chunksize (int) Optional = 64: rows sent to a worker at a time.
+        max_pending (int) Optional: chunks in flight at once. Defaults to twice the number of workers.
+    '''
+    rows = iter(rows)
+    chunks = iter(lambda: list(islice(rows, chunksize)), [])
+
+    if workers == 0:
+        for chunk in chunks:
+            yield from run_chunk(chunk)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk in chunks:
+            pending.add(executor.submit(run_chunk, chunk))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+class ResultWriter:
+    '''
+    Streams result records to a JSONL or CSV file, chosen by file extension, writing each record as it arrives.
+    '''
+    def __init__(self, path: str):
+        self.file = open(path, 'w', newline='') if path != '-' else sys.stdout
+        self.csv = None
+        if path.endswith('.csv'):
+            self.csv = csv.DictWriter(self.file, fieldnames=RESULT_FIELDS)
+            self.csv.writeheader()
+
+    def write(self, record: dict) -> None:
+        if self.csv is not None:
+            self.csv.writerow(record)
+        else:
+            self.file.write(json.dumps(record) + '\n')
+
+    def close(self) -> None:
+        if self.file is not sys.stdout:
+            self.file.close()
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description='Check composite beam designs from a CSV or JSONL file.')
+    parser.add_argument('input', help='.csv or .jsonl file of design rows using the app session_state keys.')
+    parser.add_argument('-o', '--output', default='-', help='.csv or .jsonl results file. Defaults to JSONL on stdout.')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(), help='worker processes, 0 to run in this process.')
+    parser.add_argument('-c', '--chunksize', type=int, default=64, help='rows sent to a worker at a time.')
+    parser.add_argument('-q', '--quiet', action='store_true', help='do not print progress.')
+    parser.add_argument('--trace', help='write a timing trace to this file, as Chrome trace JSON or folded stacks if it ends with .folded. Runs every row in this process.')
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        args.workers = 0
+        instrument.tracer.enabled = True
+
+    writer = ResultWriter(args.output)
+    processed = errors = 0
+    try:
+        for record in run_batch(read_rows(args.input), workers=args.workers, chunksize=args.chunksize):
+            writer.write(record)
+            processed += 1
+            errors += 'error' in record
+            if not args.quiet and processed % args.chunksize == 0:
+                print(f'\rprocessed {processed} rows, {errors} errors', end='', file=sys.stderr, flush=True)
+    finally:
+        writer.close()
+        if args.trace:
+            instrument.tracer.write(args.trace)
+
+    if not args.quiet:
+        print(f'\rprocessed {processed} rows, {errors} errors', file=sys.stderr)
+
+    return 0
+
+if __name__ == '__main__':
+    # Usage: python batch.py designs.csv -o results.jsonl [--workers N] [--chunksize N]
+    sys.exit(main())
@@ -0,0 +1,266 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import numpy as np
+
+# Reference baseline committed with the repo, recorded on the machine described in its 'machine' entry. Timings only
+# compare reliably on that machine; elsewhere, save a local baseline with --save --baseline <path> first and compare against it.
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Fixed design used by every beam workload, in streamlit session_state form.
+DESIGN = {
+    'beam_length': 30, 'beam_section': 'W16X26', 'beam_fy': 50, 'shored': False,
+    'left_cond': 'Beam', 'left_dist': 8.0, 'right_cond': 'Beam', 'right_dist': 8.0,
+    'stud_fu': 65, 'stud_dia': '3/4"', 'stud_length': 5.0, 'min_comp': 25, 'max_comp': 100,
+    'conc_thickness': 3.5, 'fc': 4.0, 'lightweight': False, 'deck_dir': 90, 'deck_height': 3.0,
+    'uniform_dead': 0.5, 'uniform_const_dead': 0.5, 'uniform_live': 1.3, 'uniform_const_live': 0.2,
+}
+
+RENDER_SIZES = ((250, 150), (500, 300), (1000, 600))
+
+def _beam():
+    import app_logic
+    return app_logic.generate_comp_beam(DESIGN)
+
+def build_analyze(engine: str):
+    import app_logic
+
+    def run():
+        app_logic.generate_comp_beam(DESIGN).analyze(engine)
+    return run
+
+def factored_loads():
+    import modules.load_factors as load_factors
+    beam = _beam()
+    tables = [
+        load_factors.ASCE_7_LRFD_COMBOS,
+        load_factors.ASCE_7_SERVICE_COMBOS,
+        load_factors.ASCE_7_PRE_COMP_FACTORED_LOADS,
+        load_factors.ASCE_7_PRE_COMP_SERVICE_LOADS,
+    ]
+
+    def run():
+        for table in tables:
+            beam.generate_factored_loads(table)
+    return run
+
+def envelopes(n_combos: int = 50, n_points: int = 10_000):
+    import modules.load_factors as load_factors
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 30, n_points)
+    results_arrays = {f'LC{i}': np.array([x, rng.normal(size=n_points)]) for i in range(n_combos)}
+
+    def run():
+        load_factors.envelope_max(results_arrays)
+        load_factors.envelope_min(results_arrays)
+    return run
+
+def render(width: int, height: int):
+    from modules.render import render_beam_section
+    beam = _beam()
+
+    def run():
+        render_beam_section(beam, width, height)
+    return run
+
+def sprite_sheet():
+    from modules.catalog import load_catalog
+    from modules.render import render_section_sheet
+    catalog = load_catalog('W_shapes')
+    columns = [catalog.column(field) for field in ('bf', 'tf', 'tw', 'd')]
+
+    def run():
+        render_section_sheet(catalog.names, *columns)
+    return run
+
+def stiffness_load_sets(n_sets: int = 500):
+    from modules.analysis import StiffnessResults
+    from modules.stiffness import get_model
+    from modules.superposition import SpanLoads
+    beam = _beam()
+    rng = np.random.default_rng(0)
+    loads = {f'LC{i}': SpanLoads(beam.span, point_x=rng.uniform(0, beam.span, 4), point_P=rng.uniform(0, 10, 4), dist_start=[0.0], dist_end=[beam.span], dist_w=[rng.uniform(0, 2)]) for i in range(n_sets)}
+    EI = beam.steel_material.E * beam.shape.Ix
+
+    def run():
+        StiffnessResults(get_model(beam.span, EI), loads)
+    return run
+
+def section_sweep():
+    from modules.sweep import sweep_sections
+    beam = _beam()
+
+    def run():
+        sweep_sections(beam)
+    return run
+
+def vibration_sweep():
+    from modules.vibration import sweep_vibration
+    beam = _beam()
+    spans = np.arange(20.0, 46.0)
+
+    def run():
+        sweep_vibration(beam, spans)
+    return run
+
+def section_query():
+    from modules.section_index import get_section_index
+    index = get_section_index()
+
+    def run():
+        index.query(fy=50, compact_flange=True, compact_web=True, max_nominal_depth=21, min_Zx=60)
+    return run
+
+# Benchmark name: factory returning the function to time. Factories do the untimed setup.
+BENCHMARKS = {
+    'build_analyze_closed_form': lambda: build_analyze('closed_form'),
+    'build_analyze_stiffness': lambda: build_analyze('stiffness'),
+    'build_analyze_pynite': lambda: build_analyze('pynite'),
+    'stiffness_500_load_sets': stiffness_load_sets,
+    'factored_loads_all_tables': factored_loads,
+    'envelope_50x10000': envelopes,
+    **{f'render_section_{w}x{h}': (lambda w=w, h=h: render(w, h)) for w, h in RENDER_SIZES},
+    'catalog_sprite_sheet': sprite_sheet,
+    'catalog_section_sweep': section_sweep,
+    'catalog_section_query': section_query,
+    'catalog_vibration_sweep_26_spans': vibration_sweep,
+}
+
+def time_function(func, repeat: int = 5, min_time: float = 0.2) -> dict:
+    '''
+    Times a function like timeit: calls are looped until one repeat takes at least min_time, and the repeat is run repeat times.
+
+    Returns:
+        dict: {'loops': int, 'repeat': int, 'best_s': float, 'median_s': float}, times per call in seconds.
+    '''
+    func() # warm up caches and lazy imports
+
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+    times = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        times.append((time.perf_counter() - start) / loops)
+
+    return {'loops': loops, 'repeat': repeat, 'best_s': min(times), 'median_s': statistics.median(times)}
+
+def run_benchmarks(names: list = None, repeat: int = 5, min_time: float = 0.2, progress=None) -> dict:
+    '''
+    Runs the named benchmarks, or every benchmark in BENCHMARKS, and returns the results keyed by benchmark name.
+    '''
+    results = {}
+    for name in names or BENCHMARKS:
+        results[name] = time_function(BENCHMARKS[name](), repeat=repeat, min_time=min_time)
+        if progress:
+            progress(name, results[name])
+
+    return results
+
+def compare(results: dict, baseline: dict, threshold: float = 1.25) -> list:
+    '''
+    Compares benchmark results against a baseline by best time per call.
+
+    Parameters:
+        results (dict): current results from run_benchmarks.
+        baseline (dict): baseline results from run_benchmarks.
+        threshold (float) Optional = 1.25: ratio of current to baseline time above which a benchmark has regressed.
+
+    Returns:
+        list[dict]: one row per benchmark in both results: {'name', 'baseline_s', 'current_s', 'ratio', 'regressed'}
+    '''
+    rows = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result['best_s'] / baseline[name]['best_s']
+        rows.append({
+            'name': name,
+            'baseline_s': baseline[name]['best_s'],
+            'current_s': result['best_s'],
+            'ratio': ratio,
+            'regressed': ratio > threshold,
+        })
+
+    return rows
+
+def machine_info() -> dict:
+    '''
+    Returns a description of the current machine and Python, stored with saved baselines.
+    '''
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+    }
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.3g} {unit}'
+    return f'{seconds / 1e-9:.3g} ns'
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description='Run the benchmark suite and compare it against a saved baseline.')
+    parser.add_argument('names', nargs='*', help=f'benchmarks to run. Defaults to all: {", ".join(BENCHMARKS)}.')
+    parser.add_argument('--repeat', type=int, default=5, help='timed repeats per benchmark.')
+    parser.add_argument('--min-time', type=float, default=0.2, help='minimum seconds per repeat.')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline file path.')
+    parser.add_argument('--save', action='store_true', help='save the results as the new baseline.')
+    parser.add_argument('--threshold', type=float, default=1.25, help='slowdown ratio flagged as a regression.')
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f'unknown benchmarks: {", ".join(unknown)}')
+
+    def progress(name, result):
+        print(f'{name:<32} {_format_time(result["best_s"]):>10} best  {_format_time(result["median_s"]):>10} median  ({result["loops"]} loops)')
+
+    results = run_benchmarks(args.names, repeat=args.repeat, min_time=args.min_time, progress=progress)
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump({'machine': machine_info(), 'results': results}, f, indent=2)
+        print(f'Saved baseline to {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f'No baseline at {args.baseline}. Run with --save to create one.')
+        return 0
+
+    with open(args.baseline) as f:
+        saved = json.load(f)
+    baseline = saved['results']
+
+    if saved.get('machine') != machine_info():
+        print(f'\nBaseline {args.baseline} was recorded on a different machine: {saved.get("machine")}.')
+        print('Ratios are indicative only. For a reliable check, save a baseline on this machine before the change and compare after it.')
+
+    rows = compare(results, baseline, threshold=args.threshold)
+    print(f'\n{"benchmark":<32} {"baseline":>10} {"current":>10} {"ratio":>7}')
+    for row in rows:
+        flag = '  REGRESSED' if row['regressed'] else ''
+        print(f'{row["name"]:<32} {_format_time(row["baseline_s"]):>10} {_format_time(row["current_s"]):>10} {row["ratio"]:>7.2f}{flag}')
+
+    return 1 if any(row['regressed'] for row in rows) else 0
+
+if __name__ == '__main__':
+    # Usage: python -m benchmarks.suite [name ...] [--save] [--threshold 1.25] [--repeat N] [--min-time S]
+    sys.exit(main())
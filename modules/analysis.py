@@ -0,0 +1,355 @@
+import numpy as np
+import modules.instrument as instrument
+import modules.stiffness as stiffness
+from modules.superposition import SpanLoads
+
+class BeamResults:
+    '''
+    Analysis results of a beam, shared by every analysis engine.
+
+    Sign convention: gravity loads act downward, positive moment is sagging, positive shear is the left reaction side,
+    reactions are positive upward and positive deflection is downward.
+
+    Units: x coordinates in ft, moments in kip-ft, shears and reactions in kips, deflections in inches.
+    '''
+    def combos(self) -> list:
+        '''
+        Returns the list of load combination names available in the results.
+        '''
+        raise NotImplementedError
+
+    def moment_array(self, combo_name: str, n_points: int = 20) -> np.ndarray:
+        '''
+        Returns a 2 x n_points array where the first row is the x coordinates along the beam and the second row is the bending moment.
+        '''
+        raise NotImplementedError
+
+    def shear_array(self, combo_name: str, n_points: int = 20) -> np.ndarray:
+        '''
+        Returns a 2 x n_points array where the first row is the x coordinates along the beam and the second row is the shear.
+        '''
+        raise NotImplementedError
+
+    def deflection_array(self, combo_name: str, n_points: int = 20) -> np.ndarray:
+        '''
+        Returns a 2 x n_points array where the first row is the x coordinates along the beam and the second row is the deflection.
+        '''
+        raise NotImplementedError
+
+    def reactions(self, combo_name: str) -> tuple:
+        '''
+        Returns the (left, right) support reactions for the load combination.
+        '''
+        raise NotImplementedError
+
+    def max_moment(self, combo_name: str) -> float:
+        return self.moment_array(combo_name)[1].max()
+
+    def min_moment(self, combo_name: str) -> float:
+        return self.moment_array(combo_name)[1].min()
+
+    def max_shear(self, combo_name: str) -> float:
+        return self.shear_array(combo_name)[1].max()
+
+    def min_shear(self, combo_name: str) -> float:
+        return self.shear_array(combo_name)[1].min()
+
+    def max_deflection(self, combo_name: str) -> float:
+        return self.deflection_array(combo_name)[1].max()
+
+    def min_deflection(self, combo_name: str) -> float:
+        return self.deflection_array(combo_name)[1].min()
+
+class ClosedFormResults(BeamResults):
+    '''
+    Closed-form results of a simply supported beam by superposition of singularity functions. Any mix of full length and
+    partial uniform loads and point loads is evaluated on a shared grid in one vectorized pass per load combination.
+
+    Parameters:
+        span (float): beam span, ft
+        EI (float): flexural stiffness of the beam, kip*in^2
+        loads (dict): factored SpanLoads keyed by load combination name.
+    '''
+    def __init__(self, span: float, EI: float, loads: dict):
+        self.span = span
+        self.EI = EI
+        self.loads = loads
+
+    def combos(self) -> list:
+        return list(self.loads)
+
+    def diagrams(self, combo_name: str, n_points: int = 20) -> dict:
+        '''
+        Returns the x coordinates, shear, moment and deflection of a load combination on a shared grid. Refer to SpanLoads.diagrams.
+        '''
+        return self.loads[combo_name].diagrams(self.EI, n_points)
+
+    def moment_array(self, combo_name: str, n_points: int = 20) -> np.ndarray:
+        x = np.linspace(0, self.span, n_points)
+        return np.array([x, self.loads[combo_name].moment(x)])
+
+    def shear_array(self, combo_name: str, n_points: int = 20) -> np.ndarray:
+        x = np.linspace(0, self.span, n_points)
+        return np.array([x, self.loads[combo_name].shear(x)])
+
+    def deflection_array(self, combo_name: str, n_points: int = 20) -> np.ndarray:
+        x = np.linspace(0, self.span, n_points)
+        return np.array([x, self.loads[combo_name].deflection(x, self.EI)])
+
+    def reactions(self, combo_name: str) -> tuple:
+        return self.loads[combo_name].reactions()
+
+    def max_moment(self, combo_name: str) -> float:
+        loads = self.loads[combo_name]
+        return float(loads.moment(loads.critical_x()).max())
+
+    def min_moment(self, combo_name: str) -> float:
+        loads = self.loads[combo_name]
+        return float(loads.moment(loads.critical_x()).min())
+
+    def max_shear(self, combo_name: str) -> float:
+        return float(self.loads[combo_name].extreme_shears().max())
+
+    def min_shear(self, combo_name: str) -> float:
+        return float(self.loads[combo_name].extreme_shears().min())
+
+    def max_deflection(self, combo_name: str) -> float:
+        return float(self.loads[combo_name].extreme_deflections(self.EI)[0])
+
+    def min_deflection(self, combo_name: str) -> float:
+        return float(self.loads[combo_name].extreme_deflections(self.EI)[1])
+
+class PyNiteResults(BeamResults):
+    '''
+    Results of a PyNite FEModel3D beam model, converted to the BeamResults sign convention and units.
+
+    The PyNite model is built with the span in ft, loads in klf and section properties in inches, so deflections are
+    converted to inches by a factor of 12^3. Loads are applied in the positive local y direction.
+
+    Parameters:
+        model (FEModel3D): analyzed PyNite model.
+        member_name (str): name of the beam member in the model.
+    '''
+    def __init__(self, model, member_name: str):
+        self.model = model
+        self.member_name = member_name
+        self.member = model.Members[member_name]
+
+    def combos(self) -> list:
+        return list(self.model.LoadCombos)
+
+    def moment_array(self, combo_name: str, n_points: int = 20) -> np.ndarray:
+        return np.array(self.member.moment_array('Mz', n_points, combo_name))
+
+    def shear_array(self, combo_name: str, n_points: int = 20) -> np.ndarray:
+        x, V = self.member.shear_array('Fy', n_points, combo_name)
+        return np.array([x, -V])
+
+    def deflection_array(self, combo_name: str, n_points: int = 20) -> np.ndarray:
+        x, dy = self.member.deflection_array('dy', n_points, combo_name)
+        return np.array([x, dy * 12**3])
+
+    def reactions(self, combo_name: str) -> tuple:
+        i_node = self.member.i_node
+        j_node = self.member.j_node
+        return (-i_node.RxnFY[combo_name], -j_node.RxnFY[combo_name])
+
+    def max_moment(self, combo_name: str) -> float:
+        return self.member.max_moment('Mz', combo_name)
+
+    def min_moment(self, combo_name: str) -> float:
+        return self.member.min_moment('Mz', combo_name)
+
+    def max_shear(self, combo_name: str) -> float:
+        return -self.member.min_shear('Fy', combo_name)
+
+    def min_shear(self, combo_name: str) -> float:
+        return -self.member.max_shear('Fy', combo_name)
+
+    def max_deflection(self, combo_name: str) -> float:
+        return self.member.max_deflection('dy', combo_name) * 12**3
+
+    def min_deflection(self, combo_name: str) -> float:
+        return self.member.min_deflection('dy', combo_name) * 12**3
+
+class StiffnessResults(BeamResults):
+    '''
+    Results of a factorized stiffness model, with every load combination solved as one right-hand side of the shared factorization.
+
+    Deflections are interpolated from the solved nodal displacements. Moments and shears are the simple span superposition
+    of the loads plus the linear moment diagram of the support end moments, so they are exact between nodes.
+
+    Parameters:
+        model (StiffnessModel): factorized model of the beam, e.g. from stiffness.get_model.
+        loads (dict): factored SpanLoads keyed by load combination name. Any number of load sets may be given.
+    '''
+    def __init__(self, model: stiffness.StiffnessModel, loads: dict):
+        self.model = model
+        self.span = model.span
+        self.loads = loads
+        self._columns = {combo_name: column for column, combo_name in enumerate(loads)}
+
+        F = model.load_vectors(list(loads.values()))
+        self.displacements = model.solve(F)
+        self.end_forces = model.end_forces(self.displacements, F)
+
+    def combos(self) -> list:
+        return list(self.loads)
+
+    def _end_moments(self, combo_name: str) -> tuple:
+        column = self._columns[combo_name]
+        return self.end_forces[2, column], self.end_forces[3, column]
+
+    def _shear_offset(self, combo_name: str) -> float:
+        M_left, M_right = self._end_moments(combo_name)
+        return (M_right - M_left) / self.span
+
+    def moment(self, combo_name: str, x) -> np.ndarray:
+        '''
+        Returns the bending moment of a load combination at x, ft, in kip-ft.
+        '''
+        x = np.asarray(x, dtype=float)
+        M_left, M_right = self._end_moments(combo_name)
+        return self.loads[combo_name].moment(x) + M_left * (1 - x / self.span) + M_right * x / self.span
+
+    def shear(self, combo_name: str, x, right: bool = True) -> np.ndarray:
+        '''
+        Returns the shear of a load combination at x, ft, in kips. Refer to SpanLoads.shear.
+        '''
+        return self.loads[combo_name].shear(x, right) + self._shear_offset(combo_name)
+
+    def moment_array(self, combo_name: str, n_points: int = 20) -> np.ndarray:
+        x = np.linspace(0, self.span, n_points)
+        return np.array([x, self.moment(combo_name, x)])
+
+    def shear_array(self, combo_name: str, n_points: int = 20) -> np.ndarray:
+        x = np.linspace(0, self.span, n_points)
+        return np.array([x, self.shear(combo_name, x)])
+
+    def deflection_array(self, combo_name: str, n_points: int = 20) -> np.ndarray:
+        x = np.linspace(0, self.span, n_points)
+        return np.array([x, self.model.deflections(self.displacements[:, self._columns[combo_name]], x)])
+
+    def reactions(self, combo_name: str) -> tuple:
+        column = self._columns[combo_name]
+        return float(self.end_forces[0, column]), float(self.end_forces[1, column])
+
+    def max_moment(self, combo_name: str) -> float:
+        return float(self.moment(combo_name, self.loads[combo_name].critical_x(self._shear_offset(combo_name))).max())
+
+    def min_moment(self, combo_name: str) -> float:
+        return float(self.moment(combo_name, self.loads[combo_name].critical_x(self._shear_offset(combo_name))).min())
+
+    def max_shear(self, combo_name: str) -> float:
+        return float(self.loads[combo_name].extreme_shears(self._shear_offset(combo_name)).max())
+
+    def min_shear(self, combo_name: str) -> float:
+        return float(self.loads[combo_name].extreme_shears(self._shear_offset(combo_name)).min())
+
+    def max_deflection(self, combo_name: str) -> float:
+        return float(self.deflection_array(combo_name, 4 * self.model.n_elements + 1)[1].max())
+
+    def min_deflection(self, combo_name: str) -> float:
+        return float(self.deflection_array(combo_name, 4 * self.model.n_elements + 1)[1].min())
+
+def analyze_closed_form(beam) -> ClosedFormResults:
+    '''
+    Analyzes a simply supported CompositeSteelBeam under its factored load dictionaries using closed-form solutions, superposing its uniform, partial uniform and point loads.
+    Uses the bare steel section stiffness, matching the PyNite model.
+
+    Parameters:
+        beam (CompositeSteelBeam): beam to analyze.
+
+    Returns:
+        ClosedFormResults: analysis results keyed by the factored load dictionary names.
+    '''
+    loads = {case_name: SpanLoads.from_factored_loads(beam.span, factored_loads) for case_name, factored_loads in beam.factored_loads.items()}
+    return ClosedFormResults(beam.span, beam.steel_material.E * beam.shape.Ix, loads)
+
+def analyze_stiffness(beam) -> StiffnessResults:
+    '''
+    Analyzes a simply supported CompositeSteelBeam under its factored load dictionaries with a factorized stiffness model.
+    The factorization is cached per span and stiffness in stiffness.model_cache, so re-analysis after a load change costs one
+    back-substitution for all load combinations. Uses the bare steel section stiffness, matching the PyNite model.
+
+    Parameters:
+        beam (CompositeSteelBeam): beam to analyze.
+
+    Returns:
+        StiffnessResults: analysis results keyed by the factored load dictionary names.
+    '''
+    model = stiffness.get_model(beam.span, beam.steel_material.E * beam.shape.Ix)
+    loads = {case_name: SpanLoads.from_factored_loads(beam.span, factored_loads) for case_name, factored_loads in beam.factored_loads.items()}
+    return StiffnessResults(model, loads)
+
+def analyze_pynite(beam) -> PyNiteResults:
+    '''
+    Generates and analyzes a PyNite FEA model of a simply supported CompositeSteelBeam under its factored load dictionaries.
+
+    Parameters:
+        beam (CompositeSteelBeam): beam to analyze.
+
+    Returns:
+        PyNiteResults: analysis results. The analyzed FEModel3D is available as the model attribute.
+    '''
+    with instrument.span('pynite.build_model'):
+        model = _build_pynite_model(beam)
+
+    # Run analysis on beam.
+    with instrument.span('pynite.analyze_linear'):
+        model.analyze_linear()
+
+    return PyNiteResults(model, beam.name)
+
+def _build_pynite_model(beam):
+    from PyNite import FEModel3D
+
+    # Create a new finite element model
+    model = FEModel3D()
+
+    # Add nodes
+    model.add_node('N1', 0, 0, 0)
+    model.add_node('N2', beam.span, 0, 0)
+
+    # Define a material
+    E = beam.steel_material.E               # Modulus of elasticity (ksi)
+    G = beam.steel_material.G               # Shear modulus of elasticity (ksi)
+    nu = beam.steel_material.poisson_ratio  # Poisson's ratio
+    rho = beam.steel_material.density / (1000 * 12**3)  # Density (kci)
+    model.add_material('Steel', E, G, nu, rho)
+
+    # Add beam with appropriate properties
+    model.add_member(name=beam.name, i_node='N1', j_node='N2', material_name='Steel', Iy=beam.shape.Iy, Iz=beam.shape.Ix, J=beam.shape.J, A=beam.shape.area)
+
+    # Provide simple supports
+    model.def_support('N1', True, True, True, False, False, False)
+    model.def_support('N2', True, True, True, True, False, False)
+
+    # Add loads
+    for case_name in beam.factored_loads:
+        # Add each type of load to analysis member
+        # UDLs
+        udl_magnitude = beam.factored_loads[case_name]['UDL']
+        udl_start = 0
+        udl_stop = beam.span
+        model.add_member_dist_load(member_name=beam.name, Direction='Fy', w1=udl_magnitude, w2=udl_magnitude, x1=udl_start, x2=udl_stop, case=case_name)
+
+        # Partial length uniform loads
+        for start, end, magnitude in beam.factored_loads[case_name].get('partial_loads', []):
+            model.add_member_dist_load(member_name=beam.name, Direction='Fy', w1=magnitude, w2=magnitude, x1=start, x2=end, case=case_name)
+
+        # Point loads
+        for location, magnitude in beam.factored_loads[case_name].get('point_loads', []):
+            model.add_member_pt_load(beam.name, Direction='Fy', P=magnitude, x=location, case=case_name)
+
+        # Add load combos that are just a 1.0 factor for each load case, named the same as the load case.
+        model.add_load_combo(name=case_name, factors={f'{case_name}': 1.0})
+
+    return model
+
+# Analysis engines available to CompositeSteelBeam.analyze, keyed by name.
+ANALYSIS_ENGINES = {
+    'closed_form': analyze_closed_form,
+    'stiffness': analyze_stiffness,
+    'pynite': analyze_pynite,
+}
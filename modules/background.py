@@ -0,0 +1,145 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import threading
+import modules.instrument as instrument
+
+@dataclass
+class RunState:
+    '''
+    Snapshot of a BackgroundRunner.
+
+    Parameters:
+        result: result of the last successful run, or None before the first run succeeds.
+        key: key of the run that produced result.
+        error (Exception): exception raised by the last completed run, or None if it succeeded. A failed run keeps the previous result and key.
+        pending (bool): whether a newer run is waiting out its debounce window or computing.
+    '''
+    result: object = None
+    key: object = None
+    error: Exception = None
+    pending: bool = False
+
+class BackgroundRunner:
+    '''
+    Runs a function in the background on the most recently submitted arguments.
+
+    Each submission waits out a debounce window first. A newer submission supersedes it: if the older run is still
+    in its window or queued, it is cancelled; if it is already computing, it finishes but its result is discarded.
+    Only the newest run is published, so state() always reports the last completed result of the newest inputs
+    while a newer run is pending.
+
+    Runners may share an executor, e.g. one pool for every streamlit session; superseded runs of a runner are discarded
+    whichever worker runs them.
+
+    Parameters:
+        func (callable): function to run. Called with the positional arguments passed to submit.
+        debounce (float) Optional = 0.3: seconds a submission waits for newer submissions before it starts.
+        executor (Executor) Optional: executor the function runs on, which is not shut down by shutdown. Defaults to a single
+            worker thread owned by the runner, so runs of one runner never overlap.
+    '''
+    def __init__(self, func, debounce: float = 0.3, executor=None):
+        self.func = func
+        self.debounce = debounce
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix='background')
+        self._state = RunState()
+        self._last_key = None # key of the last completed run, failed or not
+        self._generation = 0
+        self._pending_key = None
+        self._timer = None
+        self._future = None
+        self._condition = threading.Condition()
+
+    def submit(self, key, *args, delay: float = None) -> bool:
+        '''
+        Schedules a run of func(*args), superseding any pending run. Submissions with the key of the pending run, or of the
+        last completed run when nothing is pending, are ignored, so resubmitting unchanged inputs is free.
+
+        Parameters:
+            key: hashable identity of the arguments, e.g. app_logic.design_key.
+            delay (float) Optional: debounce window of this submission in seconds. Defaults to the runner's debounce.
+
+        Returns:
+            bool: whether a new run was scheduled.
+        '''
+        with self._condition:
+            if self._state.pending and key == self._pending_key:
+                return False
+            if not self._state.pending and key == self._last_key and self._generation:
+                return False
+
+            self._cancel_pending()
+            self._generation += 1
+            self._pending_key = key
+            self._state.pending = True
+
+            self._timer = threading.Timer(self.debounce if delay is None else delay, self._start, args=(self._generation, key, args))
+            self._timer.daemon = True
+            self._timer.start()
+
+        instrument.count('background.submitted')
+        return True
+
+    def _cancel_pending(self) -> None:
+        # Caller must hold the lock. A run already computing cannot be interrupted; its result is discarded by _run.
+        if self._timer is not None:
+            self._timer.cancel()
+        if self._future is not None and self._future.cancel():
+            instrument.count('background.cancelled')
+
+    def _start(self, generation: int, key, args: tuple) -> None:
+        with self._condition:
+            if generation != self._generation:
+                return
+            self._future = self.executor.submit(self._run, generation, key, args)
+
+    def _run(self, generation: int, key, args: tuple) -> None:
+        if generation != self._generation:
+            instrument.count('background.cancelled')
+            return
+
+        result, error = None, None
+        try:
+            result = self.func(*args)
+        except Exception as exc:
+            error = exc
+
+        with self._condition:
+            if generation != self._generation:
+                instrument.count('background.discarded')
+                return
+
+            if error is None:
+                self._state = RunState(result=result, key=key, error=None, pending=False)
+            else:
+                self._state = RunState(result=self._state.result, key=self._state.key, error=error, pending=False)
+            self._last_key = key
+            self._pending_key = None
+            self._condition.notify_all()
+
+    def state(self) -> RunState:
+        '''
+        Returns a snapshot of the last completed run and whether a newer one is pending.
+        '''
+        with self._condition:
+            return RunState(self._state.result, self._state.key, self._state.error, self._state.pending)
+
+    def wait(self, timeout: float = None) -> RunState:
+        '''
+        Blocks until no run is pending, or until timeout seconds have passed, and returns the state.
+        '''
+        with self._condition:
+            self._condition.wait_for(lambda: not self._state.pending, timeout)
+        return self.state()
+
+    def shutdown(self) -> None:
+        '''
+        Cancels any pending run and shuts down the executor if the runner created it.
+        '''
+        with self._condition:
+            self._generation += 1
+            self._cancel_pending()
+            self._state.pending = False
+            self._condition.notify_all()
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
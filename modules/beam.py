@@ -1,17 +1,46 @@
-from dataclasses import dataclass
+from __future__ import annotations
+from dataclasses import dataclass, field, fields, FrozenInstanceError
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+import copy
 from modules.material import Material, Steel
-from steelpy.steelpy import Section
+from modules.load import PointLoad
 import modules.load_factors as load_factors
 from math import sqrt
-import copy
-from PyNite import FEModel3D
-
-@dataclass
+import numpy as np
+import modules.composite as composite
+import modules.studs as stud_design
+import modules.serviceability as serviceability
+import modules.instrument as instrument
+from modules.analysis import ANALYSIS_ENGINES, BeamResults, PyNiteResults
+from modules.superposition import SpanLoads
+
+if TYPE_CHECKING: # heavy dependencies, only needed for type hints
+    from PyNite import FEModel3D
+    from steelpy.steelpy import Section
+
+# Derived values cached on CompositeSteelBeam, keyed by name, and the fields each one is calculated from.
+DERIVED_DEPENDENCIES = {
+    'factored_loads': ('shape', 'loads'),
+    'effective_width': ('span', 'layout'),
+    'sqrt_E_Fy': ('steel_material',),
+    'modular_ratio': ('steel_material', 'concrete_material'),
+    'full_comp_C': ('span', 'layout', 'shape', 'deck', 'steel_material', 'concrete_material'),
+    'stud_Qn': ('studs', 'deck', 'concrete_material'),
+}
+
+# Cached derived values to discard when a field is assigned, keyed by field name.
+INVALIDATED_BY = {}
+for derived_name, dependencies in DERIVED_DEPENDENCIES.items():
+    for field_name in dependencies:
+        INVALIDATED_BY.setdefault(field_name, []).append(derived_name)
+
+@dataclass(slots=True)
 class Beam:
     name: str
     span: float
 
-@dataclass
+@dataclass(slots=True)
 class CompositeSteelBeam(Beam):
     '''
     Composite steel beam class
@@ -24,7 +53,11 @@ class CompositeSteelBeam(Beam):
             {
             'fu': float,
             'dia': float,
-            'length': float
+            'length': float,
+            'max_comp': float,
+            'min_comp': float,
+            'per_rib': int, Optional = 1,
+            'weak_position': bool, Optional = True,
             }
         deck (dict): dictionary of slab and deck information
             {
@@ -34,6 +67,12 @@ class CompositeSteelBeam(Beam):
             }
         conc_material (Material): concrete slab material properties
         loads (list) Optional = []: list of Load objects defining all loads applied to the beam. Defaults to empy list.
+        fea_beam (FEModel3D) Optional = None: PyNite model of the beam, assigned by analyze when the 'pynite' engine is used.
+        results (BeamResults) Optional = None: analysis results, assigned by analyze.
+
+    Derived values (factored loads, effective width, sqrt(E/Fy), modular ratio and full composite force) are calculated
+    once and cached. Assigning a field listed in DERIVED_DEPENDENCIES discards the values that depend on it. Mutating a
+    field in place, e.g. beam.deck['t_s'] = 4.0 or beam.steel_material.fy = 65, is not detected; call invalidate() afterwards.
     '''
     shape: Section
     shored: bool
@@ -44,10 +83,56 @@ class CompositeSteelBeam(Beam):
     concrete_material: Material
     loads: list
     fea_beam: FEModel3D = None
+    results: BeamResults = None
+    _derived: dict = field(default=None, init=False, repr=False, compare=False) # cached derived values, keyed by name
 
     def __post_init__(self): # calculated parameters after dataclass initialization
-        # Calculate and store factored load dictionaries
-        self.factored_loads = {
+        self._derived = {}
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+
+        derived = getattr(self, '_derived', None)
+        if derived and name in INVALIDATED_BY:
+            for derived_name in INVALIDATED_BY[name]:
+                derived.pop(derived_name, None)
+
+    def _derived_value(self, name: str, calculate):
+        # Returns the cached derived value, calculating and caching it on first use.
+        derived = self._derived
+        if name not in derived:
+            derived[name] = calculate()
+        return derived[name]
+
+    def invalidate(self, *field_names: str) -> None:
+        '''
+        Discards cached derived values so they are recalculated on next use. Needed after mutating a field in place.
+
+        Parameters:
+            field_names (str): names of the fields that changed. Discards every cached value if none are provided.
+        '''
+        if not field_names:
+            self._derived.clear()
+        for field_name in field_names:
+            for derived_name in INVALIDATED_BY.get(field_name, ()):
+                self._derived.pop(derived_name, None)
+
+    def freeze(self) -> FrozenCompositeSteelBeam:
+        '''
+        Returns an immutable copy of the beam with every derived value calculated, which can be shared across threads.
+        '''
+        return FrozenCompositeSteelBeam(**{field.name: getattr(self, field.name) for field in fields(self) if field.init})
+
+    @property
+    def factored_loads(self) -> dict:
+        '''
+        Returns the factored load dictionaries of the beam, keyed by analysis case name.
+        '''
+        return self._derived_value('factored_loads', self._generate_all_factored_loads)
+
+    @instrument.traced('beam.factored_loads')
+    def _generate_all_factored_loads(self) -> dict:
+        return {
             'pre_comp_factored': self.generate_factored_loads(load_factors.ASCE_7_PRE_COMP_FACTORED_LOADS),
             'pre_comp_service': self.generate_factored_loads(load_factors.ASCE_7_PRE_COMP_SERVICE_LOADS),
             'comp_factored': self.generate_factored_loads(load_factors.ASCE_7_LRFD_COMBOS),
@@ -58,6 +143,9 @@ class CompositeSteelBeam(Beam):
         '''
         Returns the effective width of the beam in feet
         '''
+        return self._derived_value('effective_width', self._calc_effective_width)
+
+    def _calc_effective_width(self) -> float:
         #TODO: write test function for effective beam width.
         left_cond = self.layout[0][0]
         left_dist = self.layout[0][1]
@@ -80,13 +168,19 @@ class CompositeSteelBeam(Beam):
         '''
         Returns the modular ratio, n, of the composite beam
         '''
-        return self.steel_material.E / self.concrete_material.Ec
+        return self._derived_value('modular_ratio', lambda: self.steel_material.E / self.concrete_material.Ec)
+
+    def sqrt_E_Fy(self) -> float:
+        '''
+        Returns sqrt(E/Fy) of the steel, used by the width-to-thickness limits of AISC Table B4.1b
+        '''
+        return self._derived_value('sqrt_E_Fy', lambda: sqrt(self.steel_material.E / self.steel_material.fy))
     
     def calc_req_steel_area(self) -> float:
         '''
         Calculates the required steel area needed (in^2) for the beam section, assuming that PNA is in the slab. Used for initial sizing of beam before iterative calculations are completed.
         '''
-        Mu = self.fea_beam.Members[self.name].max_moment('Mz', combo_name='comp_factored') * 12 #convert to kip*inches
+        Mu = self.results.max_moment('comp_factored') * 12 #convert to kip*inches
         phi = 0.9
         Fy = self.steel_material.fy
         d = self.shape.d
@@ -114,7 +208,7 @@ class CompositeSteelBeam(Beam):
 
         if self.flange_is_slender():
                 # Use section F3 for capacity calculations
-                print('Flange is slender')
+                instrument.count('beam.flange_slender')
 
                 h = self.shape.d - (self.shape.tf * 2)
                 k_c = 4 / sqrt(h / self.shape.tw)
@@ -126,9 +220,9 @@ class CompositeSteelBeam(Beam):
                 phi_Mn = phi * ((0.9 * E * k_c * Sx)/(λ**2)) / 12
 
         else: # Use section F3 for capacity calculations
-                print('Flange is non-compact')
-                λ_pf = 0.38*sqrt(E/Fy)
-                λ_rf = 1.0*sqrt(E/Fy)
+                instrument.count('beam.flange_noncompact')
+                λ_pf = 0.38*self.sqrt_E_Fy()
+                λ_rf = 1.0*self.sqrt_E_Fy()
                 M_p = Fy*Zx
             
                 phi_Mn = phi * (M_p - (M_p - 0.7*Fy*Sx) * ((λ - λ_pf)/(λ_rf - λ_pf))) / 12
@@ -146,6 +240,7 @@ class CompositeSteelBeam(Beam):
         phi = 0.9
         return phi * self.steel_material.fy * self.shape.Zx / 12# kip-ft
 
+    @instrument.traced('beam.pre_comp_strength')
     def calc_pre_comp_strength(self) -> float:
         '''
         Calculates and returns the pre-composite strength of the beam (kip-ft)
@@ -165,35 +260,201 @@ class CompositeSteelBeam(Beam):
             
         return phi_Mn
     
-    #TODO: finish PNA method
-    def calc_PNA(self) -> float:
+    def calc_PNA(self, sum_Qn: float = None) -> float:
         '''
-        Returns the location of the plastic nuetral axis, measured from top of the slab
+        Returns the location of the plastic nuetral axis, measured from top of the slab, in inches.
+
+        Parameters:
+            sum_Qn (float) Optional: total strength of steel anchors between the points of zero and maximum moment, kips. Defaults to full composite action.
         '''
         if self.deck['orientation'] == 0:
             # Deck oriented parallel to beam
             #TODO: add logic for this case.
-            pass
-        elif self.deck['orientation'] == 90:
-            # Deck oriented perpendicular to beam. Concrete in ribs, that is below the top of the deck, is neglected in determining section properties.
-            n = self.modular_ratio()
-            beff_mod = self.calc_effective_width() * 12 / n
-            print(f'Effective width: {self.calc_effective_width()*12} in')
-            print(f'{beff_mod=}')
-            
-            # Calc y_bar
-            transformed_conc_area = beff_mod * self.deck['t_s']
-            transformed_conc_y = self.deck['t_s'] / 2
-            steel_area = self.shape.area
-            steel_y = self.deck['t_s'] + self.deck['deck_height'] + self.shape.d / 2
-            y_bar = sum([transformed_conc_area*transformed_conc_y, steel_area*steel_y]) / sum([transformed_conc_area, steel_area])
-
-            print(f'{transformed_conc_area=}')
-            print(f'{transformed_conc_y=}')
-            print(f'{steel_area=}')
-            print(f'{steel_y=}')
-            print(f'{y_bar=}')
-            
+            return None
+
+        if sum_Qn is None:
+            sum_Qn = self.calc_full_comp_C()
+
+        return float(self._partial_comp_strength(sum_Qn)['PNA'])
+
+    def _partial_comp_strength(self, sum_Qn) -> dict:
+        # Deck oriented perpendicular to beam. Concrete in ribs, that is below the top of the deck, is neglected.
+        if self.deck['orientation'] != 90:
+            #TODO: add logic for deck oriented parallel to beam.
+            raise NotImplementedError('Partial composite strength is only implemented for deck oriented perpendicular to the beam (90 deg).')
+
+        return composite.partial_comp_strength(
+            sum_Qn=sum_Qn,
+            As=self.shape.area,
+            Fy=self.steel_material.fy,
+            d=self.shape.d,
+            bf=self.shape.bf,
+            tf=self.shape.tf,
+            tw=self.shape.tw,
+            fc=self.concrete_material.fc,
+            beff=self.calc_effective_width() * 12,
+            t_s=self.deck['t_s'],
+            deck_height=self.deck['deck_height'],
+        )
+
+    def calc_partial_comp_moment_capacity(self, sum_Qn: float) -> float:
+        '''
+        Returns the moment capacity of the composite beam in kip-ft for the provided total anchor strength, sum_Qn, in kips.
+        '''
+        return float(self._partial_comp_strength(sum_Qn)['phi_Mn'])
+
+    def calc_partial_comp_curve(self, n_points: int = 50) -> dict:
+        '''
+        Calculates the moment capacity of the composite beam across the range of composite action from studs['min_comp'] to studs['max_comp'] in one vectorized call.
+
+        Parameters:
+            n_points (int) Optional = 50: number of points on the curve.
+
+        Returns:
+            dict: dictionary of NumPy arrays, ordered by increasing composite action:
+                {
+                'sum_Qn': total anchor strength, kips
+                'percent_comp': degree of composite action, sum_Qn / full composite force
+                'C', 'a', 'PNA', 'PNA_location', 'phi_Mn': refer to composite.partial_comp_strength
+                }
+        '''
+        C_full = self.calc_full_comp_C()
+        percent_comp = np.linspace(self.studs['min_comp'], self.studs['max_comp'], n_points)
+        sum_Qn = percent_comp * C_full
+
+        curve = {'sum_Qn': sum_Qn, 'percent_comp': percent_comp}
+        curve.update(self._partial_comp_strength(sum_Qn))
+
+        return curve
+
+    def calc_stud_strength(self) -> float:
+        '''
+        Returns the nominal shear strength, Qn, of one stud in kips per AISC 360 Section I8.2a.
+        '''
+        return self._derived_value('stud_Qn', self._calc_stud_strength)
+
+    def _calc_stud_strength(self) -> float:
+        Rg, Rp = stud_design.stud_reduction_factors(
+            self.deck['orientation'],
+            studs_per_rib=self.studs.get('per_rib', 1),
+            weak_position=self.studs.get('weak_position', True),
+        )
+
+        return float(stud_design.stud_strength(self.studs['dia'], self.studs['fu'], self.concrete_material.fc, self.concrete_material.Ec, Rg=Rg, Rp=Rp))
+
+    @instrument.traced('beam.min_studs')
+    def calc_min_studs(self, Mu: float = None) -> dict:
+        '''
+        Finds the minimum number of studs per half span for the composite moment strength to meet the factored moment demand,
+        by bisection on stud count between studs['min_comp'] and studs['max_comp'].
+
+        Parameters:
+            Mu (float) Optional: factored moment demand, kip-ft. Defaults to the 'comp_factored' maximum moment from analysis results.
+
+        Returns:
+            dict: studs_per_half_span, total_studs, sum_Qn, percent_comp, phi_Mn and adequate. Refer to studs.min_studs in modules/studs.py.
+        '''
+        if Mu is None:
+            Mu = self.results.max_moment('comp_factored')
+
+        if self.deck['orientation'] != 90:
+            #TODO: add logic for deck oriented parallel to beam.
+            raise NotImplementedError('Stud design is only implemented for deck oriented perpendicular to the beam (90 deg).')
+
+        solution = stud_design.min_studs(
+            Mu=Mu,
+            Qn=self.calc_stud_strength(),
+            C_full=self.calc_full_comp_C(),
+            min_comp=self.studs['min_comp'],
+            max_comp=self.studs['max_comp'],
+            As=self.shape.area,
+            Fy=self.steel_material.fy,
+            d=self.shape.d,
+            bf=self.shape.bf,
+            tf=self.shape.tf,
+            tw=self.shape.tw,
+            fc=self.concrete_material.fc,
+            beff=self.calc_effective_width() * 12,
+            t_s=self.deck['t_s'],
+            deck_height=self.deck['deck_height'],
+        )
+
+        return {key: value.item() for key, value in solution.items()}
+
+    def calc_transformed_I(self) -> float:
+        '''
+        Returns the moment of inertia of the elastic transformed composite section in in^4, neglecting concrete below the top of the deck.
+        '''
+        if self.deck['orientation'] != 90:
+            #TODO: add logic for deck oriented parallel to beam.
+            raise NotImplementedError('Composite moment of inertia is only implemented for deck oriented perpendicular to the beam (90 deg).')
+
+        return float(serviceability.transformed_I(
+            Is=self.shape.Ix,
+            As=self.shape.area,
+            d=self.shape.d,
+            beff=self.calc_effective_width() * 12,
+            t_s=self.deck['t_s'],
+            deck_height=self.deck['deck_height'],
+            n=self.modular_ratio(),
+        ))
+
+    def calc_lower_bound_I(self, sum_Qn: float = None) -> float:
+        '''
+        Returns the lower bound moment of inertia, I_LB, of the composite beam in in^4 per AISC Commentary equation C-I3-3.
+
+        Parameters:
+            sum_Qn (float) Optional: total strength of steel anchors between the points of zero and maximum moment, kips.
+                Defaults to the studs from calc_min_studs if the beam has been analyzed, otherwise full composite action.
+        '''
+        if self.deck['orientation'] != 90:
+            #TODO: add logic for deck oriented parallel to beam.
+            raise NotImplementedError('Composite moment of inertia is only implemented for deck oriented perpendicular to the beam (90 deg).')
+
+        if sum_Qn is None:
+            sum_Qn = self.calc_min_studs()['sum_Qn'] if self.results is not None else self.calc_full_comp_C()
+
+        return float(serviceability.lower_bound_I(
+            Is=self.shape.Ix,
+            As=self.shape.area,
+            d=self.shape.d,
+            Fy=self.steel_material.fy,
+            sum_Qn=sum_Qn,
+            fc=self.concrete_material.fc,
+            beff=self.calc_effective_width() * 12,
+            t_s=self.deck['t_s'],
+            deck_height=self.deck['deck_height'],
+        ))
+
+    @instrument.traced('beam.deflections')
+    def check_deflections(self, limits: dict = None, n_points: int = 21, sum_Qn: float = None) -> dict:
+        '''
+        Checks deflections along the span for the construction, live and total service load combinations against span / n limits.
+        The composite section stiffness uses I_LB.
+
+        Parameters:
+            limits (dict) Optional: span / n limits keyed by 'construction', 'live' and 'total'. Defaults to serviceability.DEFAULT_LIMITS.
+            n_points (int) Optional = 21: number of points along the span.
+            sum_Qn (float) Optional: total anchor strength used for I_LB. Refer to calc_lower_bound_I.
+
+        Returns:
+            dict: x coordinates (ft) and the results of each check. Refer to serviceability.check_deflections.
+        '''
+        x = np.linspace(0, self.span, n_points)
+        E = self.steel_material.E
+        checks = serviceability.check_deflections(
+            serviceability.case_shapes(self.loads, self.span, x, self_weight=self.shape.weight / 1000),
+            span=self.span,
+            EI_steel=E * self.shape.Ix,
+            EI_comp=E * self.calc_lower_bound_I(sum_Qn),
+            shored=self.shored,
+            limits=limits,
+        )
+        checks['x'] = x
+
+        return checks
+
+    @instrument.traced('beam.full_comp_strength')
     def calc_full_comp_moment_capacity(self) -> float:
         '''
         Returns the full composite moment capacity of the composite beam in kip-ft.
@@ -209,6 +470,9 @@ class CompositeSteelBeam(Beam):
         '''
         Returns the controlling force (kips) required for full composite action.
         '''
+        return self._derived_value('full_comp_C', self._calc_full_comp_C)
+
+    def _calc_full_comp_C(self) -> float:
         beff = self.calc_effective_width() * 12
 
         if self.deck['orientation'] == 0:
@@ -235,7 +499,7 @@ class CompositeSteelBeam(Beam):
         Returns:
             float: compression block depth, a, in inches.
         '''
-        if b == None:
+        if b is None:
             b = self.calc_effective_width() * 12
 
         return force / (0.85 * self.concrete_material.fc * b)
@@ -245,7 +509,7 @@ class CompositeSteelBeam(Beam):
         Returns whether steel shape web is compact or not.
         '''
         h_tw = self.shape.T / self.shape.tw
-        if h_tw <= 3.76 * sqrt(self.steel_material.E / self.steel_material.fy): # web is compact
+        if h_tw <= 3.76 * self.sqrt_E_Fy(): # web is compact
             return True
         else:
             return False
@@ -255,7 +519,7 @@ class CompositeSteelBeam(Beam):
         Returns whether steel shape flange is compact or not.
         '''
         b_t = (self.shape.bf / 2) / self.shape.tf
-        if b_t <= 0.38 * sqrt(self.steel_material.E / self.steel_material.fy): # flange is compact
+        if b_t <= 0.38 * self.sqrt_E_Fy(): # flange is compact
             return True
         else: 
             return False
@@ -265,79 +529,164 @@ class CompositeSteelBeam(Beam):
         Returns whether steel shape flange is slender
         '''
         b_t = (self.shape.bf / 2) / self.shape.tf
-        if b_t > 1.0 * sqrt(self.steel_material.E / self.steel_material.fy): # flange is compact
+        if b_t > 1.0 * self.sqrt_E_Fy(): # flange is compact
             return True
         else: 
             return False
 
-    def generate_factored_loads(self, load_combos: dict) -> float:
+    def generate_factored_loads(self, load_combos: dict) -> dict:
         '''
         Returns a factored load dict based on the selected load_combination. Refer to load_factors.py for load_combination choices.
+        The governing load combination is the one with the largest factored moment, chosen from the combinations that survive
+        dominance pruning for the load cases present.
         
         Parameters:
             load_combinations (dict): dictionary of load combinations to use for factoring. Must match one of the combinations in load_factors.py.
 
         Returns:
-            (dict): modified load dictionary with load intensities modified to be the resultant of the maximum load case.
+            (dict): factored loads of the governing load combination:
+                {
+                'UDL': float, factored full length uniform load, klf
+                'partial_loads': list of (start, end, magnitude) tuples of factored partial length uniform loads, (ft, ft, klf)
+                'point_loads': list of (location, magnitude) tuples of factored point loads, (ft, kips)
+                'combo': str, name of the governing load combination
+                'pruned': list of names of the load combinations that could not govern and were skipped. Refer to load_factors.prune_combos.
+                }
         '''
         
-        # Uniformly distributed loads
-        load_dict = {}
+        # Full length uniform loads by load case, partial length uniform loads and point loads
+        udl_dict = {}
+        partial_loads = []
+        point_loads = []
         for load in self.loads:
-            if load.load_case == 'D' or load.load_case == 'CD': # add beam self weight to DL case.
-                load_dict[f'{load.load_case}_load'] = load.magnitude + self.shape.weight / 1000
+            if isinstance(load, PointLoad):
+                point_loads.append(load)
+            elif load.start_loc > 0 or load.end_loc < self.span:
+                partial_loads.append(load)
             else:
-                load_dict[f'{load.load_case}_load'] = load.magnitude
-        
-        factored_UDL = load_factors.max_factored_load(load_dict, load_combos=load_combos)
+                udl_dict[load.load_case] = udl_dict.get(load.load_case, 0.0) + load.magnitude
+
+        for case in ('D', 'CD'): # add beam self weight to DL case.
+            if any(load.load_case == case for load in self.loads):
+                udl_dict[case] = udl_dict.get(case, 0.0) + self.shape.weight / 1000
+
+        # Total load on the span of each load case, for pruning. With full length loads only it also decides the governing combination.
+        total_dict = {case: w * self.span for case, w in udl_dict.items()}
+        for load in partial_loads:
+            total_dict[load.load_case] = total_dict.get(load.load_case, 0.0) + load.magnitude * (min(load.end_loc, self.span) - max(load.start_loc, 0))
+        for load in point_loads:
+            total_dict[load.load_case] = total_dict.get(load.load_case, 0.0) + load.magnitude
+
+        def factor(factors: dict) -> dict:
+            return {
+                'UDL': sum(factors.get(case, 0.0) * w for case, w in udl_dict.items()),
+                'partial_loads': [(load.start_loc, load.end_loc, factors[load.load_case] * load.magnitude) for load in partial_loads if load.load_case in factors],
+                'point_loads': [(load.location, factors[load.load_case] * load.magnitude) for load in point_loads if load.load_case in factors],
+            }
 
-        # Combine into one load dict
-        factored_loads = {
-            'UDL': factored_UDL
-        }
+        def max_moment(factored_loads: dict) -> float:
+            loads = SpanLoads.from_factored_loads(self.span, factored_loads)
+            return loads.moment(loads.critical_x()).max()
+
+        # Combinations that cannot govern for the load cases present are dropped before factoring.
+        pruning = load_factors.prune_combos(load_combos, load_factors.load_signs(total_dict))
+        if len(pruning.load_combos) == 1:
+            combo_name = next(iter(pruning.load_combos))
+            factored_loads = factor(load_combos[combo_name])
+        elif not partial_loads and not point_loads:
+            # Full length loads only: the moment is proportional to the total load.
+            _, combo_name = load_factors.governing_factored_load(total_dict, load_combos=pruning.load_combos)
+            factored_loads = factor(load_combos[combo_name])
+        else:
+            # Partial and point loads move the peak moment, so every remaining combination is analyzed.
+            candidates = {name: factor(factors) for name, factors in pruning.load_combos.items()}
+            combo_name = max(candidates, key=lambda name: max_moment(candidates[name]))
+            factored_loads = candidates[combo_name]
+
+        factored_loads.update({'combo': combo_name, 'pruned': list(pruning.pruned)})
 
         return factored_loads
     
-    def analyze(self):
-        '''
-        Generates, analyzes and returns a Pynite FEA model from the properties of the object.
-        '''
-        # Create a new finite element model
-        beam = FEModel3D()
-
-        # Add nodes (14 ft = 168 inches apart)
-        beam.add_node('N1', 0, 0, 0)
-        beam.add_node('N2', self.span, 0, 0)
-
-        # Define a material
-        E = self.steel_material.E               # Modulus of elasticity (ksi)
-        G = self.steel_material.G               # Shear modulus of elasticity (ksi)
-        nu = self.steel_material.poisson_ratio  # Poisson's ratio
-        rho = self.steel_material.density / (1000 * 12**3)  # Density (kci)
-        beam.add_material('Steel', E, G, nu, rho)
-
-        # Add beam with appropriate properties
-        beam.add_member(name=self.name, i_node='N1', j_node='N2', material_name='Steel', Iy=self.shape.Iy, Iz=self.shape.Ix, J=self.shape.J, A=self.shape.area)
-
-        # Provide simple supports
-        beam.def_support('N1', True, True, True, False, False, False)
-        beam.def_support('N2', True, True, True, True, False, False)
-
-        # Add uniform loads
-        for case_name in self.factored_loads:
-            # Add each type of load to analysis member
-            # UDLs      
-            udl_magnitude = self.factored_loads[case_name]['UDL']
-            udl_start = 0
-            udl_stop = self.span
-            beam.add_member_dist_load(member_name=self.name, Direction='Fy', w1=udl_magnitude, w2=udl_magnitude, x1=udl_start, x2=udl_stop, case=case_name)
-            
-            # Add load combos that are just a 1.0 factor for each load case, named the same as the load case.
-            beam.add_load_combo(name=case_name, factors={f'{case_name}': 1.0})
-        
+    def calc_case_reactions(self) -> dict:
+        '''
+        Returns the unfactored (left, right) support reactions of each load case in kips, keyed by load case.
+        Beam self weight is included in the D and CD cases, as in generate_factored_loads.
+        '''
+        reactions = {}
+        for load in self.loads:
+            if isinstance(load, PointLoad):
+                P, x = load.magnitude, load.location
+            else:
+                start, end = max(load.start_loc, 0), min(load.end_loc, self.span)
+                P, x = load.magnitude * (end - start), (start + end) / 2
+            left, right = reactions.get(load.load_case, (0.0, 0.0))
+            reactions[load.load_case] = (left + P * (self.span - x) / self.span, right + P * x / self.span)
+
+        for case in ('D', 'CD'): # add beam self weight to DL case.
+            if case in reactions:
+                R = self.shape.weight / 1000 * self.span / 2
+                reactions[case] = (reactions[case][0] + R, reactions[case][1] + R)
 
-        # Run analysis on beam.
-        beam.analyze_linear()
+        return reactions
 
-        # Assign to fea_analysis property. Results may be queried from other methods using self.fea_beam now.
-        self.fea_beam = beam
\ No newline at end of file
+    def analyze(self, engine: str = 'closed_form') -> BeamResults:
+        '''
+        Analyzes the beam under each factored load dictionary and returns the results. Results may be queried from other methods using self.results.
+
+        Parameters:
+            engine (str) Optional = 'closed_form': analysis engine to use. Must be one of the keys of analysis.ANALYSIS_ENGINES.
+                'closed_form' solves the simply supported span directly. 'pynite' builds and analyzes a PyNite FEA model, which is also assigned to self.fea_beam.
+
+        Returns:
+            BeamResults: analysis results with the same interface for every engine.
+        '''
+        if engine not in ANALYSIS_ENGINES:
+            raise ValueError(f'Unknown analysis engine {engine!r}. Choose one of {list(ANALYSIS_ENGINES)}.')
+
+        with instrument.span('beam.analyze', engine=engine):
+            self.results = ANALYSIS_ENGINES[engine](self)
+        self.fea_beam = self.results.model if isinstance(self.results, PyNiteResults) else None
+
+        return self.results
+
+class FrozenCompositeSteelBeam(CompositeSteelBeam):
+    '''
+    Immutable composite steel beam, usually created with CompositeSteelBeam.freeze().
+
+    Mutable inputs are copied on creation: layout becomes nested tuples, studs and deck become read-only mappings, loads
+    become a tuple and loads and materials are deep copied. Every derived value is calculated up front, so reads never
+    write to the instance and a frozen design can be shared across threads. Assigning any attribute, including running
+    analyze, raises FrozenInstanceError; analyze the beam before freezing it.
+    '''
+    __slots__ = ('_frozen',)
+
+    def __post_init__(self):
+        self.layout = tuple(tuple(side) for side in self.layout)
+        self.studs = MappingProxyType(dict(self.studs))
+        self.deck = MappingProxyType(dict(self.deck))
+        self.loads = tuple(copy.deepcopy(load) for load in self.loads)
+        self.steel_material = copy.deepcopy(self.steel_material)
+        self.concrete_material = copy.deepcopy(self.concrete_material)
+
+        # Calculate every derived value now so that reads never write to the instance.
+        CompositeSteelBeam.__post_init__(self)
+        self.factored_loads
+        self.calc_effective_width()
+        self.sqrt_E_Fy()
+        self.modular_ratio()
+        if self.deck['orientation'] == 90:
+            self.calc_full_comp_C()
+            self.calc_stud_strength()
+
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise FrozenInstanceError(f'cannot assign to field {name!r} of a frozen design')
+        CompositeSteelBeam.__setattr__(self, name, value)
+
+    def invalidate(self, *field_names: str) -> None:
+        raise FrozenInstanceError('frozen designs cannot be invalidated')
+
+    def freeze(self) -> FrozenCompositeSteelBeam:
+        return self
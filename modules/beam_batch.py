@@ -0,0 +1,172 @@
+from dataclasses import dataclass, fields
+import numpy as np
+from modules.beam import CompositeSteelBeam
+from modules.load import UniformLoad
+from modules.material import Steel, Concrete
+from modules.catalog import CatalogSection, load_catalog
+import modules.load_factors as load_factors
+
+def _layout_array(layouts: list) -> np.ndarray:
+    # Structured (beams, 2) array of the layout sides, with cond as wide as the longest condition.
+    conds = np.array([[side[0] for side in layout] for layout in layouts], dtype=str).reshape(len(layouts), 2)
+    layout = np.empty((len(layouts), 2), dtype=[('cond', conds.dtype), ('dist', 'f8')])
+    layout['cond'] = conds
+    layout['dist'] = [[side[1] for side in layout] for layout in layouts]
+    return layout
+
+def _columns(items: list, cls=None) -> dict:
+    # Dict of arrays from a list of dicts or dataclasses with the same keys, one array per key.
+    if cls is not None:
+        keys = [field.name for field in fields(cls)]
+        return {key: np.array([getattr(item, key) for item in items]) for key in keys}
+    keys = list(items[0])
+    return {key: np.array([item[key] for item in items]) for key in keys}
+
+def _row(columns: dict, i: int) -> dict:
+    return {key: column[i].item() for key, column in columns.items()}
+
+@dataclass(slots=True)
+class BeamBatch:
+    '''
+    Struct-of-arrays container of many composite beams, with the field names of CompositeSteelBeam. Each field holds one
+    array entry per beam instead of one Python object per beam, so large candidate sets take a fraction of the memory.
+    Index the batch to get a CompositeSteelBeam back for exact analysis.
+
+    Only full length uniform loads are stored, summed by load case, as in sweep.sweep_sections.
+
+    Parameters:
+        name (np.ndarray): beam names.
+        span (np.ndarray): span lengths, ft
+        shape (np.ndarray): section positions in the profile catalog. Refer to catalog.SectionCatalog.index.
+        shored (np.ndarray): whether each beam is shored.
+        layout (np.ndarray): structured array of ('cond', 'dist') with shape (beams, 2), left side first. Refer to CompositeSteelBeam.layout.
+        studs (dict): stud inputs, one array per CompositeSteelBeam.studs key.
+        deck (dict): deck inputs, one array per CompositeSteelBeam.deck key.
+        steel_material (dict): Steel fields, one array per field.
+        concrete_material (dict): Concrete fields, one array per field.
+        loads (dict): full length uniform load of each load case, klf, one array per load case.
+        profile (str) Optional = 'W_shapes': profile of the compiled section catalog that shape indexes.
+    '''
+    name: np.ndarray
+    span: np.ndarray
+    shape: np.ndarray
+    shored: np.ndarray
+    layout: np.ndarray
+    studs: dict
+    deck: dict
+    steel_material: dict
+    concrete_material: dict
+    loads: dict
+    profile: str = 'W_shapes'
+
+    @classmethod
+    def from_beams(cls, beams: list, profile: str = 'W_shapes') -> 'BeamBatch':
+        '''
+        Returns a batch of the provided beams. Every beam must have the same studs and deck keys, full length uniform
+        loads only, and a section in the profile catalog.
+        '''
+        catalog = load_catalog(profile)
+        loads = {}
+        for i, beam in enumerate(beams):
+            for load in beam.loads:
+                if not isinstance(load, UniformLoad) or load.start_loc > 0 or load.end_loc < beam.span:
+                    raise NotImplementedError('Beam batches only support full length uniform loads.')
+                if load.load_case not in loads:
+                    loads[load.load_case] = np.zeros(len(beams))
+                loads[load.load_case][i] += load.magnitude
+
+        return cls(
+            name=np.array([beam.name for beam in beams]),
+            span=np.array([beam.span for beam in beams], dtype=float),
+            shape=np.array([catalog.index(beam.shape.name) for beam in beams], dtype=np.int32),
+            shored=np.array([beam.shored for beam in beams], dtype=bool),
+            layout=_layout_array([beam.layout for beam in beams]),
+            studs=_columns([beam.studs for beam in beams]),
+            deck=_columns([beam.deck for beam in beams]),
+            steel_material=_columns([beam.steel_material for beam in beams], Steel),
+            concrete_material=_columns([beam.concrete_material for beam in beams], Concrete),
+            loads=loads,
+            profile=profile,
+        )
+
+    def __len__(self) -> int:
+        return len(self.span)
+
+    def __getitem__(self, i: int) -> CompositeSteelBeam:
+        '''
+        Returns beam i as a CompositeSteelBeam, with one UniformLoad per load case named 'Uniform <case>'.
+        '''
+        span = self.span[i].item()
+        return CompositeSteelBeam(
+            name=self.name[i].item(),
+            span=span,
+            shape=CatalogSection(load_catalog(self.profile), int(self.shape[i])),
+            shored=bool(self.shored[i]),
+            layout=tuple((str(side['cond']), side['dist'].item()) for side in self.layout[i]),
+            studs=_row(self.studs, i),
+            deck=_row(self.deck, i),
+            steel_material=Steel(**_row(self.steel_material, i)),
+            concrete_material=Concrete(**_row(self.concrete_material, i)),
+            loads=[
+                UniformLoad(name=f'Uniform {case}', load_case=case, magnitude=w[i].item(), start_loc=0, end_loc=span)
+                for case, w in self.loads.items() if w[i]
+            ],
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def take(self, indices) -> 'BeamBatch':
+        '''
+        Returns a batch of the beams at the provided positions or boolean mask, e.g. the candidates that pass a check.
+        '''
+        def pick(columns: dict) -> dict:
+            return {key: column[indices] for key, column in columns.items()}
+
+        return BeamBatch(
+            name=self.name[indices],
+            span=self.span[indices],
+            shape=self.shape[indices],
+            shored=self.shored[indices],
+            layout=self.layout[indices],
+            studs=pick(self.studs),
+            deck=pick(self.deck),
+            steel_material=pick(self.steel_material),
+            concrete_material=pick(self.concrete_material),
+            loads=pick(self.loads),
+            profile=self.profile,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        '''
+        Returns the bytes held by the batch arrays.
+        '''
+        total = sum(array.nbytes for array in (self.name, self.span, self.shape, self.shored, self.layout))
+        for columns in (self.studs, self.deck, self.steel_material, self.concrete_material, self.loads):
+            total += sum(column.nbytes for column in columns.values())
+        return total
+
+    def section(self, prop: str) -> np.ndarray:
+        '''
+        Returns a section property of every beam, e.g. batch.section('Zx').
+        '''
+        return load_catalog(self.profile).column(prop)[self.shape]
+
+    def effective_width(self) -> np.ndarray:
+        '''
+        Returns the effective width of every beam, ft. Refer to CompositeSteelBeam.calc_effective_width.
+        '''
+        beff = self.span[:, None] / 8
+        dist = self.layout['dist']
+        return np.minimum(beff, np.where(self.layout['cond'] == 'Beam', dist / 2, dist)).sum(axis=1)
+
+    def factored_udl(self, load_combos: dict) -> np.ndarray:
+        '''
+        Returns the governing factored UDL of every beam including its self weight, klf. Refer to CompositeSteelBeam.generate_factored_loads.
+        '''
+        self_weight = self.section('weight') / 1000
+        # Self weight is added to the D and CD cases of the beams that carry them.
+        load_dict = {case: np.where(w != 0, w + self_weight, w) if case in ('D', 'CD') else w for case, w in self.loads.items()}
+        return load_factors.governing_factored_load(load_dict, load_combos)[0]
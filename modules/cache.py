@@ -0,0 +1,98 @@
+from collections import OrderedDict
+import threading
+import time
+
+class LRUCache:
+    '''
+    Thread safe least recently used cache bounded by number of entries and entry age.
+
+    Parameters:
+        maxsize (int) Optional = 128: maximum number of entries. The least recently used entry is evicted when full.
+        max_age (float) Optional = None: maximum age of an entry in seconds, measured from when it was stored. None disables expiry.
+        clock (callable) Optional = time.monotonic: function returning the current time in seconds.
+    '''
+    def __init__(self, maxsize: int = 128, max_age: float = None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.max_age = max_age
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict() # key: (time stored, value)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return self._lookup(key) is not None
+
+    def _lookup(self, key):
+        # Returns the (time stored, value) entry for key, dropping it if expired. Caller must hold the lock.
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if self.max_age is not None and self.clock() - entry[0] > self.max_age:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key, default=None):
+        '''
+        Returns the cached value for key, or default if it is missing or expired. Updates the hit and miss counters.
+        '''
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value) -> None:
+        '''
+        Stores value under key, evicting the least recently used entries beyond maxsize.
+        '''
+        with self._lock:
+            self._entries[key] = (self.clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        '''
+        Returns the cached value for key, calling compute() and storing its result on a miss.
+        compute runs outside the lock, so concurrent misses on the same key may each compute the value.
+        '''
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+
+        return value
+
+    def clear(self) -> None:
+        '''
+        Removes every entry and resets the hit and miss counters.
+        '''
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict:
+        '''
+        Returns cache statistics: hits, misses, current size, maxsize and max_age.
+        '''
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'max_age': self.max_age,
+        }
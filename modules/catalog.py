@@ -0,0 +1,204 @@
+import json
+import os
+import struct
+import sys
+import numpy as np
+
+# Section properties compiled into the catalog. These are the properties CompositeSteelBeam reads from its shape.
+CATALOG_FIELDS = ('d', 'bf', 'tf', 'tw', 'T', 'area', 'weight', 'Ix', 'Iy', 'Zx', 'Sx', 'J')
+
+CATALOG_VERSION = 1
+MAGIC = b'CBCATLG\x00'
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+# File layout, all little endian:
+#   MAGIC (8 bytes)
+#   header length (uint32)
+#   header (utf-8 JSON): version, profile, fields, names, count, data_offset
+#   zero padding to data_offset, a multiple of 8 bytes
+#   float64 data block of shape (len(fields), count). Each field is one contiguous column.
+
+def catalog_path(profile_name: str = 'W_shapes') -> str:
+    '''
+    Returns the default path of the compiled catalog file for a SteelPy profile.
+    '''
+    return os.path.join(DATA_DIR, f'{profile_name}.cbcat')
+
+def build_catalog(profile_name: str = 'W_shapes', path: str = None, fields: tuple = CATALOG_FIELDS) -> str:
+    '''
+    Compiles the sections of a SteelPy AISC profile into a columnar catalog file. This is the only step that imports SteelPy.
+
+    Parameters:
+        profile_name (str) Optional = 'W_shapes': name of the aisc profile to compile.
+        path (str) Optional: output file path. Defaults to catalog_path(profile_name).
+        fields (tuple) Optional = CATALOG_FIELDS: section properties to compile.
+
+    Returns:
+        str: path of the written catalog file.
+    '''
+    from steelpy import aisc
+
+    if path is None:
+        path = catalog_path(profile_name)
+
+    sections = list(getattr(aisc, profile_name).sections.values())
+    data = np.array([[getattr(section, field) for section in sections] for field in fields], dtype='<f8')
+
+    header = {
+        'version': CATALOG_VERSION,
+        'profile': profile_name,
+        'fields': list(fields),
+        'names': [section.name for section in sections],
+        'count': len(sections),
+    }
+    # data_offset is part of the header, so size the header with a placeholder offset first.
+    header['data_offset'] = 0
+    header_length = len(json.dumps(header).encode()) + 16
+    header['data_offset'] = -(-(len(MAGIC) + 4 + header_length) // 8) * 8
+    header_bytes = json.dumps(header).encode().ljust(header_length)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b'\x00' * (header['data_offset'] - f.tell()))
+        f.write(data.tobytes())
+
+    return path
+
+class CatalogSection:
+    '''
+    Lightweight view of one section of a SectionCatalog. Section properties are read as attributes, compatible with the
+    SteelPy Section attributes used by CompositeSteelBeam (e.g. shape.d, shape.Zx).
+    '''
+    __slots__ = ('catalog', 'index', 'name')
+
+    def __init__(self, catalog, index: int):
+        self.catalog = catalog
+        self.index = index
+        self.name = catalog.names[index]
+
+    def __getattr__(self, prop):
+        columns = self.catalog.columns
+        if prop not in columns:
+            raise AttributeError(f"'CatalogSection' object has no attribute '{prop}'")
+        return float(columns[prop][self.index])
+
+    @property
+    def properties(self) -> dict:
+        return {field: float(column[self.index]) for field, column in self.catalog.columns.items()}
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, CatalogSection) and other.name == self.name and other.catalog.path == self.catalog.path
+
+    def __hash__(self) -> int:
+        return hash(self.name)
+
+    def __repr__(self) -> str:
+        return f'CatalogSection({self.name!r})'
+
+    def __reduce__(self):
+        return (_catalog_section, (self.catalog.path, self.name))
+
+def _catalog_section(path: str, name: str) -> CatalogSection:
+    return load_catalog(path=path).section(name)
+
+class SectionCatalog:
+    '''
+    Memory-mapped columnar section catalog produced by build_catalog. Pages of the data block are shared by every process that maps the same file.
+    Sections can be looked up like a SteelPy Profile, e.g. getattr(catalog, 'W16X26') or catalog.sections['W16X26'].
+
+    Parameters:
+        path (str): path of the compiled catalog file.
+    '''
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'{path} is not a section catalog file.')
+            header_length, = struct.unpack('<I', f.read(4))
+            header = json.loads(f.read(header_length))
+
+        if header['version'] != CATALOG_VERSION:
+            raise ValueError(f'{path} is catalog version {header["version"]}, expected {CATALOG_VERSION}. Rebuild it with build_catalog.')
+
+        self.path = path
+        self.profile = header['profile']
+        self.fields = header['fields']
+        self.names = header['names']
+        self.data = np.memmap(path, dtype='<f8', mode='r', offset=header['data_offset'], shape=(len(self.fields), header['count']))
+        self.columns = dict(zip(self.fields, self.data))
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self._sections = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __getattr__(self, name: str) -> CatalogSection:
+        if name.startswith('_') or name not in self._index:
+            raise AttributeError(f"'SectionCatalog' object has no attribute '{name}'")
+        return CatalogSection(self, self._index[name])
+
+    def section(self, name: str) -> CatalogSection:
+        '''
+        Returns the section with the provided name, e.g. 'W16X26'.
+        '''
+        if name not in self._index:
+            raise KeyError(f'{name} is not in the {self.profile} catalog.')
+        return CatalogSection(self, self._index[name])
+
+    def index(self, name: str) -> int:
+        '''
+        Returns the position of the named section in the catalog columns.
+        '''
+        return self._index[name]
+
+    @property
+    def sections(self) -> dict:
+        '''
+        Returns a dictionary of every CatalogSection keyed by name, in catalog order.
+        '''
+        if self._sections is None:
+            self._sections = {name: CatalogSection(self, i) for i, name in enumerate(self.names)}
+        return self._sections
+
+    def column(self, field: str) -> np.ndarray:
+        '''
+        Returns the read-only, memory-mapped values of one section property for every section.
+        '''
+        return self.columns[field]
+
+_catalogs = {}
+
+def load_catalog(profile_name: str = 'W_shapes', path: str = None) -> SectionCatalog:
+    '''
+    Returns the compiled catalog of a profile, memory-mapped once per process. The catalog is built from SteelPy first if the file does not exist.
+
+    Parameters:
+        profile_name (str) Optional = 'W_shapes': name of the aisc profile.
+        path (str) Optional: catalog file path. Defaults to catalog_path(profile_name).
+
+    Returns:
+        SectionCatalog: loaded catalog.
+    '''
+    if path is None:
+        path = catalog_path(profile_name)
+
+    catalog = _catalogs.get(path)
+    if catalog is None:
+        if not os.path.exists(path):
+            build_catalog(profile_name, path)
+        catalog = _catalogs[path] = SectionCatalog(path)
+
+    return catalog
+
+if __name__ == '__main__':
+    # Usage: python -m modules.catalog [profile_name ...]
+    for profile_name in sys.argv[1:] or ['W_shapes']:
+        print(f'Wrote {build_catalog(profile_name)}')
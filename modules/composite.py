@@ -0,0 +1,94 @@
+import numpy as np
+
+# Plastic neutral axis locations returned by partial_comp_strength
+PNA_IN_SLAB = 0
+PNA_IN_FLANGE = 1
+PNA_IN_WEB = 2
+
+def partial_comp_strength(sum_Qn, As, Fy, d, bf, tf, tw, fc, beff, t_s, deck_height, phi: float = 0.9) -> dict:
+    '''
+    Calculates the plastic moment strength of a composite beam for any amount of shear connection, ΣQn.
+    All arguments are broadcast against each other, so one call evaluates a whole range of ΣQn, many sections, or both.
+    Concrete below the top of the deck is neglected (deck perpendicular to the beam). See AISC Commentary I3.2a and Salmon & Johnson chapter 16.
+
+    Parameters:
+        sum_Qn: total strength of steel anchors between the points of zero and maximum moment, kips
+        As: steel section area, in^2
+        Fy: steel yield stress, ksi
+        d, bf, tf, tw: steel section depth, flange width, flange thickness and web thickness, in
+        fc: concrete compressive strength, ksi
+        beff: effective slab width, in
+        t_s: concrete thickness above the deck, in
+        deck_height: deck height, in
+        phi (float) Optional = 0.9: resistance factor
+
+    Returns:
+        dict: dictionary of NumPy arrays:
+            {
+            'C': compression force in the concrete, kips
+            'a': depth of the concrete stress block, in
+            'PNA': location of the plastic neutral axis, measured from top of the slab, in
+            'PNA_location': PNA_IN_SLAB, PNA_IN_FLANGE or PNA_IN_WEB
+            'phi_Mn': moment strength, kip-ft
+            }
+    '''
+    sum_Qn, As, Fy, d, bf, tf, tw, fc, beff, t_s, deck_height = np.broadcast_arrays(
+        *[np.asarray(value, dtype=float) for value in (sum_Qn, As, Fy, d, bf, tf, tw, fc, beff, t_s, deck_height)])
+
+    P_y = As * Fy
+    C = np.minimum(np.minimum(sum_Qn, P_y), 0.85 * fc * beff * t_s)
+    a = C / (0.85 * fc * beff)
+    d_1 = t_s + deck_height - a / 2 # concrete force to top of steel
+
+    # Steel in compression above the PNA, C' = (Py - C) / 2, and its centroid below the top of steel, d_2.
+    C_steel = (P_y - C) / 2
+    P_flange = bf * tf * Fy
+    in_slab = C_steel <= 1e-9 * P_y
+    in_flange = ~in_slab & (C_steel <= P_flange)
+    in_web = ~in_slab & ~in_flange
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y_flange = C_steel / (bf * Fy)
+        y_web = tf + (C_steel - P_flange) / (tw * Fy)
+        d_2_web = (P_flange * tf / 2 + (C_steel - P_flange) * (tf + (y_web - tf) / 2)) / C_steel
+
+    y_p = np.where(in_flange, y_flange, np.where(in_web, y_web, 0.0))
+    d_2 = np.where(in_flange, y_flange / 2, np.where(in_web, d_2_web, 0.0))
+
+    M_n = C * (d_1 + d_2) + P_y * (d / 2 - d_2)
+
+    return {
+        'C': C,
+        'a': a,
+        'PNA': np.where(in_slab, a, t_s + deck_height + y_p),
+        'PNA_location': np.where(in_slab, PNA_IN_SLAB, np.where(in_flange, PNA_IN_FLANGE, PNA_IN_WEB)),
+        'phi_Mn': phi * M_n / 12,
+    }
+
+def required_sum_Qn(curve: dict, Mu):
+    '''
+    Returns the smallest ΣQn on a strength curve that provides phi_Mn >= Mu, by linear interpolation between curve points.
+
+    Parameters:
+        curve (dict): curve with monotonic 'sum_Qn' and 'phi_Mn' arrays, e.g. from CompositeSteelBeam.calc_partial_comp_curve.
+        Mu: factored moment demand(s), kip-ft. May be an array.
+
+    Returns:
+        ΣQn (kips) for each demand. Demands below the first curve point return the first ΣQn; demands above the curve return NaN.
+    '''
+    phi_Mn = np.asarray(curve['phi_Mn'])
+    sum_Qn = np.asarray(curve['sum_Qn'])
+    Mu = np.asarray(Mu, dtype=float)
+
+    # First curve point with enough strength, then interpolate back toward the previous point.
+    upper = np.clip(np.searchsorted(phi_Mn, Mu, side='left'), 1, len(phi_Mn) - 1)
+    lower = upper - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = np.clip((Mu - phi_Mn[lower]) / (phi_Mn[upper] - phi_Mn[lower]), 0.0, 1.0)
+    fraction = np.where(phi_Mn[upper] > phi_Mn[lower], fraction, 1.0)
+
+    required = sum_Qn[lower] + fraction * (sum_Qn[upper] - sum_Qn[lower])
+    required = np.where(Mu <= phi_Mn[0], sum_Qn[0], required)
+    required = np.where(Mu > phi_Mn[-1], np.nan, required)
+
+    return required if required.ndim else float(required)
@@ -0,0 +1,288 @@
+from dataclasses import dataclass, asdict
+import json
+import numpy as np
+from modules.beam import CompositeSteelBeam
+from modules.load import UniformLoad
+from modules.material import Steel, Concrete
+import modules.load_factors as load_factors
+from modules.catalog import load_catalog
+from modules.sweep import full_comp_strength, governing_udl, section_arrays, sweep_sections
+
+TABLE_VERSION = 1
+
+def design_basis(template: CompositeSteelBeam, area_loads: dict, profile_name: str = 'W_shapes') -> dict:
+    '''
+    Returns the design inputs shared by every beam of a design table as a JSON compatible dict.
+
+    Parameters:
+        template (CompositeSteelBeam): beam providing shoring, studs, deck and materials. Its span, layout, shape and loads are not used.
+        area_loads (dict): area loads of every load case other than the live load, psf, keyed by load case, e.g. {'D': 50, 'CD': 50, 'CL': 20}.
+        profile_name (str) Optional = 'W_shapes': section catalog the table covers.
+    '''
+    return {
+        'profile': profile_name,
+        'shored': bool(template.shored),
+        'studs': dict(template.studs),
+        'deck': dict(template.deck),
+        'steel_material': asdict(template.steel_material),
+        'concrete_material': asdict(template.concrete_material),
+        'area_loads': dict(area_loads),
+    }
+
+def design_beam(basis: dict, span: float, spacing: float, live_load: float, section: str) -> CompositeSteelBeam:
+    '''
+    Returns a CompositeSteelBeam of a design table at one grid point, with beams at spacing on both sides and area loads
+    converted to full length uniform loads on the tributary width.
+
+    Parameters:
+        basis (dict): design inputs from design_basis.
+        span (float): span length, ft
+        spacing (float): beam spacing, ft
+        live_load (float): live load (L), psf
+        section (str): section name in the basis profile, e.g. 'W16X26'.
+    '''
+    area_loads = {**basis['area_loads'], 'L': live_load}
+    return CompositeSteelBeam(
+        name='Composite Beam',
+        span=span,
+        shape=load_catalog(basis['profile']).section(section),
+        shored=basis['shored'],
+        layout=(('Beam', spacing), ('Beam', spacing)),
+        studs=dict(basis['studs']),
+        deck=dict(basis['deck']),
+        steel_material=Steel(**basis['steel_material']),
+        concrete_material=Concrete(**basis['concrete_material']),
+        loads=[
+            UniformLoad(name=f'Uniform {case}', load_case=case, magnitude=psf * spacing / 1000, start_loc=0, end_loc=span)
+            for case, psf in area_loads.items() if psf
+        ],
+    )
+
+def verify_beam(beam: CompositeSteelBeam) -> dict:
+    '''
+    Returns the exact demand / capacity ratios of a beam from CompositeSteelBeam analysis, for the checks stored in design tables.
+
+    Returns:
+        dict: {'pre_comp_ratio': float, 'comp_ratio': float, 'passes': bool}
+    '''
+    results = beam.analyze()
+    pre_comp_ratio = results.max_moment('pre_comp_factored') / beam.calc_pre_comp_strength()
+    comp_ratio = results.max_moment('comp_factored') / beam.calc_full_comp_moment_capacity()
+
+    return {'pre_comp_ratio': pre_comp_ratio, 'comp_ratio': comp_ratio, 'passes': pre_comp_ratio <= 1.0 and comp_ratio <= 1.0}
+
+def sweep_ratios(basis: dict, span: float, spacing: float, live_load: float) -> np.ndarray:
+    '''
+    Returns the governing ratio of every section of the basis profile at one point: the larger of the pre-composite and
+    full composite moment ratios from sweep_sections.
+    '''
+    catalog = load_catalog(basis['profile'])
+    results = sweep_sections(design_beam(basis, span, spacing, live_load, catalog.names[0]), catalog)
+    return np.maximum(results['pre_comp_ratio'], results['comp_ratio'])
+
+def comp_ratios(basis: dict, span: float, spacings, live_load: float) -> np.ndarray:
+    '''
+    Returns the full composite moment ratio of every section of the basis profile as in sweep_sections, with one beam
+    spacing per section.
+
+    Parameters:
+        basis (dict): design inputs from design_basis.
+        span (float): span length, ft
+        spacings: beam spacing of each section, ft
+        live_load (float): live load (L), psf
+    '''
+    catalog = load_catalog(basis['profile'])
+    sections = section_arrays(catalog)
+    beam = design_beam(basis, span, 1.0, live_load, catalog.names[0]) # deck and materials only
+    spacings = np.broadcast_to(np.asarray(spacings, dtype=float), sections['weight'].shape)
+
+    loads = {case: psf * spacings / 1000 for case, psf in {**basis['area_loads'], 'L': live_load}.items() if psf}
+    comp_Mu = governing_udl(loads, load_factors.ASCE_7_LRFD_COMBOS, sections['weight'] / 1000) * span**2 / 8
+    beff = np.minimum(spacings, span / 4) * 12 # beams at spacing on both sides, refer to design_beam
+    return comp_Mu / full_comp_strength(beam, sections, beff)
+
+@dataclass
+class DesignTable:
+    '''
+    Precomputed governing demand / capacity ratio of every section of a profile on a grid of span, beam spacing and live load.
+    Ratios are the larger of the pre-composite and full composite moment ratios from sweep_sections.
+
+    Queries read the grid cell around the point for every section at once, so their cost does not depend on the grid size.
+    Only the few sections that could pass in that cell are checked exactly through CompositeSteelBeam.
+
+    Parameters:
+        spans (np.ndarray): span grid, ft, increasing.
+        spacings (np.ndarray): beam spacing grid, ft, increasing.
+        live_loads (np.ndarray): live load grid, psf, increasing.
+        names (np.ndarray): section names.
+        weights (np.ndarray): section weights, plf.
+        ratios (np.ndarray): governing ratios with shape (spans, spacings, live loads, sections).
+        basis (dict): design inputs shared by every grid point, from design_basis.
+    '''
+    spans: np.ndarray
+    spacings: np.ndarray
+    live_loads: np.ndarray
+    names: np.ndarray
+    weights: np.ndarray
+    ratios: np.ndarray
+    basis: dict
+
+    def save(self, path: str) -> None:
+        '''
+        Writes the table to a compressed .npz file.
+        '''
+        np.savez_compressed(
+            path,
+            version=TABLE_VERSION,
+            spans=self.spans,
+            spacings=self.spacings,
+            live_loads=self.live_loads,
+            names=self.names,
+            weights=self.weights,
+            ratios=self.ratios,
+            basis=json.dumps(self.basis),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'DesignTable':
+        '''
+        Reads a table written by save.
+        '''
+        with np.load(path) as data:
+            if int(data['version']) != TABLE_VERSION:
+                raise ValueError(f'{path} is a version {int(data["version"])} design table, expected version {TABLE_VERSION}.')
+
+            return cls(
+                spans=data['spans'],
+                spacings=data['spacings'],
+                live_loads=data['live_loads'],
+                names=data['names'],
+                weights=data['weights'],
+                ratios=data['ratios'],
+                basis=json.loads(str(data['basis'])),
+            )
+
+    def _cell(self, span: float, spacing: float, live_load: float) -> tuple:
+        # Returns the 2 x 2 x 2 block of grid ratios around a point inside the grid, the point's position in the block
+        # along each axis, and the grid indices of the block's lower corner.
+        lower = []
+        weights = []
+        for axis, value in (('spans', span), ('spacings', spacing), ('live_loads', live_load)):
+            grid = getattr(self, axis)
+            if not grid[0] <= value <= grid[-1]:
+                raise ValueError(f'{value} is outside the {axis} grid, {grid[0]} to {grid[-1]}.')
+
+            i = min(int(np.searchsorted(grid, value, side='right')) - 1, len(grid) - 2) if len(grid) > 1 else 0
+            t = (value - grid[i]) / (grid[i + 1] - grid[i]) if len(grid) > 1 else 0.0
+            lower.append(i)
+            weights.append(t)
+
+        i, j, k = lower
+        return self.ratios[i:i + 2, j:j + 2, k:k + 2].astype(float), weights, lower
+
+    def interpolate(self, span: float, spacing: float, live_load: float) -> np.ndarray:
+        '''
+        Returns the governing ratio of every section at a point inside the grid by trilinear interpolation.
+        '''
+        block, weights, _ = self._cell(span, spacing, live_load)
+        for axis, t in enumerate(weights):
+            if block.shape[axis] == 2:
+                block = np.take(block, 0, axis=axis) * (1 - t) + np.take(block, 1, axis=axis) * t
+            else:
+                block = np.take(block, 0, axis=axis)
+            block = np.expand_dims(block, axis)
+
+        return block.reshape(-1)
+
+    def lower_bound(self, span: float, spacing: float, live_load: float) -> np.ndarray:
+        '''
+        Returns a lower bound of the governing ratio of every section anywhere in the grid cell around a point inside the
+        grid. Interpolation is not a bound, as it overestimates ratios that grow with span squared.
+
+        Demands grow with span, spacing and live load, so the pre-composite ratio is smallest at the cell's shortest span,
+        narrowest spacing and lowest live load. The full composite ratio is not smallest at a corner: while the concrete
+        controls, capacity grows in proportion to the effective width, which is the spacing up to span / 4, and the ratio
+        falls with spacing. Once the steel controls, or the span limits the effective width, capacity grows only through
+        the shallower stress block, or not at all, and the ratio rises. Its smallest value is therefore at the spacing
+        where the first of these happens, which differs by section, clipped to the cell. The bound is the larger of the
+        two smallest ratios.
+        '''
+        _, _, (i, j, k) = self._cell(span, spacing, live_load)
+        span_min, live_load_min = float(self.spans[i]), float(self.live_loads[k])
+        spacings = self.spacings[j:j + 2]
+
+        catalog = load_catalog(self.basis['profile'])
+        corner = sweep_sections(design_beam(self.basis, span_min, float(spacings[0]), live_load_min, catalog.names[0]), catalog)
+
+        # Spacing at which the concrete force reaches the steel yield force, 0.85 f'c beff t_s = As Fy.
+        t_s = self.basis['deck']['t_s']
+        steel_controls = section_arrays(catalog)['area'] * self.basis['steel_material']['fy'] / (0.85 * self.basis['concrete_material']['fc'] * t_s) / 12
+        turning_spacing = np.clip(np.minimum(steel_controls, span_min / 4), spacings[0], spacings[-1])
+
+        return np.maximum(corner['pre_comp_ratio'], comp_ratios(self.basis, span_min, turning_spacing, live_load_min))
+
+    def select(self, span: float, spacing: float, live_load: float, verify: bool = True) -> dict:
+        '''
+        Returns the lightest section that passes at a point inside the grid.
+
+        With verify, every section whose ratio could be at most 1.0, refer to lower_bound, is checked exactly through
+        CompositeSteelBeam lightest first, and the first that passes is returned. Sections that fail everywhere in the
+        grid cell are never analyzed. Without verify, the lightest section with an interpolated ratio of at most 1.0
+        is returned unchecked.
+
+        Returns:
+            dict: {'section': str or None, 'ratio': interpolated ratio, 'verified': result of verify_beam or None, 'checked': number of sections analyzed}
+        '''
+        ratios = self.interpolate(span, spacing, live_load)
+        bound = ratios if not verify else self.lower_bound(span, spacing, live_load)
+        candidates = np.flatnonzero(bound <= 1.0)
+        candidates = candidates[np.lexsort((ratios[candidates], self.weights[candidates]))]
+
+        checked = 0
+        for index in candidates:
+            section = str(self.names[index])
+            if not verify:
+                return {'section': section, 'ratio': float(ratios[index]), 'verified': None, 'checked': checked}
+
+            checked += 1
+            verified = verify_beam(design_beam(self.basis, span, spacing, live_load, section))
+            if verified['passes']:
+                return {'section': section, 'ratio': float(ratios[index]), 'verified': verified, 'checked': checked}
+
+        return {'section': None, 'ratio': None, 'verified': None, 'checked': checked}
+
+def build_design_table(template: CompositeSteelBeam, spans, spacings, live_loads, area_loads: dict, profile_name: str = 'W_shapes') -> DesignTable:
+    '''
+    Sweeps every section of a profile over a grid of span, beam spacing and live load and returns the governing ratios.
+    Meant to be run offline; save the table and load it at runtime.
+
+    Parameters:
+        template (CompositeSteelBeam): beam providing shoring, studs, deck and materials. Refer to design_basis.
+        spans: span grid, ft
+        spacings: beam spacing grid, ft
+        live_loads: live load grid, psf
+        area_loads (dict): area loads of the other load cases, psf, keyed by load case.
+        profile_name (str) Optional = 'W_shapes': section catalog to sweep.
+
+    Returns:
+        DesignTable: table of governing ratios.
+    '''
+    spans, spacings, live_loads = (np.sort(np.asarray(axis, dtype=float)) for axis in (spans, spacings, live_loads))
+    basis = design_basis(template, area_loads, profile_name)
+    catalog = load_catalog(profile_name)
+
+    ratios = np.empty((len(spans), len(spacings), len(live_loads), len(catalog.names)), dtype=np.float32)
+    for i, span in enumerate(spans):
+        for j, spacing in enumerate(spacings):
+            for k, live_load in enumerate(live_loads):
+                ratios[i, j, k] = sweep_ratios(basis, float(span), float(spacing), float(live_load))
+
+    return DesignTable(
+        spans=spans,
+        spacings=spacings,
+        live_loads=live_loads,
+        names=np.asarray(catalog.names),
+        weights=np.asarray(catalog.column('weight'), dtype=float),
+        ratios=ratios,
+        basis=basis,
+    )
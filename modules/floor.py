@@ -0,0 +1,168 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from modules.beam import CompositeSteelBeam
+from modules.load import PointLoad
+
+@dataclass
+class Connection:
+    '''
+    Connection of one end of a floor member to a supporting girder.
+
+    Parameters:
+        girder (str): name of the supporting girder.
+        location (float): location of the connection measured from the left end of the girder, ft.
+    '''
+    girder: str
+    location: float
+
+class Floor:
+    '''
+    Floor framing model. Members (infill beams and girders) form a dependency graph: the end reactions of each member
+    are applied as point loads to the girders that support it.
+
+    Members are analyzed level by level in dependency order, with the members of each level analyzed in parallel.
+    Only members marked dirty, and the girders downstream of them, are recomputed by analyze.
+
+    Change members through update_member so that the floor knows what to recompute. After mutating a member in place,
+    call mark_dirty.
+
+    Parameters:
+        engine (str) Optional = 'closed_form': analysis engine passed to CompositeSteelBeam.analyze.
+        workers (int) Optional: number of threads used to analyze each level. Defaults to the ThreadPoolExecutor default.
+    '''
+    def __init__(self, engine: str = 'closed_form', workers: int = None):
+        self.engine = engine
+        self.workers = workers
+        self.members = {}
+        self.supports = {}
+        self._applied_loads = {} # loads of each member, without reactions from supported members
+        self._dirty = set()
+
+    def add_member(self, beam: CompositeSteelBeam, left: Connection = None, right: Connection = None) -> None:
+        '''
+        Adds a member to the floor.
+
+        Parameters:
+            beam (CompositeSteelBeam): member to add. Its name must be unique in the floor.
+            left (Connection or (str, float)) Optional: girder supporting the left end and location along it. None if supported by a column or wall.
+            right (Connection or (str, float)) Optional: girder supporting the right end and location along it. None if supported by a column or wall.
+        '''
+        if beam.name in self.members:
+            raise ValueError(f'Floor already has a member named {beam.name!r}.')
+
+        self.members[beam.name] = beam
+        self.supports[beam.name] = tuple(Connection(*end) if isinstance(end, tuple) else end for end in (left, right))
+        self._applied_loads[beam.name] = list(beam.loads)
+        self._dirty.add(beam.name)
+
+    def update_member(self, name: str, **changes) -> None:
+        '''
+        Assigns new field values to a member, e.g. update_member('B1', loads=[...], shape=section), and marks it dirty.
+        '''
+        if changes.get('name', name) != name:
+            raise ValueError('Floor members cannot be renamed.')
+
+        beam = self.members[name]
+        for field_name, value in changes.items():
+            setattr(beam, field_name, value)
+        if 'loads' in changes:
+            self._applied_loads[name] = list(changes['loads'])
+
+        self._dirty.add(name)
+
+    def mark_dirty(self, *names: str) -> None:
+        '''
+        Marks members as changed so that analyze recomputes them and the girders downstream of them.
+        '''
+        for name in names:
+            if name not in self.members:
+                raise KeyError(f'Floor has no member named {name!r}.')
+        self._dirty.update(names)
+
+    def supported_members(self, girder: str) -> list:
+        '''
+        Returns the (member name, end index, Connection) of every member end supported by a girder. End index is 0 for left and 1 for right.
+        '''
+        return [
+            (name, end, connection)
+            for name, ends in self.supports.items()
+            for end, connection in enumerate(ends)
+            if connection is not None and connection.girder == girder
+        ]
+
+    def downstream(self, names) -> set:
+        '''
+        Returns every girder that carries load from the named members, directly or through other girders.
+        '''
+        found = set()
+        stack = list(names)
+        while stack:
+            for connection in self.supports[stack.pop()]:
+                if connection is not None and connection.girder not in found:
+                    found.add(connection.girder)
+                    stack.append(connection.girder)
+
+        return found
+
+    def levels(self) -> list:
+        '''
+        Returns the member names grouped into levels in dependency order. Members of a level only load girders of later levels, so they can be analyzed in parallel.
+        '''
+        carried_by = {name: set() for name in self.members} # members each girder waits on
+        for name, ends in self.supports.items():
+            for connection in ends:
+                if connection is None:
+                    continue
+                if connection.girder not in self.members:
+                    raise ValueError(f'{name!r} is supported by {connection.girder!r}, which is not a member of the floor.')
+                carried_by[connection.girder].add(name)
+
+        levels = []
+        remaining = dict(carried_by)
+        while remaining:
+            level = [name for name, waiting_on in remaining.items() if not waiting_on]
+            if not level:
+                raise ValueError(f'Members {sorted(remaining)} support each other in a cycle.')
+            for name in level:
+                del remaining[name]
+            for waiting_on in remaining.values():
+                waiting_on.difference_update(level)
+            levels.append(level)
+
+        return levels
+
+    def reaction_loads(self, girder: str) -> list:
+        '''
+        Returns the unfactored end reactions of the members supported by a girder as PointLoad objects, one per member end and load case.
+        '''
+        loads = []
+        for name, end, connection in self.supported_members(girder):
+            for case, reactions in self.members[name].calc_case_reactions().items():
+                loads.append(PointLoad(name=f'{name} reaction', load_case=case, magnitude=reactions[end], location=connection.location))
+
+        return loads
+
+    def _analyze_member(self, name: str) -> None:
+        beam = self.members[name]
+        beam.loads = self._applied_loads[name] + self.reaction_loads(name)
+        beam.analyze(self.engine)
+
+    def analyze(self) -> list:
+        '''
+        Analyzes the dirty members and every girder downstream of them, in dependency order.
+
+        Returns:
+            list[str]: names of the recomputed members, in the order their levels were analyzed.
+        '''
+        stale = self._dirty | self.downstream(self._dirty)
+        recomputed = []
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for level in self.levels():
+                names = [name for name in level if name in stale]
+                list(executor.map(self._analyze_member, names))
+                recomputed.extend(names)
+
+        self._dirty.clear()
+
+        return recomputed
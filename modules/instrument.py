@@ -0,0 +1,185 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+
+_DISABLED_SPAN = nullcontext()
+
+class Tracer:
+    '''
+    Collects named timing spans and counters. Spans nest per thread, so each span knows its parent stack.
+
+    When disabled, span() returns a shared no-op context manager and count() returns immediately, so instrumented code
+    pays for one attribute check per call.
+
+    Parameters:
+        enabled (bool) Optional = False: whether spans and counters are recorded.
+    '''
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.spans = []
+        self.counters = Counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+
+    def span(self, name: str, **args):
+        '''
+        Returns a context manager that records the time spent in its block as a span named name. Keyword arguments are stored with the span.
+        '''
+        if not self.enabled:
+            return _DISABLED_SPAN
+        return _Span(self, name, args)
+
+    def count(self, name: str, n: int = 1) -> None:
+        '''
+        Adds n to the counter named name.
+        '''
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] += n
+
+    def clear(self) -> None:
+        '''
+        Discards recorded spans and counters.
+        '''
+        with self._lock:
+            self.spans = []
+            self.counters = Counter()
+            self._origin_ns = time.perf_counter_ns()
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def summary(self) -> dict:
+        '''
+        Returns the total time, self time and number of calls of each span name, and the counters.
+
+        Returns:
+            dict: {'spans': {name: {'calls': int, 'total_ms': float, 'self_ms': float}}, 'counters': {name: int}}
+        '''
+        spans = {}
+        for span in self.spans:
+            row = spans.setdefault(span['name'], {'calls': 0, 'total_ms': 0.0, 'self_ms': 0.0})
+            row['calls'] += 1
+            row['total_ms'] += span['duration_ns'] / 1e6
+            row['self_ms'] += span['self_ns'] / 1e6
+
+        return {'spans': spans, 'counters': dict(self.counters)}
+
+    def chrome_trace(self) -> dict:
+        '''
+        Returns the spans and counters in the Chrome trace event format, viewable in chrome://tracing or Perfetto.
+        '''
+        pid = os.getpid()
+        events = [
+            {
+                'name': span['name'],
+                'ph': 'X',
+                'ts': span['start_ns'] / 1000,
+                'dur': span['duration_ns'] / 1000,
+                'pid': pid,
+                'tid': span['thread'],
+                'args': span['args'],
+            }
+            for span in self.spans
+        ]
+        end_us = max((event['ts'] + event['dur'] for event in events), default=0.0)
+        events.extend({'name': name, 'ph': 'C', 'ts': end_us, 'pid': pid, 'args': {name: value}} for name, value in self.counters.items())
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def folded_stacks(self) -> str:
+        '''
+        Returns the self time of each span stack in microseconds as folded stack lines, e.g. 'calc_beam;analyze 1250',
+        the input format of flamegraph.pl and speedscope.
+        '''
+        totals = Counter()
+        for span in self.spans:
+            totals[';'.join(span['stack'])] += span['self_ns'] // 1000
+
+        return '\n'.join(f'{stack} {us}' for stack, us in totals.items())
+
+    def write(self, path: str) -> None:
+        '''
+        Writes the recorded trace to a file: folded stacks if path ends with '.folded', otherwise Chrome trace JSON.
+        '''
+        with open(path, 'w') as f:
+            if path.endswith('.folded'):
+                f.write(self.folded_stacks() + '\n')
+            else:
+                json.dump(self.chrome_trace(), f)
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'args', 'start_ns', 'child_ns')
+
+    def __init__(self, tracer: Tracer, name: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.child_ns = 0
+
+    def __enter__(self):
+        self.tracer._stack().append(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        end_ns = time.perf_counter_ns()
+        tracer = self.tracer
+        stack = tracer._stack()
+        stack.pop()
+
+        duration_ns = end_ns - self.start_ns
+        if stack:
+            stack[-1].child_ns += duration_ns
+
+        record = {
+            'name': self.name,
+            'stack': [span.name for span in stack] + [self.name],
+            'start_ns': self.start_ns - tracer._origin_ns,
+            'duration_ns': duration_ns,
+            'self_ns': duration_ns - self.child_ns,
+            'thread': threading.get_ident(),
+            'args': self.args,
+        }
+        with tracer._lock:
+            tracer.spans.append(record)
+
+        return False
+
+# Process wide tracer used by the application modules. Set COMP_BEAM_TRACE=1 to enable it at startup.
+tracer = Tracer(enabled=os.environ.get('COMP_BEAM_TRACE', '') not in ('', '0'))
+
+def span(name: str, **args):
+    '''
+    Returns a timing span context manager of the process wide tracer. Refer to Tracer.span.
+    '''
+    return tracer.span(name, **args)
+
+def count(name: str, n: int = 1) -> None:
+    '''
+    Adds n to a counter of the process wide tracer.
+    '''
+    tracer.count(name, n)
+
+def traced(name: str):
+    '''
+    Decorator recording every call of the decorated function as a span of the process wide tracer.
+    '''
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
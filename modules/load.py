@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class Load():
     '''
     Load class
@@ -12,7 +12,7 @@ class Load():
     name: str
     load_case: str
 
-@dataclass
+@dataclass(slots=True)
 class UniformLoad(Load):
     '''
     Uniform load class, extends Load
@@ -24,4 +24,16 @@ class UniformLoad(Load):
     '''
     magnitude: float
     start_loc: float
-    end_loc: float
\ No newline at end of file
+    end_loc: float
+
+@dataclass(slots=True)
+class PointLoad(Load):
+    '''
+    Point load class, extends Load
+
+    Parameters:
+        magnitude (float): Magnitude of the point load, kips
+        location (float): Location of the point load measured from the left end of the beam, ft
+    '''
+    magnitude: float
+    location: float
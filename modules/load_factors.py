@@ -1,4 +1,5 @@
-import copy
+from dataclasses import dataclass
+import numpy as np
 
 ASCE_7_LRFD_COMBOS = {
     'LC1': {'D': 1.4},
@@ -94,6 +95,213 @@ def factor_load(D_load: float = 0.0, D: float = 0.0, CD_load: float = 0.0, CD: f
     factored_load = D_load * D + CD_load * CD + L_load * L + CL_load * CL + LLR_load * LLR + S_load * S + R_load * R + W_load * W + E_load * E
     return factored_load
 
+@dataclass
+class ComboMatrix:
+    '''
+    Load combinations compiled into a combination x load case factor matrix.
+
+    Parameters:
+        names (list[str]): load combination names, one per matrix row.
+        load_cases (list[str]): load case names, one per matrix column.
+        factors (np.ndarray): load factors with shape (len(names), len(load_cases)).
+    '''
+    names: list
+    load_cases: list
+    factors: np.ndarray
+
+_compiled_combos = {}
+
+def compile_combos(load_combos: dict, load_cases: list = None) -> ComboMatrix:
+    '''
+    Compiles a load combination dict into a ComboMatrix. Compiled matrices are cached per combination dict, so each table is compiled once.
+    Combination dicts are treated as constants; build a new dict rather than editing one that has already been compiled.
+
+    Args:
+        load_combos (dict[str, dict[str, float]]): dictionary of load combinations. Refer to combinations in load_factors.py. Any load case names may be used.
+        load_cases (list[str]) Optional: load case column order. Defaults to every load case in the combinations, in order of first appearance.
+
+    Returns:
+        ComboMatrix: compiled load combinations.
+    '''
+    key = (id(load_combos), None if load_cases is None else tuple(load_cases))
+    cached = _compiled_combos.get(key)
+    if cached is not None and cached[0] is load_combos:
+        return cached[1]
+
+    if load_cases is None:
+        load_cases = list(dict.fromkeys(case for combo in load_combos.values() for case in combo))
+
+    column = {case: i for i, case in enumerate(load_cases)}
+    factors = np.zeros((len(load_combos), len(load_cases)))
+    for i, combo in enumerate(load_combos.values()):
+        for case, factor in combo.items():
+            if case in column:
+                factors[i, column[case]] = factor
+
+    combo_matrix = ComboMatrix(names=list(load_combos), load_cases=list(load_cases), factors=factors)
+    _compiled_combos[key] = (load_combos, combo_matrix) # keep load_combos referenced so its id is not reused.
+
+    return combo_matrix
+
+@dataclass
+class PrunedCombos:
+    '''
+    Load combinations that can govern for a set of load cases, and the combinations removed because another always governs over them.
+
+    Parameters:
+        load_combos (dict[str, dict[str, float]]): surviving load combinations, in their original order.
+        pruned (dict[str, str]): name of each pruned combination mapped to the name of a surviving combination that dominates it.
+    '''
+    load_combos: dict
+    pruned: dict
+
+SIGN_CONSTRAINTS = ('positive', 'negative', 'any')
+
+_pruned_combos = {}
+
+def load_signs(loads: dict) -> dict:
+    '''
+    Returns the sign constraint of each load case present in the provided loads, for prune_combos. Cases with zero load are left out.
+
+    Args:
+        loads (dict): dictionary of applied loads keyed by load case. Refer to load_vector. Values may be arrays for many beams.
+
+    Returns:
+        dict[str, str]: 'positive', 'negative' or 'any' keyed by load case.
+    '''
+    signs = {}
+    for case, value in loads.items():
+        case = case.removesuffix('_load')
+        if isinstance(value, (int, float)): # scalar fast path, the common case for one beam
+            if value:
+                signs[case] = 'positive' if value > 0 else 'negative'
+            continue
+
+        value = np.asarray(value, dtype=float)
+        if not value.any():
+            continue
+        signs[case] = 'positive' if (value >= 0).all() else 'negative' if (value <= 0).all() else 'any'
+
+    return signs
+
+def prune_combos(load_combos: dict, signs: dict, governing: str = 'max') -> PrunedCombos:
+    '''
+    Removes load combinations that can never govern. Combination A dominates combination B when, for every load case present,
+    A's factor is at least B's for positive loads, at most B's for negative loads and equal to B's for loads of either sign
+    (reversed for governing='min'). Load cases not in signs are zero. Of combinations with equal factors on every present case
+    the first is kept, matching the tie breaking of governing_factored_load, so the governing combination is unchanged.
+
+    Results are cached per combination dict, sign constraints and governing, so the surviving dict is the same object on every call.
+
+    Args:
+        load_combos (dict[str, dict[str, float]]): dictionary of load combinations. Refer to combinations in load_factors.py.
+        signs (dict[str, str]): sign constraint of each load case present, one of SIGN_CONSTRAINTS. Refer to load_signs.
+        governing (str) Optional = 'max': 'max' or 'min', whether the largest or smallest factored load governs.
+
+    Returns:
+        PrunedCombos: surviving and pruned load combinations.
+    '''
+    key = (id(load_combos), tuple(sorted(signs.items())), governing)
+    cached = _pruned_combos.get(key)
+    if cached is not None and cached[0] is load_combos:
+        return cached[1]
+
+    for case, sign in signs.items():
+        if sign not in SIGN_CONSTRAINTS:
+            raise ValueError(f'Unknown sign constraint {sign!r} for load case {case!r}. Choose one of {list(SIGN_CONSTRAINTS)}.')
+    if governing not in ('max', 'min'):
+        raise ValueError(f"governing must be 'max' or 'min', not {governing!r}")
+
+    combo_matrix = compile_combos(load_combos)
+    direction = 1.0 if governing == 'max' else -1.0
+    columns = [i for i, case in enumerate(combo_matrix.load_cases) if case in signs]
+    column_signs = [signs[combo_matrix.load_cases[i]] for i in columns]
+
+    factors = combo_matrix.factors[:, columns]
+    ordered = np.array([sign != 'any' for sign in column_signs], dtype=bool)
+    scaled = factors[:, ordered] * direction * np.array([1.0 if sign == 'positive' else -1.0 for sign in column_signs if sign != 'any'])
+
+    # at_least[a, b]: combination a governs over combination b for any loads meeting the sign constraints.
+    at_least = (scaled[:, None, :] >= scaled[None, :, :]).all(axis=-1) & (factors[:, None, ~ordered] == factors[None, :, ~ordered]).all(axis=-1)
+    equal = (factors[:, None, :] == factors[None, :, :]).all(axis=-1)
+    index = np.arange(len(factors))
+    dominates = at_least & (~equal | (index[:, None] < index[None, :]))
+
+    survives = ~dominates.any(axis=0)
+    names = combo_matrix.names
+    pruned = {names[b]: names[np.flatnonzero(dominates[:, b] & survives)[0]] for b in np.flatnonzero(~survives)}
+    result = PrunedCombos(load_combos={names[i]: load_combos[names[i]] for i in np.flatnonzero(survives)}, pruned=pruned)
+
+    _pruned_combos[key] = (load_combos, result) # keep load_combos referenced so its id is not reused.
+    return result
+
+def load_vector(loads: dict, load_cases: list) -> np.ndarray:
+    '''
+    Returns the load intensities of the provided load dict ordered by load case.
+
+    Args:
+        loads (dict): dictionary of applied loads keyed by load case, with or without the '_load' suffix. For example, {'D_load': 175, 'L_load': 20} or {'D': 175, 'L': 20}.
+            Values may be floats for one beam, or equal length arrays for many beams. Load cases not in load_cases are ignored.
+        load_cases (list[str]): load case order, typically ComboMatrix.load_cases.
+
+    Returns:
+        np.ndarray: load intensities with shape (len(load_cases),) or (len(load_cases), number of beams).
+    '''
+    by_case = {}
+    for case, value in loads.items():
+        case = case.removesuffix('_load')
+        by_case[case] = by_case.get(case, 0.0) + np.asarray(value, dtype=float)
+
+    shape = np.broadcast_shapes(*[np.shape(value) for value in by_case.values()]) if by_case else ()
+    vector = np.zeros((len(load_cases),) + shape)
+    for i, case in enumerate(load_cases):
+        if case in by_case:
+            vector[i] = by_case[case]
+
+    return vector
+
+def factored_loads(loads: dict, load_combos: dict) -> np.ndarray:
+    '''
+    Returns the factored load resultant of the provided loads for every load combination as a single matrix product.
+
+    Args:
+        loads (dict): dictionary of applied loads keyed by load case. Refer to load_vector.
+        load_combos (dict[str, dict[str, float]] or ComboMatrix): load combinations to factor the loads by.
+
+    Returns:
+        np.ndarray: factored loads with shape (number of combinations,) or (number of combinations, number of beams).
+    '''
+    combo_matrix = load_combos if isinstance(load_combos, ComboMatrix) else compile_combos(load_combos)
+    return combo_matrix.factors @ load_vector(loads, combo_matrix.load_cases)
+
+def governing_factored_load(loads: dict, load_combos: dict, governing: str = 'max') -> tuple:
+    '''
+    Returns the governing factored load resultant and the name of the governing load combination.
+
+    Args:
+        loads (dict): dictionary of applied loads keyed by load case. Refer to load_vector.
+        load_combos (dict[str, dict[str, float]] or ComboMatrix): load combinations to factor the loads by.
+        governing (str) Optional = 'max': 'max' or 'min', whether the largest or smallest factored load governs.
+
+    Returns:
+        (float, str): governing factored load and combination name for one beam, or (np.ndarray, np.ndarray) of each for many beams.
+    '''
+    combo_matrix = load_combos if isinstance(load_combos, ComboMatrix) else compile_combos(load_combos)
+    values = factored_loads(loads, combo_matrix)
+
+    if governing == 'max':
+        index = values.argmax(axis=0)
+    elif governing == 'min':
+        index = values.argmin(axis=0)
+    else:
+        raise ValueError(f"governing must be 'max' or 'min', not {governing!r}")
+
+    governing_values = np.take_along_axis(values, np.expand_dims(index, 0), axis=0)[0]
+    if values.ndim == 1:
+        return float(governing_values), combo_matrix.names[index]
+
+    return governing_values, np.array(combo_matrix.names)[index]
+
 def max_factored_load(loads: dict, load_combos: dict) -> float:
     '''
     returns the maximum factored load resultant of the provided load dict for the provided load combination dict.
@@ -105,15 +313,7 @@ def max_factored_load(loads: dict, load_combos: dict) -> float:
     Returns:
         (float): Value of maximum factored load of all combinations.
     '''
-    factored_loads = []
-    for combo_name, combo in load_combos.items():
-        cur_loads = loads | combo # merge the loads dict with the current combo dict.
-        factored_load = factor_load(**cur_loads)
-        factored_loads.append(factored_load)
-
-    max_load = max(*factored_loads)
-
-    return max_load
+    return governing_factored_load(loads, load_combos, governing='max')[0]
 
 def min_factored_load(loads: dict, load_combos: dict) -> float:
     '''
@@ -126,15 +326,101 @@ def min_factored_load(loads: dict, load_combos: dict) -> float:
     Returns:
         (float): Value of minimum factored load of all combinations.
     '''
-    factored_loads = []
-    for combo_name, combo in load_combos.items():
-        cur_loads = loads | combo # merge the loads dict with the current combo dict.
-        factored_load = factor_load(**cur_loads)
-        factored_loads.append(factored_load)
+    return governing_factored_load(loads, load_combos, governing='min')[0]
 
-    min_load = min(*factored_loads)
+def envelope(results_arrays: dict) -> dict:
+    '''
+    Returns the maximum and minimum envelopes, by absolute value, of results across all load combinations along with the governing combination at each coordinate step.
+    The combination results are stacked into one array and enveloped in a single vectorized pass. The input is not modified. Ties are governed by the first combination.
 
-    return min_load
+    Args:
+        results_arrays (dict): dictionary of result array, keyed by load combo name (i.e. the output type of beams.extract_arrays_all_combos). Each result array is [x coordinates, values].
+
+    Returns:
+        dict: dictionary of envelope results in the following form:
+            {
+            'x': np.ndarray of x coordinates,
+            'max': np.ndarray of values with the largest magnitude at each coordinate, signed,
+            'min': np.ndarray of values with the smallest magnitude at each coordinate, signed,
+            'max_combo': np.ndarray of the index into 'combos' of the governing combination for 'max',
+            'min_combo': np.ndarray of the index into 'combos' of the governing combination for 'min',
+            'combos': list of combination names,
+            }
+    '''
+    combos = list(results_arrays)
+    x_coords = np.asarray(results_arrays[combos[0]][0])
+    values = np.stack([np.asarray(results_arrays[combo][1], dtype=float) for combo in combos])
+
+    magnitudes = np.abs(values)
+    max_combo = magnitudes.argmax(axis=0)
+    min_combo = magnitudes.argmin(axis=0)
+    stations = np.arange(values.shape[1])
+
+    return {
+        'x': x_coords,
+        'max': values[max_combo, stations],
+        'min': values[min_combo, stations],
+        'max_combo': max_combo,
+        'min_combo': min_combo,
+        'combos': combos,
+    }
+
+class EnvelopeAccumulator:
+    '''
+    Streaming version of envelope. Combination results are folded in one at a time, so only the running envelopes are kept in memory.
+
+    Example:
+        accumulator = EnvelopeAccumulator()
+        for combo_name in combos:
+            accumulator.add(combo_name, results.moment_array(combo_name))
+        moment_envelope = accumulator.result()
+    '''
+    def __init__(self):
+        self.combos = []
+        self.x = None
+        self.max = None
+        self.min = None
+        self.max_combo = None
+        self.min_combo = None
+
+    def add(self, combo_name: str, result_array) -> None:
+        '''
+        Folds the result array, [x coordinates, values], of one load combination into the envelopes.
+        '''
+        values = np.asarray(result_array[1], dtype=float)
+        index = len(self.combos)
+        self.combos.append(combo_name)
+
+        if self.x is None:
+            self.x = np.asarray(result_array[0])
+            self.max = values.copy()
+            self.min = values.copy()
+            self.max_combo = np.zeros(values.shape, dtype=int)
+            self.min_combo = np.zeros(values.shape, dtype=int)
+            return
+
+        magnitudes = np.abs(values)
+
+        is_max = magnitudes > np.abs(self.max)
+        self.max[is_max] = values[is_max]
+        self.max_combo[is_max] = index
+
+        is_min = magnitudes < np.abs(self.min)
+        self.min[is_min] = values[is_min]
+        self.min_combo[is_min] = index
+
+    def result(self) -> dict:
+        '''
+        Returns the envelopes of all combinations added so far, in the same form as envelope.
+        '''
+        return {
+            'x': self.x,
+            'max': self.max,
+            'min': self.min,
+            'max_combo': self.max_combo,
+            'min_combo': self.min_combo,
+            'combos': self.combos,
+        }
 
 def envelope_max(results_arrays: dict) -> list[list[float], list[float]]:
     '''
@@ -146,20 +432,8 @@ def envelope_max(results_arrays: dict) -> list[list[float], list[float]]:
     Returns:
         list[list[float], list[float]]: a list of lists where the first sublist is the x coordinates along the length of a member and the second sublist is an array of maximum values across all load combinations for each coordinate step
     '''
-    results_arrays_copy = copy.deepcopy(results_arrays)
-    first_key = list(results_arrays_copy.keys())[0]
-    x_coords = results_arrays_copy[first_key][0]
-
-    max_force_env = results_arrays_copy[first_key][1]
-    for key in results_arrays_copy:
-        cur_force_arr = results_arrays_copy[key][1]
-        for idx, value in enumerate(cur_force_arr):
-            if abs(max_force_env[idx]) < abs(value):
-                max_force_env[idx] = value
-
-    max_envelope = [x_coords, max_force_env]
-
-    return max_envelope
+    results = envelope(results_arrays)
+    return [results['x'], results['max']]
 
 def envelope_min(results_arrays: dict) -> list[list[float], list[float]]:
     '''
@@ -171,17 +445,5 @@ def envelope_min(results_arrays: dict) -> list[list[float], list[float]]:
     Returns:
         list[list[float], list[float]]: a list of lists where the first sublist is the x coordinates along the length of a member and the second sublist is an array of minimum values across all load combinations for each coordinate step
     '''
-    results_arrays_copy = copy.deepcopy(results_arrays)
-    first_key = list(results_arrays_copy.keys())[0]
-    x_coords = results_arrays_copy[first_key][0]
-
-    min_force_env = results_arrays_copy[first_key][1]
-    for key in results_arrays_copy:
-        cur_force_arr = results_arrays_copy[key][1]
-        for idx, value in enumerate(cur_force_arr):
-            if abs(min_force_env[idx]) > abs(value):
-                min_force_env[idx] = value
-
-    min_envelope = [x_coords, min_force_env]
-
-    return min_envelope
+    results = envelope(results_arrays)
+    return [results['x'], results['min']]
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from math import sqrt
 
-@dataclass
+@dataclass(slots=True)
 class Material:
     '''
     General Material Class
@@ -15,7 +15,7 @@ class Material:
     poisson_ratio: float
     density: float
 
-@dataclass
+@dataclass(slots=True)
 class Steel(Material):
     '''
     Steel material class
@@ -31,7 +31,7 @@ class Steel(Material):
     fy: int = 50
     fu: int = 65
 
-@dataclass
+@dataclass(slots=True)
 class Concrete(Material):
     '''
     Concrete material class
@@ -49,7 +49,8 @@ class Concrete(Material):
     fy: int = 60
     fyt: int = 60
     lw_mod_factor: float = 1.0
-    
-    def __post_init__(self): # calculated parameters after dataclass initialization
-        self.Ec = (self.density**1.5)*sqrt(self.fc)
+
+    @property
+    def Ec(self) -> float: # calculated from the current density and fc
+        return 33 * (self.density**1.5) * sqrt(self.fc * 1000) / 1000 # fc converted to psi, Ec converted back to ksi
     
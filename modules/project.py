@@ -0,0 +1,282 @@
+from dataclasses import fields
+from functools import cache
+import json
+import mmap
+import os
+import struct
+import zlib
+import numpy as np
+from modules.beam import CompositeSteelBeam
+from modules.load import UniformLoad, PointLoad
+from modules.material import Steel, Concrete
+from modules.catalog import load_catalog
+
+PROJECT_VERSION = 1
+MAGIC = b'CBPROJ\x00\x00'
+
+# File layout, all little endian:
+#   header: MAGIC (8 bytes), version (uint32), beam count (uint32), index offset (uint64)
+#   records: one zlib compressed UTF-8 JSON record per beam, see beam_record
+#   index at index offset: (record offset uint64, record length uint32) per beam
+#   names: zlib compressed UTF-8 JSON list of beam names, to the end of the file
+# Records are compressed with a preset dictionary of the record keys, since each record alone is too short to compress well.
+
+HEADER = struct.Struct('<8sIIQ')
+INDEX_DTYPE = np.dtype([('offset', '<u8'), ('length', '<u4')])
+
+LOAD_TYPES = {'UniformLoad': UniformLoad, 'PointLoad': PointLoad}
+
+_ZDICT = json.dumps({
+    'name': 'Composite Beam', 'span': 30.0, 'section': {'profile': 'W_shapes', 'name': 'W16X26'}, 'shored': False,
+    'layout': [['Beam', 8.0], ['Beam', 8.0]],
+    'studs': {'fu': 65, 'dia': 0.75, 'length': 5.0, 'max_comp': 1.0, 'min_comp': 0.25},
+    'deck': {'t_s': 3.5, 'deck_height': 3.0, 'orientation': 90},
+    'steel_material': {'name': 'Steel', 'poisson_ratio': 0.3, 'density': 490, 'E': 29000, 'G': 11200, 'fy': 50, 'fu': 65},
+    'concrete_material': {'name': 'Concrete', 'poisson_ratio': 0.2, 'density': 145, 'fc': 4.0, 'fy': 60, 'fyt': 60, 'lw_mod_factor': 1.0},
+    'loads': [
+        {'type': 'UniformLoad', 'name': 'Uniform Dead Load', 'load_case': 'D', 'magnitude': 0.5, 'start_loc': 0, 'end_loc': 30},
+        {'type': 'PointLoad', 'name': 'Point Live Load', 'load_case': 'L', 'magnitude': 1.0, 'location': 15.0},
+    ],
+    'summary': None, 'inputs': None,
+}).encode()
+
+@cache
+def _field_names(cls) -> tuple:
+    return tuple(field.name for field in fields(cls))
+
+def _flat_dict(obj) -> dict:
+    # Shallow dataclasses.asdict for the flat material and load dataclasses, several times faster.
+    return {name: getattr(obj, name) for name in _field_names(type(obj))}
+
+def beam_record(beam: CompositeSteelBeam, summary: dict = None, inputs: dict = None) -> dict:
+    '''
+    Returns the design inputs of a beam as a JSON compatible record. The section is stored by catalog profile and name.
+    Analysis results and the PyNite model are not stored.
+
+    Parameters:
+        beam (CompositeSteelBeam): beam to store.
+        summary (dict) Optional: summary results to store with the beam, e.g. app_logic.beam_summary.
+        inputs (dict) Optional: user interface inputs to store with the beam, e.g. the streamlit design inputs.
+    '''
+    catalog = getattr(beam.shape, 'catalog', None)
+    return {
+        'name': beam.name,
+        'span': beam.span,
+        'section': {'profile': catalog.profile if catalog is not None else 'W_shapes', 'name': beam.shape.name},
+        'shored': beam.shored,
+        'layout': [list(side) for side in beam.layout],
+        'studs': dict(beam.studs),
+        'deck': dict(beam.deck),
+        'steel_material': _flat_dict(beam.steel_material),
+        'concrete_material': _flat_dict(beam.concrete_material),
+        'loads': [{'type': type(load).__name__, **_flat_dict(load)} for load in beam.loads],
+        'summary': summary,
+        'inputs': inputs,
+    }
+
+def record_beam(record: dict) -> CompositeSteelBeam:
+    '''
+    Returns the CompositeSteelBeam of a record from beam_record, with its section from the compiled catalog.
+    '''
+    return CompositeSteelBeam(
+        name=record['name'],
+        span=record['span'],
+        shape=load_catalog(record['section']['profile']).section(record['section']['name']),
+        shored=record['shored'],
+        layout=tuple(tuple(side) for side in record['layout']),
+        studs=dict(record['studs']),
+        deck=dict(record['deck']),
+        steel_material=Steel(**record['steel_material']),
+        concrete_material=Concrete(**record['concrete_material']),
+        loads=[LOAD_TYPES[load['type']](**{key: value for key, value in load.items() if key != 'type'}) for load in record['loads']],
+    )
+
+def _json_default(value):
+    # NumPy scalars from summaries and section properties.
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+class ProjectWriter:
+    '''
+    Writes beams to a project file one at a time, so projects of any size are written without holding every record in memory.
+
+    Example:
+        with ProjectWriter('floor.cbproj') as writer:
+            for beam in beams:
+                writer.add(beam)
+
+    Parameters:
+        path (str or file): output file path, or a seekable binary file object such as io.BytesIO, which is left open.
+    '''
+    def __init__(self, path):
+        self.path = path
+        self._owns_file = not hasattr(path, 'write')
+        self.file = open(path, 'wb') if self._owns_file else path
+        self._start = self.file.tell()
+        self._closed = False
+        self.file.write(HEADER.pack(MAGIC, PROJECT_VERSION, 0, 0))
+        self.names = []
+        self.index = []
+
+    def add(self, beam: CompositeSteelBeam, summary: dict = None, inputs: dict = None) -> None:
+        '''
+        Appends a beam to the project. Refer to beam_record.
+        '''
+        self.add_record(beam_record(beam, summary, inputs))
+
+    def add_record(self, record: dict) -> None:
+        '''
+        Appends a record from beam_record to the project.
+        '''
+        compressor = zlib.compressobj(level=6, zdict=_ZDICT)
+        data = compressor.compress(json.dumps(record, separators=(',', ':'), default=_json_default).encode()) + compressor.flush()
+
+        self.index.append((self.file.tell() - self._start, len(data)))
+        self.names.append(record['name'])
+        self.file.write(data)
+
+    def close(self) -> None:
+        '''
+        Writes the index and beam names and completes the header.
+        '''
+        if self._closed:
+            return
+        self._closed = True
+
+        index_offset = self.file.tell() - self._start
+        self.file.write(np.array(self.index, dtype=INDEX_DTYPE).tobytes())
+        self.file.write(zlib.compress(json.dumps(self.names).encode()))
+        end = self.file.tell()
+        self.file.seek(self._start)
+        self.file.write(HEADER.pack(MAGIC, PROJECT_VERSION, len(self.index), index_offset))
+        self.file.seek(end)
+        if self._owns_file:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+def write_project(path: str, beams: list, summaries: list = None) -> str:
+    '''
+    Writes beams, and optionally a summary per beam, to a project file.
+
+    Returns:
+        str: path of the written project file.
+    '''
+    with ProjectWriter(path) as writer:
+        for i, beam in enumerate(beams):
+            writer.add(beam, summaries[i] if summaries is not None else None)
+
+    return path
+
+class Project:
+    '''
+    Memory-mapped project file written by ProjectWriter. Opening a project reads only the header and the index;
+    each record is decompressed when it is accessed, so one beam is read without decoding the rest of the file.
+    Beams may be looked up by position or by name.
+
+    Parameters:
+        path (str) Optional: path of the project file.
+        data (bytes) Optional: contents of a project file, read instead of path.
+    '''
+    def __init__(self, path: str = None, data: bytes = None):
+        self.path = path
+        if data is not None:
+            self._map = data
+        else:
+            with open(path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(path) else b''
+
+        source = path or 'data'
+        if len(self._map) < HEADER.size:
+            raise ValueError(f'{source} is not a project file.')
+        magic, version, count, index_offset = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f'{source} is not a project file.')
+        if version != PROJECT_VERSION:
+            raise ValueError(f'{source} is project version {version}, expected {PROJECT_VERSION}.')
+        if index_offset == 0:
+            raise ValueError(f'{source} is incomplete; its writer was not closed.')
+
+        self.version = version
+        self.index = np.frombuffer(self._map, dtype=INDEX_DTYPE, count=count, offset=index_offset).copy() # 12 bytes per beam
+        self._names_offset = index_offset + count * INDEX_DTYPE.itemsize
+        self._names = None
+        self._positions = None
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Project':
+        '''
+        Returns a project read from the bytes of a project file, e.g. an uploaded file.
+        '''
+        return cls(data=data)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def names(self) -> list:
+        '''
+        Returns the beam names in file order. Decoded on first use.
+        '''
+        if self._names is None:
+            self._names = json.loads(zlib.decompress(self._map[self._names_offset:]))
+        return self._names
+
+    def position(self, key) -> int:
+        '''
+        Returns the position of a beam given its position or name.
+        '''
+        if isinstance(key, (int, np.integer)):
+            if not -len(self) <= key < len(self):
+                raise IndexError(f'Project has {len(self)} beams, no beam {key}.')
+            return int(key) % len(self)
+
+        if self._positions is None:
+            self._positions = {name: i for i, name in enumerate(self.names)}
+        if key not in self._positions:
+            raise KeyError(f'Project has no beam named {key!r}.')
+        return self._positions[key]
+
+    def record(self, key) -> dict:
+        '''
+        Returns the record of one beam, by position or name. Refer to beam_record.
+        '''
+        offset, length = self.index[self.position(key)]
+        decompressor = zlib.decompressobj(zdict=_ZDICT)
+        return json.loads(decompressor.decompress(self._map[offset:offset + length]))
+
+    def beam(self, key) -> CompositeSteelBeam:
+        '''
+        Returns one beam, by position or name, as a CompositeSteelBeam ready for analysis.
+        '''
+        return record_beam(self.record(key))
+
+    def summary(self, key) -> dict:
+        '''
+        Returns the stored summary results of one beam, by position or name, or None if none were stored.
+        '''
+        return self.record(key)['summary']
+
+    def __getitem__(self, key) -> CompositeSteelBeam:
+        return self.beam(key)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.record(i)
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
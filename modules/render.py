@@ -1,6 +1,14 @@
+import os
+from io import BytesIO
 from PIL import Image, ImageDraw
-from beam import CompositeSteelBeam
+from modules.beam import CompositeSteelBeam
+from modules.cache import LRUCache
+from modules.catalog import load_catalog
 import numpy as np
+import modules.instrument as instrument
+
+# Encoded PNG images keyed by geometry and image size. Bytes are immutable, so cached images can be shared safely.
+png_cache = LRUCache(maxsize=256)
 
 def render_beam_isometric(beam: CompositeSteelBeam, img_width: float = 500, img_height: float = 300) -> Image:
     '''
@@ -19,6 +27,83 @@ def render_beam_isometric(beam: CompositeSteelBeam, img_width: float = 500, img_
 
     return im
 
+def section_geometry(beam: CompositeSteelBeam) -> tuple:
+    '''
+    Returns the geometry that a section rendering depends on: (bf, tf, tw, d, slab_width, slab_depth), in inches.
+    '''
+    return (
+        beam.shape.bf,
+        beam.shape.tf,
+        beam.shape.tw,
+        beam.shape.d,
+        beam.calc_effective_width() * 12,
+        beam.deck['deck_height'] + beam.deck['t_s'],
+    )
+
+def section_polygons(bf, tf, tw, d, slab_width, slab_depth, img_width: float, img_height: float) -> tuple:
+    '''
+    Returns the image coordinates of the steel beam and concrete slab outlines, scaled to fill the image and centered.
+    Geometry arguments may be arrays to calculate the outlines of many sections in one pass.
+
+    Returns:
+        (np.ndarray, np.ndarray): steel outline with shape (..., 12, 2) and slab outline with shape (..., 4, 2).
+    '''
+    bf, tf, tw, d, slab_width, slab_depth = np.broadcast_arrays(*[np.asarray(value, dtype=float) for value in (bf, tf, tw, d, slab_width, slab_depth)])
+    zero = np.zeros_like(bf)
+    web_left = (bf - tw) / 2
+    web_right = bf - web_left
+
+    steel = np.stack([
+        np.stack([zero, zero], -1),
+        np.stack([bf, zero], -1),
+        np.stack([bf, tf], -1),
+        np.stack([web_right, tf], -1),
+        np.stack([web_right, d - tf], -1),
+        np.stack([bf, d - tf], -1),
+        np.stack([bf, d], -1),
+        np.stack([zero, d], -1),
+        np.stack([zero, d - tf], -1),
+        np.stack([web_left, d - tf], -1),
+        np.stack([web_left, tf], -1),
+        np.stack([zero, tf], -1),
+    ], -2)
+    slab = np.stack([
+        np.stack([zero, zero], -1),
+        np.stack([slab_width, zero], -1),
+        np.stack([slab_width, slab_depth], -1),
+        np.stack([zero, slab_depth], -1),
+    ], -2)
+
+    #Calculate an appropriate scale to fill the image region
+    total_height = d + slab_depth
+    scale = np.minimum(img_width / np.maximum(slab_width, bf), img_height / total_height)[..., None, None]
+
+    # Scale everything, center the slab and beam in the image and shift the beam down to make room for the slab.
+    slab = slab * scale
+    slab[..., 0] += img_width / 2 - (slab_width[..., None] / 2) * scale[..., 0]
+    steel = steel * scale
+    steel[..., 0] += img_width / 2 - (bf[..., None] / 2) * scale[..., 0]
+    steel[..., 1] += slab_depth[..., None] * scale[..., 0]
+
+    return steel, slab
+
+def _draw_section(draw: ImageDraw, steel: np.ndarray, slab: np.ndarray, line_width: int, offset: tuple = (0, 0)) -> None:
+    # Draw one section outline, shifted by offset, as Pillow polygons.
+    steel = steel + offset
+    draw.polygon(xy=list(map(tuple, steel)), outline='red', width=line_width)
+    if np.ptp(slab[:, 1]) > 0:
+        slab = slab + offset
+        draw.polygon(xy=list(map(tuple, slab)), outline='gray', width=line_width, fill='darkgray')
+
+def _line_width(img_width: float, img_height: float) -> int:
+    return max(round(min(img_height, img_width) * 0.005), 1)
+
+def _encode_png(im: Image) -> bytes:
+    buffer = BytesIO()
+    im.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+@instrument.traced('render.beam_section')
 def render_beam_section(beam: CompositeSteelBeam, img_width: float = 500, img_height: float = 300) -> Image:
     '''
     Create 2D section image of the composite beam provided.
@@ -35,68 +120,88 @@ def render_beam_section(beam: CompositeSteelBeam, img_width: float = 500, img_he
     im = Image.new(mode='RGB', size=(img_width,img_height), color=(255,255,255))
     draw = ImageDraw.Draw(im, mode='RGBA')
 
-    # Generate list of points for steel beam.
-    bf = beam.shape.bf
-    tf = beam.shape.tf
-    tw = beam.shape.tw
-    d = beam.shape.d
-
-    steel_beam_coords = [
-        (0,0),
-        (bf, 0),
-        (bf, tf),
-        (bf - ((bf - tw )/ 2), tf),
-        (bf - ((bf - tw )/ 2), d - tf),
-        (bf, d - tf),
-        (bf, d),
-        (0, d),
-        (0, d - tf),
-        ((bf - tw) / 2, d - tf),
-        ((bf - tw) / 2, tf),
-        (0, tf)
-    ]
-
-    # Generate list of points for the concrete slab
-    slab_depth = beam.deck['deck_height'] + beam.deck['t_s']
-    slab_width = beam.calc_effective_width() * 12
-    conc_slab_coords = [
-        (0,0),
-        (slab_width, 0),
-        (slab_width, slab_depth),
-        (0, slab_depth)
-    ]
-
-    #Calculate an appropriate scale to fill the image region
-    total_height = d + slab_depth
-    scale_x = img_width / slab_width
-    scale_y = img_height / total_height
-    scale = min(scale_x, scale_y)
-
-    # use numpy to shift slab to be centered, on top of beam then scale everything.
-    np_conc_nodes = np.array(conc_slab_coords)
-    np_conc_nodes *= scale #scale entire matrix
-    np_conc_nodes[:,0] += img_width / 2 - (slab_width / 2) * scale #shift x coords to center in image
-    scaled_conc_nodes = list(map(tuple, np_conc_nodes)) #convert nodes back to list of tuples for PIllow
-
-    # Use numpy to scale coords element wise, then convert back to list of tuples for Pillow.
-    np_steel_nodes = np.array(steel_beam_coords)
-    np_steel_nodes *= scale #scale coordinates
-    np_steel_nodes[:,0] += img_width / 2 - (bf /2) * scale #shift x coords to center beam in image.
-    np_steel_nodes[:,1] += slab_depth * scale #shift y coords down to make room for slab.
-    scaled_steel_nodes = list(map(tuple, np_steel_nodes)) #convert nodes back to list of tuples for PIllow
-
-    # Draw steel shape on image
-    line_width = round(min(img_height, img_width) * 0.005)
-    draw.polygon(xy=scaled_steel_nodes, outline='red', width=line_width)
-    draw.polygon(xy=scaled_conc_nodes, outline='gray', width=line_width, fill='darkgray')
+    steel, slab = section_polygons(*section_geometry(beam), img_width, img_height)
+    _draw_section(draw, steel, slab, _line_width(img_width, img_height))
 
     return im
 
-    
+def render_beam_section_png(beam: CompositeSteelBeam, img_width: int = 500, img_height: int = 300) -> bytes:
+    '''
+    Returns the section image of render_beam_section encoded as PNG bytes. Images are cached by section geometry and
+    image size, so reruns with unchanged geometry skip drawing and encoding.
+    '''
+    key = ('section', section_geometry(beam), img_width, img_height)
+    return png_cache.get_or_compute(key, lambda: _encode_png(render_beam_section(beam, img_width, img_height)))
 
+@instrument.traced('render.section_sheet')
+def render_section_sheet(names: list, bf, tf, tw, d, slab_width=0.0, slab_depth=0.0, thumb_width: int = 96, thumb_height: int = 96, columns: int = 16, padding: int = 4) -> tuple:
+    '''
+    Renders thumbnails of many sections into one sprite sheet image in a single pass. Outlines of every section are calculated in one vectorized call.
 
+    Parameters:
+        names (list[str]): section names, one per thumbnail.
+        bf, tf, tw, d: section dimensions, in. Arrays with one value per name.
+        slab_width, slab_depth Optional = 0.0: slab dimensions drawn above each section, in. No slab is drawn where slab_depth is 0.
+        thumb_width (int) Optional = 96: thumbnail width in pixels
+        thumb_height (int) Optional = 96: thumbnail height in pixels
+        columns (int) Optional = 16: thumbnails per row of the sheet
+        padding (int) Optional = 4: blank margin inside each thumbnail in pixels
+
+    Returns:
+        (Image, dict): sprite sheet, and the (left, top, right, bottom) box of each thumbnail keyed by name.
+    '''
+    steel, slab = section_polygons(bf, tf, tw, d, slab_width, slab_depth, thumb_width - 2 * padding, thumb_height - 2 * padding)
+    rows = -(-len(names) // columns)
 
+    sheet = Image.new(mode='RGB', size=(columns * thumb_width, rows * thumb_height), color=(255,255,255))
+    draw = ImageDraw.Draw(sheet, mode='RGBA')
+    line_width = _line_width(thumb_width, thumb_height)
 
+    boxes = {}
+    for i, name in enumerate(names):
+        left = (i % columns) * thumb_width
+        top = (i // columns) * thumb_height
+        _draw_section(draw, steel[i], slab[i], line_width, offset=(left + padding, top + padding))
+        boxes[name] = (left, top, left + thumb_width, top + thumb_height)
 
+    return sheet, boxes
 
-    
\ No newline at end of file
+def catalog_sprite_sheet(profile_name: str = 'W_shapes', thumb_width: int = 96, thumb_height: int = 96, columns: int = 16) -> tuple:
+    '''
+    Returns a PNG sprite sheet of every steel section in a compiled catalog, e.g. for a section picker gallery. Cached per catalog and size.
+
+    Returns:
+        (bytes, dict): PNG bytes of the sheet, and the (left, top, right, bottom) box of each thumbnail keyed by section name.
+    '''
+    catalog = load_catalog(profile_name)
+
+    def render():
+        sheet, boxes = render_section_sheet(
+            catalog.names, catalog.column('bf'), catalog.column('tf'), catalog.column('tw'), catalog.column('d'),
+            thumb_width=thumb_width, thumb_height=thumb_height, columns=columns,
+        )
+        return _encode_png(sheet), boxes
+
+    return png_cache.get_or_compute(('catalog', catalog.path, thumb_width, thumb_height, columns), render)
+
+def write_section_thumbnails(directory: str, profile_name: str = 'W_shapes', thumb_width: int = 96, thumb_height: int = 96) -> list:
+    '''
+    Writes one PNG thumbnail per catalog section to a directory, cut from a single sprite sheet render.
+
+    Returns:
+        list[str]: paths of the written files, named after the sections.
+    '''
+    catalog = load_catalog(profile_name)
+    sheet, boxes = render_section_sheet(
+        catalog.names, catalog.column('bf'), catalog.column('tf'), catalog.column('tw'), catalog.column('d'),
+        thumb_width=thumb_width, thumb_height=thumb_height,
+    )
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, box in boxes.items():
+        path = os.path.join(directory, f'{name}.png')
+        sheet.crop(box).save(path)
+        paths.append(path)
+
+    return paths
@@ -0,0 +1,140 @@
+from math import sqrt
+import re
+import numpy as np
+from modules.beam import CompositeSteelBeam
+from modules.catalog import SectionCatalog, load_catalog
+
+NOMINAL_DEPTH = re.compile(r'^[A-Z]+(\d+(?:\.\d+)?)X')
+
+class SectionIndex:
+    '''
+    Index of the sections of a compiled catalog for fast candidate filtering. Every column is stored sorted by weight, so
+    a query is a handful of vectorized comparisons and its matches come out lightest first without sorting or a Python loop.
+
+    Compactness follows CompositeSteelBeam.flange_is_compact and CompositeSteelBeam.web_is_compact, AISC Table B4.1b.
+    Its masks depend on Fy and are built once per Fy.
+
+    Parameters:
+        catalog (SectionCatalog): compiled section catalog to index.
+        E (float) Optional = 29000: steel elastic modulus used by the compactness limits, ksi
+    '''
+    def __init__(self, catalog: SectionCatalog, E: float = 29000):
+        self.catalog = catalog
+        self.E = E
+
+        weight = catalog.column('weight')
+        self.order = np.argsort(weight, kind='stable') # catalog positions, lightest first
+        self.names = np.asarray(catalog.names)[self.order]
+        self.columns = {field: np.asarray(column)[self.order] for field, column in catalog.columns.items()}
+        self.nominal_depth = np.array([
+            float(match.group(1)) if (match := NOMINAL_DEPTH.match(name)) else np.nan for name in self.names
+        ])
+
+        # Width-to-thickness ratios of the flange and web.
+        self.b_t = self.columns['bf'] / 2 / self.columns['tf']
+        self.h_tw = self.columns['T'] / self.columns['tw']
+        self._compact = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def compact(self, fy: float = 50) -> tuple:
+        '''
+        Returns boolean arrays of whether the flange and the web of each section are compact at Fy, in index order.
+        '''
+        masks = self._compact.get(fy)
+        if masks is None:
+            sqrt_E_Fy = sqrt(self.E / fy)
+            masks = self._compact[fy] = (self.b_t <= 0.38 * sqrt_E_Fy, self.h_tw <= 3.76 * sqrt_E_Fy)
+        return masks
+
+    def mask(
+            self,
+            fy: float = 50,
+            compact_flange: bool = None,
+            compact_web: bool = None,
+            max_depth: float = None,
+            max_nominal_depth: float = None,
+            min_Zx: float = None,
+            min_Ix: float = None,
+            min_area: float = None,
+            max_weight: float = None,
+        ) -> np.ndarray:
+        '''
+        Returns a boolean array of the sections meeting every criterion provided, in index order. Criteria left as None are not applied.
+
+        Parameters:
+            fy (float) Optional = 50: steel yield stress of the compactness limits, ksi
+            compact_flange (bool) Optional: require a compact (True) or noncompact (False) flange.
+            compact_web (bool) Optional: require a compact (True) or noncompact (False) web.
+            max_depth (float) Optional: maximum actual depth, d, in
+            max_nominal_depth (float) Optional: maximum nominal depth from the section name, e.g. 16 for W16X26, in
+            min_Zx (float) Optional: minimum plastic section modulus, in^3
+            min_Ix (float) Optional: minimum moment of inertia, in^4
+            min_area (float) Optional: minimum area, in^2, e.g. from CompositeSteelBeam.calc_req_steel_area.
+            max_weight (float) Optional: maximum weight, plf
+        '''
+        mask = np.ones(len(self), dtype=bool)
+        flange, web = self.compact(fy)
+        if compact_flange is not None:
+            mask &= flange == compact_flange
+        if compact_web is not None:
+            mask &= web == compact_web
+
+        for values, limit, upper in (
+                (self.columns['d'], max_depth, True),
+                (self.nominal_depth, max_nominal_depth, True),
+                (self.columns['weight'], max_weight, True),
+                (self.columns['Zx'], min_Zx, False),
+                (self.columns['Ix'], min_Ix, False),
+                (self.columns['area'], min_area, False),
+            ):
+            if limit is not None:
+                mask &= values <= limit if upper else values >= limit
+
+        return mask
+
+    def query(self, limit: int = None, **criteria) -> list:
+        '''
+        Returns the names of the sections meeting every criterion, lightest first. Refer to mask for the criteria.
+
+        Parameters:
+            limit (int) Optional: maximum number of names to return.
+        '''
+        return self.names[np.flatnonzero(self.mask(**criteria))[:limit]].tolist()
+
+    def positions(self, **criteria) -> np.ndarray:
+        '''
+        Returns the catalog positions of the sections meeting every criterion, lightest first, e.g. for BeamBatch.shape.
+        '''
+        return self.order[self.mask(**criteria)]
+
+_indexes = {}
+
+def get_section_index(profile_name: str = 'W_shapes', E: float = 29000) -> SectionIndex:
+    '''
+    Returns the SectionIndex of a compiled catalog, built once per profile and modulus.
+    '''
+    key = (profile_name, E)
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = SectionIndex(load_catalog(profile_name), E)
+    return index
+
+def beam_candidates(beam: CompositeSteelBeam, profile_name: str = 'W_shapes', limit: int = None, **criteria) -> list:
+    '''
+    Returns the names of the sections, lightest first, with a compact flange and web at the beam's Fy and at least the
+    required steel area of the analyzed beam, CompositeSteelBeam.calc_req_steel_area. Further criteria, e.g. max_depth,
+    are passed to SectionIndex.mask and override these defaults.
+    '''
+    if beam.results is None:
+        beam.analyze()
+
+    criteria = {
+        'fy': beam.steel_material.fy,
+        'compact_flange': True,
+        'compact_web': True,
+        'min_area': beam.calc_req_steel_area(),
+        **criteria,
+    }
+    return get_section_index(profile_name, beam.steel_material.E).query(limit=limit, **criteria)
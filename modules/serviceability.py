@@ -0,0 +1,206 @@
+import numpy as np
+import modules.load_factors as load_factors
+from modules.load import PointLoad
+from modules.superposition import SpanLoads
+
+# Deflection limits as span / n, keyed by check.
+DEFAULT_LIMITS = {
+    'construction': 360, # pre-composite service loads on the steel beam
+    'live': 360, # each live load case on the composite beam
+    'total': 240, # service load combinations on the composite beam
+}
+
+LIVE_CASES = ('L', 'LLR', 'S', 'R')
+
+def transformed_I(Is, As, d, beff, t_s, deck_height, n, cracked: bool = True):
+    '''
+    Returns the moment of inertia of the elastic transformed composite section, in^4. Concrete below the top of the deck
+    is neglected (deck perpendicular to the beam), as is concrete in tension when the neutral axis falls in the slab,
+    unless cracked is False. All arguments may be arrays.
+
+    Parameters:
+        Is, As, d: steel moment of inertia (in^4), area (in^2) and depth (in)
+        beff: effective slab width, in
+        t_s: concrete thickness above the deck, in
+        deck_height: deck height, in
+        n: modular ratio, Es / Ec
+        cracked (bool) Optional = True: neglect concrete in tension. False for the uncracked section, e.g. for vibration.
+    '''
+    Is, As, d, beff, t_s, deck_height, n = np.broadcast_arrays(*[np.asarray(value, dtype=float) for value in (Is, As, d, beff, t_s, deck_height, n)])
+    b_t = beff / n # transformed slab width
+    top = d + deck_height + t_s # top of slab measured from bottom of steel
+    y_slab = top - t_s / 2
+
+    # Uncracked neutral axis measured from bottom of steel
+    y_bar = (As * d / 2 + b_t * t_s * y_slab) / (As + b_t * t_s)
+    I_uncracked = Is + As * (y_bar - d / 2)**2 + b_t * t_s**3 / 12 + b_t * t_s * (y_slab - y_bar)**2
+
+    if not cracked:
+        return I_uncracked
+
+    # Neutral axis in the slab: depth of concrete in compression, x, from b_t x^2 / 2 = As (top - x - d/2)
+    x = (-As + np.sqrt(As**2 + 2 * b_t * As * (top - d / 2))) / b_t
+    I_cracked = Is + As * (top - x - d / 2)**2 + b_t * x**3 / 3
+
+    return np.where(y_bar > top - t_s, I_cracked, I_uncracked)
+
+def lower_bound_I(Is, As, d, Fy, sum_Qn, fc, beff, t_s, deck_height):
+    '''
+    Returns the lower bound moment of inertia of a composite beam, I_LB, in^4, per AISC Commentary equations C-I3-3 and C-I3-4.
+    All arguments may be arrays.
+
+    Parameters:
+        Is, As, d, Fy: steel moment of inertia (in^4), area (in^2), depth (in) and yield stress (ksi)
+        sum_Qn: total strength of steel anchors between the points of zero and maximum moment, kips. Limited to the full composite force.
+        fc: concrete compressive strength, ksi
+        beff: effective slab width, in
+        t_s: concrete thickness above the deck, in
+        deck_height: deck height, in
+    '''
+    Is, As, d, Fy, sum_Qn, fc, beff, t_s, deck_height = np.broadcast_arrays(
+        *[np.asarray(value, dtype=float) for value in (Is, As, d, Fy, sum_Qn, fc, beff, t_s, deck_height)])
+
+    C = np.minimum(np.minimum(sum_Qn, As * Fy), 0.85 * fc * beff * t_s)
+    a = C / (0.85 * fc * beff)
+    d_1 = t_s + deck_height - a / 2 # concrete force to top of steel
+    d_3 = d / 2 # steel tension force to top of steel
+    A_c = C / Fy # equivalent steel area of the concrete force
+
+    Y_ENA = (As * d_3 + A_c * (2 * d_3 + d_1)) / (As + A_c) # measured from bottom of steel
+    return Is + As * (Y_ENA - d_3)**2 + A_c * (2 * d_3 + d_1 - Y_ENA)**2
+
+def udl_shape(span, x):
+    '''
+    Returns the deflection of a simply supported span under a 1 klf uniform load, multiplied by EI, in kip*in^3.
+    Divide by EI (kip*in^2) for the deflection in inches.
+
+    Parameters:
+        span: span length, ft. May be an array with a trailing axis of length 1 to broadcast against x.
+        x: locations along the span, ft
+    '''
+    L = np.asarray(span, dtype=float) * 12
+    x = np.asarray(x, dtype=float) * 12
+    return (1 / 12) * x * (L**3 - 2 * L * x**2 + x**3) / 24
+
+def case_shapes(loads: list, span: float, x, self_weight: float = 0.0) -> dict:
+    '''
+    Returns the deflection of each load case along the span multiplied by EI, in kip*in^3, keyed by load case.
+    Beam self weight (klf) is added to the D and CD cases when present, as in CompositeSteelBeam.generate_factored_loads.
+
+    Parameters:
+        loads (list): UniformLoad and PointLoad objects.
+        span (float): span length, ft
+        x: locations along the span, ft
+        self_weight (float) Optional = 0.0: beam self weight, klf
+    '''
+    by_case = {}
+    for load in loads:
+        case = by_case.setdefault(load.load_case, {'point_x': [], 'point_P': [], 'dist_start': [], 'dist_end': [], 'dist_w': []})
+        if isinstance(load, PointLoad):
+            case['point_x'].append(load.location)
+            case['point_P'].append(load.magnitude)
+        else:
+            case['dist_start'].append(load.start_loc)
+            case['dist_end'].append(load.end_loc)
+            case['dist_w'].append(load.magnitude)
+
+    for case_name in ('D', 'CD'):
+        if case_name in by_case:
+            by_case[case_name]['dist_start'].append(0.0)
+            by_case[case_name]['dist_end'].append(span)
+            by_case[case_name]['dist_w'].append(self_weight)
+
+    return {case_name: SpanLoads(span, **arrays).deflection(x, EI=1.0) for case_name, arrays in by_case.items()}
+
+def combo_deflections(shapes: dict, EI, load_combos: dict) -> tuple:
+    '''
+    Returns the deflection of every load combination along the span as one matrix product of the compiled combo factors and the case deflections.
+
+    Parameters:
+        shapes (dict): deflection times EI of each load case, arrays of shape (..., n_points), e.g. from case_shapes.
+        EI: flexural stiffness, kip*in^2. A float, or an array of shape (...) for many beams.
+        load_combos (dict): load combinations, e.g. load_factors.ASCE_7_SERVICE_COMBOS.
+
+    Returns:
+        (list[str], np.ndarray): combination names, and deflections (in) of shape (number of combinations, ..., n_points).
+    '''
+    combo_matrix = load_factors.compile_combos(load_combos)
+    reference = np.asarray(next(iter(shapes.values())))
+    stack = np.stack([np.broadcast_to(shapes.get(case, 0.0), reference.shape) for case in combo_matrix.load_cases])
+    deflections = np.tensordot(combo_matrix.factors, stack, axes=1) / np.asarray(EI, dtype=float)[..., None]
+
+    return combo_matrix.names, deflections
+
+def _limit_check(names: list, deflections: np.ndarray, span, n) -> dict:
+    governing = deflections.max(axis=-1) # (combos, ...)
+    index = governing.argmax(axis=0)
+    max_deflection = np.take_along_axis(governing, np.expand_dims(index, 0), axis=0)[0]
+    limit = np.asarray(span, dtype=float) * 12 / n
+
+    return {
+        'combos': names,
+        'deflection': deflections,
+        'max': max_deflection,
+        'combo': np.array(names)[index],
+        'limit': limit,
+        'ratio': max_deflection / limit,
+        'passes': max_deflection <= limit,
+    }
+
+def check_deflections(shapes: dict, span, EI_steel, EI_comp, shored, limits: dict = None,
+                      pre_comp_combos: dict = load_factors.ASCE_7_PRE_COMP_SERVICE_LOADS,
+                      comp_combos: dict = load_factors.ASCE_7_SERVICE_COMBOS) -> dict:
+    '''
+    Checks deflections along the span for every service load combination against span / n limits. Every argument may be
+    broadcast across many beams: case shapes with shape (..., n_points) and span, stiffness and shored with shape (...).
+
+    Unshored beams carry the construction dead load (CD) on the steel section alone. The remainder of the dead load and
+    every other load case act on the composite section.
+
+    Parameters:
+        shapes (dict): deflection times EI of each load case, e.g. from case_shapes.
+        span: span length, ft
+        EI_steel: flexural stiffness of the steel section, kip*in^2
+        EI_comp: flexural stiffness of the composite section, typically E * I_LB, kip*in^2
+        shored: whether the beam is shored during construction
+        limits (dict) Optional: span / n limits keyed by check. Defaults to DEFAULT_LIMITS.
+        pre_comp_combos (dict) Optional: construction service combinations, acting on the steel section.
+        comp_combos (dict) Optional: service combinations, acting on the composite section.
+
+    Returns:
+        dict: {'construction': dict, 'live': dict, 'total': dict, 'passes': bool or array}. Each check dict has:
+            {
+            'combos': list of load combination (or live load case) names,
+            'deflection': deflections along the span, (combos, ..., n_points) array, in,
+            'max', 'combo': governing deflection (in) and combination name,
+            'limit': allowable deflection, in,
+            'ratio': max / limit,
+            'passes': bool,
+            }
+    '''
+    limits = {**DEFAULT_LIMITS, **(limits or {})}
+    EI_steel = np.asarray(EI_steel, dtype=float)
+    EI_comp = np.asarray(EI_comp, dtype=float)
+    unshored = np.where(np.asarray(shored, dtype=bool), 0.0, 1.0)[..., None]
+
+    # Shores carry the construction loads of shored beams.
+    names, deflections = combo_deflections(shapes, EI_steel, pre_comp_combos)
+    construction = _limit_check(names, deflections * unshored, span, limits['construction'])
+
+    # Composite stage: scale each case to the stiffness it acts on, then combine with a stiffness of 1.
+    comp_shapes = {case: shape / EI_comp[..., None] for case, shape in shapes.items()}
+    if 'CD' in shapes and 'D' in shapes:
+        comp_shapes['D'] = comp_shapes['D'] + unshored * shapes['CD'] * (1 / EI_steel[..., None] - 1 / EI_comp[..., None])
+    total = _limit_check(*combo_deflections(comp_shapes, 1.0, comp_combos), span, limits['total'])
+
+    live_cases = [case for case in LIVE_CASES if case in comp_shapes] or ['L']
+    reference = np.asarray(next(iter(comp_shapes.values())))
+    live_deflections = np.stack([np.broadcast_to(comp_shapes.get(case, 0.0), reference.shape) for case in live_cases])
+    live = _limit_check(live_cases, live_deflections, span, limits['live'])
+
+    return {
+        'construction': construction,
+        'live': live,
+        'total': total,
+        'passes': construction['passes'] & live['passes'] & total['passes'],
+    }
@@ -0,0 +1,101 @@
+import argparse
+import json
+import subprocess
+import sys
+
+# Dependencies that should only be imported on first use, not at startup.
+HEAVY_DEPENDENCIES = ('steelpy', 'PyNite', 'pandas', 'scipy', 'matplotlib', 'PIL')
+
+def import_times(module: str, python: str = sys.executable, cwd: str = None) -> list[dict]:
+    '''
+    Imports a module in a fresh interpreter with python -X importtime and returns the parsed timings.
+
+    Parameters:
+        module (str): dotted name of the module to import, e.g. 'modules.beam'.
+        python (str) Optional: interpreter to run. Defaults to the current interpreter.
+        cwd (str) Optional: working directory of the interpreter, so the module can be found. Defaults to the current directory.
+
+    Returns:
+        list[dict]: one dictionary per imported module, in import order:
+            {
+            'module': str, dotted module name,
+            'depth': int, nesting level of the import,
+            'self_us': int, time spent importing the module itself, microseconds,
+            'cumulative_us': int, time including the module's own imports, microseconds,
+            }
+    '''
+    completed = subprocess.run([python, '-X', 'importtime', '-c', f'import {module}'], capture_output=True, text=True, cwd=cwd)
+    if completed.returncode != 0:
+        raise ImportError(f'Importing {module} failed:\n{completed.stderr}')
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+        })
+
+    return rows
+
+def startup_report(module: str, top: int = 15, **kwargs) -> dict:
+    '''
+    Returns an import time summary of a module: total time, the slowest imports by cumulative time and any heavy dependencies that were imported.
+
+    Parameters:
+        module (str): dotted name of the module to import.
+        top (int) Optional = 15: number of slowest imports to report.
+        kwargs: passed to import_times.
+
+    Returns:
+        dict: {'module': str, 'total_ms': float, 'slowest': list[dict], 'heavy_dependencies': list[str]}
+    '''
+    rows = import_times(module, **kwargs)
+    imported = {row['module'] for row in rows}
+
+    return {
+        'module': module,
+        'total_ms': sum(row['self_us'] for row in rows) / 1000,
+        'slowest': sorted(rows, key=lambda row: row['cumulative_us'], reverse=True)[:top],
+        'heavy_dependencies': [name for name in HEAVY_DEPENDENCIES if name in imported],
+    }
+
+def format_report(report: dict) -> str:
+    '''
+    Formats a startup_report as a text table.
+    '''
+    lines = [
+        f"{report['module']}: {report['total_ms']:.1f} ms",
+        f"  heavy dependencies imported: {', '.join(report['heavy_dependencies']) or 'none'}",
+        f"  {'cumulative ms':>13}  {'self ms':>8}  module",
+    ]
+    for row in report['slowest']:
+        lines.append(f"  {row['cumulative_us'] / 1000:>13.1f}  {row['self_us'] / 1000:>8.1f}  {'  ' * row['depth']}{row['module']}")
+
+    return '\n'.join(lines)
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description='Report import time of application modules, like python -X importtime.')
+    parser.add_argument('modules', nargs='*', default=['app_logic', 'modules.beam'], help='modules to import. Defaults to app_logic and modules.beam.')
+    parser.add_argument('--top', type=int, default=15, help='number of slowest imports to list.')
+    parser.add_argument('--json', action='store_true', help='print the reports as JSON.')
+    parser.add_argument('--fail-on-heavy', action='store_true', help='exit with status 1 if any module imports a heavy dependency at startup.')
+    args = parser.parse_args(argv)
+
+    reports = [startup_report(module, top=args.top) for module in args.modules]
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print('\n\n'.join(format_report(report) for report in reports))
+
+    if args.fail_on_heavy and any(report['heavy_dependencies'] for report in reports):
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    # Usage: python -m modules.startup [module ...] [--top N] [--json] [--fail-on-heavy]
+    sys.exit(main())
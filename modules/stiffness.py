@@ -0,0 +1,211 @@
+import numpy as np
+import modules.instrument as instrument
+from modules.cache import LRUCache
+
+SUPPORT_TYPES = ('pin', 'fixed')
+
+# Factorized models keyed by (span, EI, supports, n_elements). Reused by every analysis of a beam with the same geometry.
+model_cache = LRUCache(maxsize=64)
+
+def _element_stiffness(EI: float, h: float) -> np.ndarray:
+    # Euler-Bernoulli beam element with (deflection, rotation) at each end.
+    return EI / h**3 * np.array([
+        [12, 6 * h, -12, 6 * h],
+        [6 * h, 4 * h**2, -6 * h, 2 * h**2],
+        [-12, -6 * h, 12, -6 * h],
+        [6 * h, 2 * h**2, -6 * h, 4 * h**2],
+    ])
+
+def _shape_functions(xi: np.ndarray, h: float) -> np.ndarray:
+    # Hermite shape functions at local coordinates xi in [0, 1], shape (4, ...).
+    return np.array([
+        1 - 3 * xi**2 + 2 * xi**3,
+        h * (xi - 2 * xi**2 + xi**3),
+        3 * xi**2 - 2 * xi**3,
+        h * (-xi**2 + xi**3),
+    ])
+
+def _shape_integrals(xi: np.ndarray, h: float) -> np.ndarray:
+    # Integrals of the Hermite shape functions from 0 to xi, divided by h, shape (4, ...).
+    return np.array([
+        xi - xi**3 + xi**4 / 2,
+        h * (xi**2 / 2 - 2 * xi**3 / 3 + xi**4 / 4),
+        xi**3 - xi**4 / 2,
+        h * (-xi**3 / 3 + xi**4 / 4),
+    ])
+
+class StiffnessModel:
+    '''
+    Single span beam finite element model whose stiffness matrix is assembled and Cholesky factorized once.
+    Any number of load sets are then solved together as extra right-hand sides of the factorized system,
+    costing one banded back-substitution instead of a model rebuild.
+
+    Loads are applied as consistent nodal loads, so nodal deflections and rotations are exact for any mesh.
+    Degrees of freedom are ordered (deflection, rotation) per node, deflection positive downward, in inches and radians.
+
+    Parameters:
+        span (float): span length, ft
+        EI (float): flexural stiffness, kip*in^2
+        supports (tuple) Optional = ('pin', 'pin'): left and right support types, each one of SUPPORT_TYPES.
+        n_elements (int) Optional = 40: number of equal length elements.
+    '''
+    def __init__(self, span: float, EI: float, supports: tuple = ('pin', 'pin'), n_elements: int = 40):
+        from scipy.linalg import cholesky_banded
+
+        for support in supports:
+            if support not in SUPPORT_TYPES:
+                raise ValueError(f'Unknown support type {support!r}. Choose one of {list(SUPPORT_TYPES)}.')
+
+        self.span = span
+        self.EI = EI
+        self.supports = tuple(supports)
+        self.n_elements = n_elements
+        self.nodes = np.linspace(0, span, n_elements + 1) # ft
+        self.h = span * 12 / n_elements # element length, in
+        n_dof = 2 * (n_elements + 1)
+
+        with instrument.span('stiffness.assemble'):
+            K = np.zeros((n_dof, n_dof))
+            k = _element_stiffness(EI, self.h)
+            for e in range(n_elements):
+                K[2 * e:2 * e + 4, 2 * e:2 * e + 4] += k
+            self.K = K
+
+        restrained = [0, n_dof - 2]
+        if self.supports[0] == 'fixed':
+            restrained.append(1)
+        if self.supports[1] == 'fixed':
+            restrained.append(n_dof - 1)
+        self.restrained = np.array(sorted(restrained))
+        self.free = np.setdiff1d(np.arange(n_dof), self.restrained)
+
+        # Upper banded storage of the free stiffness. Removing rows and columns keeps the bandwidth at 3.
+        with instrument.span('stiffness.factorize'):
+            K_ff = K[np.ix_(self.free, self.free)]
+            bandwidth = 3
+            banded = np.zeros((bandwidth + 1, len(self.free)))
+            for offset in range(bandwidth + 1):
+                banded[bandwidth - offset, offset:] = np.diagonal(K_ff, offset)
+            self._factor = cholesky_banded(banded)
+
+    @property
+    def n_dof(self) -> int:
+        return len(self.K)
+
+    def load_vectors(self, loads: list) -> np.ndarray:
+        '''
+        Returns the consistent nodal load vectors of a list of load sets.
+
+        Parameters:
+            loads (list[SpanLoads]): load sets on the span, gravity loads positive.
+
+        Returns:
+            np.ndarray: nodal loads, kips and kip-in, of shape (n_dof, len(loads)).
+        '''
+        n = self.n_elements
+        m = len(loads)
+        h = self.h
+        starts = self.nodes[:-1] * 12
+
+        # Every load of every set is flattened with the index of its set, so all sets are loaded in one pass.
+        def flatten(name):
+            return np.concatenate([getattr(span_loads, name) for span_loads in loads]) if loads else np.zeros(0)
+        def set_index(name):
+            return np.repeat(np.arange(m), [getattr(span_loads, name).size for span_loads in loads])
+
+        element = np.zeros((4, m, n))
+
+        # Distributed loads: integrate the shape functions over the loaded part of each element.
+        dist_w = flatten('dist_w')
+        if dist_w.size:
+            xi_1 = np.clip((flatten('dist_start')[:, None] * 12 - starts) / h, 0, 1)
+            xi_2 = np.clip((flatten('dist_end')[:, None] * 12 - starts) / h, 0, 1)
+            contribution = dist_w[:, None] / 12 * h * (_shape_integrals(xi_2, h) - _shape_integrals(xi_1, h)) # (4, loads, n)
+            np.add.at(element, (slice(None), set_index('dist_w')), contribution)
+
+        # Point loads: shape functions of the element containing each load.
+        point_P = flatten('point_P')
+        if point_P.size:
+            x = np.clip(flatten('point_x') * 12, 0, self.span * 12)
+            index = np.clip(np.searchsorted(starts, x, side='right') - 1, 0, n - 1)
+            N = _shape_functions((x - starts[index]) / h, h) * point_P
+            bins = set_index('point_P') * n + index
+            for row in range(4):
+                element[row] += np.bincount(bins, weights=N[row], minlength=m * n).reshape(m, n)
+
+        F = np.zeros((self.n_dof, m))
+        F[0:-2:2] += element[0].T
+        F[1:-2:2] += element[1].T
+        F[2::2] += element[2].T
+        F[3::2] += element[3].T
+
+        return F
+
+    def solve(self, F: np.ndarray) -> np.ndarray:
+        '''
+        Solves the factorized system for one or more load vectors.
+
+        Parameters:
+            F (np.ndarray): nodal loads of shape (n_dof,) or (n_dof, number of load sets).
+
+        Returns:
+            np.ndarray: nodal displacements with the shape of F. Restrained degrees of freedom are zero.
+        '''
+        from scipy.linalg import cho_solve_banded
+
+        with instrument.span('stiffness.solve'):
+            U = np.zeros_like(F, dtype=float)
+            U[self.free] = cho_solve_banded((self._factor, False), F[self.free])
+
+        return U
+
+    def end_forces(self, U: np.ndarray, F: np.ndarray) -> np.ndarray:
+        '''
+        Returns the support reactions and internal end moments recovered from the solved displacements.
+
+        Parameters:
+            U (np.ndarray): nodal displacements from solve, shape (n_dof, m).
+            F (np.ndarray): nodal loads that produced U, shape (n_dof, m).
+
+        Returns:
+            np.ndarray: shape (4, m) rows of left reaction (kips, upward), right reaction (kips, upward),
+                left end moment and right end moment (kip-ft, sagging positive, zero at pinned supports).
+        '''
+        residual = np.zeros_like(F, dtype=float)
+        residual[self.restrained] = self.K[self.restrained] @ U - F[self.restrained]
+
+        # A restraining moment acting with the rotation is sagging at the left end and hogging at the right end.
+        return np.array([
+            -residual[0],
+            -residual[-2],
+            residual[1] / 12,
+            -residual[-1] / 12,
+        ])
+
+    def deflections(self, U: np.ndarray, x) -> np.ndarray:
+        '''
+        Returns deflections at x, ft, in inches, interpolated from the nodal displacements with the element shape functions.
+
+        Parameters:
+            U (np.ndarray): nodal displacements from solve, shape (n_dof,) or (n_dof, m).
+            x: locations along the span, ft
+
+        Returns:
+            np.ndarray: shape (len(x),) or (m, len(x)).
+        '''
+        x = np.clip(np.asarray(x, dtype=float) * 12, 0, self.span * 12)
+        starts = self.nodes[:-1] * 12
+        index = np.clip(np.searchsorted(starts, x, side='right') - 1, 0, self.n_elements - 1)
+        N = _shape_functions((x - starts[index]) / self.h, self.h)
+
+        dofs = 2 * index + np.arange(4)[:, None] # (4, len(x))
+        if U.ndim == 1:
+            return np.einsum('ij,ij->j', N, U[dofs])
+        return np.einsum('ij,ijm->mj', N, U[dofs])
+
+def get_model(span: float, EI: float, supports: tuple = ('pin', 'pin'), n_elements: int = 40) -> StiffnessModel:
+    '''
+    Returns the factorized StiffnessModel of a geometry from model_cache, assembling it on a miss.
+    '''
+    key = (float(span), float(EI), tuple(supports), n_elements)
+    return model_cache.get_or_compute(key, lambda: StiffnessModel(span, EI, supports, n_elements))
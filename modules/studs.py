@@ -0,0 +1,113 @@
+import numpy as np
+import modules.composite as composite
+
+def stud_reduction_factors(deck_orientation: float, studs_per_rib: int = 1, weak_position: bool = True) -> tuple:
+    '''
+    Returns the group effect factor, Rg, and position effect factor, Rp, of headed stud anchors in formed steel deck per AISC 360 Section I8.2a.
+    Deck oriented parallel to the beam assumes wr/hr >= 1.5.
+
+    Parameters:
+        deck_orientation (float): deck orientation relative to the beam, 0 (parallel) or 90 (perpendicular) degrees.
+        studs_per_rib (int) Optional = 1: number of studs welded in each deck rib.
+        weak_position (bool) Optional = True: whether studs perpendicular to the deck are in the weak position.
+
+    Returns:
+        (float, float): Rg, Rp
+    '''
+    if deck_orientation == 90:
+        Rg = {1: 1.0, 2: 0.85}.get(studs_per_rib, 0.7)
+        Rp = 0.6 if weak_position else 0.75
+    else:
+        Rg = 1.0
+        Rp = 0.75
+
+    return Rg, Rp
+
+def stud_strength(dia, fu, fc, Ec, Rg: float = 1.0, Rp: float = 0.75):
+    '''
+    Returns the nominal shear strength, Qn, of one headed stud anchor in kips per AISC 360 equation I8-1. Arguments may be arrays.
+
+    Parameters:
+        dia: stud diameter, in
+        fu: specified minimum tensile strength of the stud, ksi
+        fc: concrete compressive strength, ksi
+        Ec: concrete modulus of elasticity, ksi
+        Rg (float) Optional = 1.0: group effect factor
+        Rp (float) Optional = 0.75: position effect factor
+    '''
+    Asa = np.pi * np.asarray(dia, dtype=float)**2 / 4
+    return np.minimum(0.5 * Asa * np.sqrt(fc * Ec), Rg * Rp * Asa * fu)
+
+def bisect_min_count(strength, demand, low, high) -> tuple:
+    '''
+    Finds the smallest integer count in [low, high] whose strength meets the demand, for many problems at once.
+    strength must be non-decreasing in count, so each problem is solved by bisection in about log2(high - low) strength evaluations, all vectorized.
+
+    Parameters:
+        strength (callable): function taking an array of counts and returning an array of strengths, one per problem.
+        demand: required strength of each problem.
+        low: smallest allowed count of each problem.
+        high: largest allowed count of each problem.
+
+    Returns:
+        (np.ndarray, np.ndarray): counts, and whether each count is adequate. Problems that are not adequate even at high return high.
+    '''
+    demand = np.asarray(demand, dtype=float)
+    low, high = np.broadcast_arrays(np.asarray(low, dtype=int), np.asarray(high, dtype=int))
+    low = np.minimum(low, high)
+    high = high.copy()
+
+    adequate = strength(high) >= demand
+    low = np.where(adequate, low, high)
+
+    while np.any(low < high):
+        mid = (low + high) // 2
+        ok = strength(mid) >= demand
+        high = np.where(ok, mid, high)
+        low = np.where(ok, low, mid + 1)
+
+    return high, adequate
+
+def min_studs(Mu, Qn, C_full, min_comp, max_comp, As, Fy, d, bf, tf, tw, fc, beff, t_s, deck_height) -> dict:
+    '''
+    Finds the minimum number of studs per half span, between the points of zero and maximum moment, for the composite
+    moment strength to meet the factored moment demand. Every argument may be an array to solve many beams in one call.
+    Section and slab arguments are as for composite.partial_comp_strength.
+
+    Parameters:
+        Mu: factored moment demand, kip-ft
+        Qn: strength of one stud, kips
+        C_full: full composite compression force, kips
+        min_comp: minimum degree of composite action, e.g. 0.25
+        max_comp: maximum degree of composite action, e.g. 1.0
+
+    Returns:
+        dict: dictionary of NumPy arrays:
+            {
+            'studs_per_half_span': number of studs between the points of zero and maximum moment,
+            'total_studs': studs on the full span, twice studs_per_half_span,
+            'sum_Qn': total stud strength per half span, kips
+            'percent_comp': degree of composite action provided,
+            'phi_Mn': composite moment strength, kip-ft
+            'adequate': bool, False where even max_comp does not meet the demand,
+            }
+    '''
+    Qn = np.asarray(Qn, dtype=float)
+    C_full = np.asarray(C_full, dtype=float)
+
+    def strength(count):
+        return composite.partial_comp_strength(count * Qn, As, Fy, d, bf, tf, tw, fc, beff, t_s, deck_height)['phi_Mn']
+
+    low = np.ceil(min_comp * C_full / Qn - 1e-9)
+    high = np.ceil(max_comp * C_full / Qn - 1e-9)
+    count, adequate = bisect_min_count(strength, Mu, low, high)
+
+    sum_Qn = count * Qn
+    return {
+        'studs_per_half_span': count,
+        'total_studs': 2 * count,
+        'sum_Qn': sum_Qn,
+        'percent_comp': np.minimum(sum_Qn / C_full, 1.0),
+        'phi_Mn': strength(count),
+        'adequate': adequate,
+    }
@@ -0,0 +1,177 @@
+from dataclasses import dataclass, field
+from math import comb
+import numpy as np
+
+def _ramp_sum(x, a: np.ndarray, weights: np.ndarray, power: int, inclusive: bool = True) -> np.ndarray:
+    # Sum of weights * <x - a>^power over every load, for each x. The binomial expansion of (x - a)^power turns the sum
+    # into prefix sums of weights * a^k over the loads sorted by a, so cost grows as (len(x) + len(a)) log len(a).
+    x = np.asarray(x, dtype=float)
+    order = np.argsort(a)
+    a = a[order]
+    weights = weights[order]
+    count = np.searchsorted(a, x, side='right' if inclusive else 'left') # loads with a <= x (or a < x)
+
+    total = np.zeros_like(x)
+    for k in range(power + 1):
+        prefix = np.concatenate([[0.0], np.cumsum(weights * a**k)])
+        total = total + comb(power, k) * (-1)**k * x**(power - k) * prefix[count]
+
+    return total
+
+@dataclass
+class SpanLoads:
+    '''
+    Loads on a simply supported span as flat arrays, so diagrams for any number of loads are evaluated in one vectorized pass.
+    Gravity loads are positive.
+
+    Parameters:
+        span (float): span length, ft
+        point_x (np.ndarray) Optional: point load locations, ft
+        point_P (np.ndarray) Optional: point load magnitudes, kips
+        dist_start (np.ndarray) Optional: distributed load start locations, ft
+        dist_end (np.ndarray) Optional: distributed load end locations, ft
+        dist_w (np.ndarray) Optional: distributed load intensities, klf
+    '''
+    span: float
+    point_x: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    point_P: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    dist_start: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    dist_end: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    dist_w: np.ndarray = field(default_factory=lambda: np.zeros(0))
+
+    def __post_init__(self):
+        for name in ('point_x', 'point_P', 'dist_start', 'dist_end', 'dist_w'):
+            setattr(self, name, np.atleast_1d(np.asarray(getattr(self, name), dtype=float)))
+        # Distributed loads are clipped to the span.
+        self.dist_start = np.clip(self.dist_start, 0, self.span)
+        self.dist_end = np.clip(self.dist_end, 0, self.span)
+
+    @classmethod
+    def from_factored_loads(cls, span: float, factored_loads: dict) -> 'SpanLoads':
+        '''
+        Returns the loads of a factored load dict from CompositeSteelBeam.generate_factored_loads.
+        '''
+        points = np.array(factored_loads.get('point_loads') or np.zeros((0, 2)), dtype=float).reshape(-1, 2)
+        partial = np.array(factored_loads.get('partial_loads') or np.zeros((0, 3)), dtype=float).reshape(-1, 3)
+
+        return cls(
+            span=span,
+            point_x=points[:, 0],
+            point_P=points[:, 1],
+            dist_start=np.concatenate([[0.0], partial[:, 0]]),
+            dist_end=np.concatenate([[span], partial[:, 1]]),
+            dist_w=np.concatenate([[factored_loads['UDL']], partial[:, 2]]),
+        )
+
+    def reactions(self) -> tuple:
+        '''
+        Returns the (left, right) support reactions, kips.
+        '''
+        L = self.span
+        W = self.dist_w * (self.dist_end - self.dist_start)
+        x_W = (self.dist_start + self.dist_end) / 2
+        right = (self.point_P @ self.point_x + W @ x_W) / L
+        left = self.point_P.sum() + W.sum() - right
+
+        return float(left), float(right)
+
+    def shear(self, x, right: bool = True) -> np.ndarray:
+        '''
+        Returns the shear at x, ft, in kips. right selects the value just right of a point load at x rather than just left of it.
+        '''
+        x = np.asarray(x, dtype=float)
+        passed = _ramp_sum(x, self.point_x, self.point_P, 0, inclusive=right)
+        loaded = _ramp_sum(x, self.dist_start, self.dist_w, 1) - _ramp_sum(x, self.dist_end, self.dist_w, 1)
+
+        return self.reactions()[0] - passed - loaded
+
+    def moment(self, x) -> np.ndarray:
+        '''
+        Returns the bending moment at x, ft, in kip-ft.
+        '''
+        x = np.asarray(x, dtype=float)
+        point = _ramp_sum(x, self.point_x, self.point_P, 1)
+        dist = (_ramp_sum(x, self.dist_start, self.dist_w, 2) - _ramp_sum(x, self.dist_end, self.dist_w, 2)) / 2
+
+        return self.reactions()[0] * x - point - dist
+
+    def _F(self, x) -> np.ndarray:
+        # Double integral of the moment from 0 to x, kip*ft^3. EI * deflection = x F(L) / L - F(x).
+        x = np.asarray(x, dtype=float)
+        point = _ramp_sum(x, self.point_x, self.point_P, 3) / 6
+        dist = (_ramp_sum(x, self.dist_start, self.dist_w, 4) - _ramp_sum(x, self.dist_end, self.dist_w, 4)) / 24
+
+        return self.reactions()[0] * x**3 / 6 - point - dist
+
+    def _F_prime(self, x) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        point = _ramp_sum(x, self.point_x, self.point_P, 2) / 2
+        dist = (_ramp_sum(x, self.dist_start, self.dist_w, 3) - _ramp_sum(x, self.dist_end, self.dist_w, 3)) / 6
+
+        return self.reactions()[0] * x**2 / 2 - point - dist
+
+    def deflection(self, x, EI: float) -> np.ndarray:
+        '''
+        Returns the deflection at x, ft, in inches, positive downward.
+
+        Parameters:
+            x: locations along the span, ft
+            EI (float): flexural stiffness, kip*in^2
+        '''
+        x = np.asarray(x, dtype=float)
+        return (x * self._F(self.span) / self.span - self._F(x)) * 12**3 / EI
+
+    def critical_x(self, shear_offset: float = 0.0) -> np.ndarray:
+        '''
+        Returns the locations where the moment can be extreme: the supports, load discontinuities and every point of zero shear.
+        Shear is linear between discontinuities, so zero shear points are exact.
+
+        Parameters:
+            shear_offset (float) Optional = 0.0: constant shear added to the simple span shear, kips, e.g. from support end moments.
+        '''
+        breaks = np.unique(np.concatenate([[0.0, self.span], np.clip(self.point_x, 0, self.span), self.dist_start, self.dist_end]))
+        start, end = breaks[:-1], breaks[1:]
+        V_start = self.shear(start, right=True) + shear_offset
+        V_end = self.shear(end, right=False) + shear_offset
+
+        crosses = (V_start > 0) & (V_end < 0) | (V_start < 0) & (V_end > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_zero = start + V_start / (V_start - V_end) * (end - start)
+
+        return np.concatenate([breaks, x_zero[crosses]])
+
+    def extreme_shears(self, shear_offset: float = 0.0) -> np.ndarray:
+        '''
+        Returns the shear on either side of every discontinuity, which includes the largest and smallest shear.
+        shear_offset is added to every shear, as in critical_x.
+        '''
+        x = self.critical_x(shear_offset)
+        return np.concatenate([self.shear(x[x < self.span], right=True), self.shear(x[x > 0], right=False)]) + shear_offset
+
+    def extreme_deflections(self, EI: float, n_points: int = 101) -> np.ndarray:
+        '''
+        Returns the largest and smallest deflection, in inches, from a grid search refined by Newton iterations on the slope.
+        '''
+        x = np.linspace(0, self.span, n_points)
+        deflection = self.deflection(x, EI)
+        extremes = x[[deflection.argmax(), deflection.argmin()]]
+
+        for _ in range(4):
+            slope = self._F(self.span) / self.span - self._F_prime(extremes)
+            curvature = -self.moment(extremes)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                step = np.where(curvature != 0, slope / curvature, 0.0)
+            extremes = np.clip(extremes - step, 0, self.span)
+
+        values = self.deflection(np.concatenate([extremes, x]), EI)
+        return np.array([values.max(), values.min()])
+
+    def diagrams(self, EI: float, n_points: int = 20) -> dict:
+        '''
+        Returns shear, moment and deflection on a shared grid of n_points locations in one pass.
+
+        Returns:
+            dict: {'x': ft, 'shear': kips, 'moment': kip-ft, 'deflection': in}, arrays of length n_points.
+        '''
+        x = np.linspace(0, self.span, n_points)
+        return {'x': x, 'shear': self.shear(x), 'moment': self.moment(x), 'deflection': self.deflection(x, EI)}
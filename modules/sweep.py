@@ -0,0 +1,187 @@
+import numpy as np
+from modules.beam import CompositeSteelBeam
+from modules.load import UniformLoad
+import modules.load_factors as load_factors
+from modules.catalog import SectionCatalog, load_catalog
+
+# Section properties read by CompositeSteelBeam from its shape.
+SECTION_PROPERTIES = ('d', 'bf', 'tf', 'tw', 'T', 'area', 'weight', 'Ix', 'Iy', 'Zx', 'Sx', 'J')
+
+_section_arrays = {}
+
+def section_arrays(profile=None) -> dict:
+    '''
+    Returns the properties of every section in a profile as NumPy arrays. Arrays are built once per profile and reused.
+
+    Parameters:
+        profile (SectionCatalog or Profile) Optional: compiled SectionCatalog or SteelPy Profile object to read sections from. Defaults to the compiled W_shapes catalog.
+
+    Returns:
+        dict: dictionary with a 'name' array of section names and one float array per property in SECTION_PROPERTIES.
+    '''
+    if profile is None:
+        profile = load_catalog('W_shapes')
+
+    cached = _section_arrays.get(id(profile))
+    if cached is not None and cached[0] is profile:
+        return cached[1]
+
+    if isinstance(profile, SectionCatalog):
+        arrays = {'name': np.array(profile.names)}
+        for prop in SECTION_PROPERTIES:
+            arrays[prop] = profile.column(prop)
+    else:
+        sections = list(profile.sections.values())
+        arrays = {'name': np.array([section.name for section in sections])}
+        for prop in SECTION_PROPERTIES:
+            arrays[prop] = np.array([getattr(section, prop) for section in sections], dtype=float)
+
+    _section_arrays[id(profile)] = (profile, arrays) # keep profile referenced so its id is not reused.
+    return arrays
+
+def factored_udl(beam: CompositeSteelBeam, load_combos: dict, self_weight: np.ndarray) -> np.ndarray:
+    '''
+    Returns the governing factored UDL (klf) of the beam loads for each section self weight provided.
+
+    Parameters:
+        beam (CompositeSteelBeam): beam whose loads are factored. Only full length uniform loads are supported.
+        load_combos (dict): dictionary of load combinations. Refer to load_factors.py.
+        self_weight (np.ndarray): self weight of each section, klf. Added to the D and CD load cases.
+
+    Returns:
+        np.ndarray: maximum factored UDL over all combinations, one value per section.
+    '''
+    load_dict = {}
+    for load in beam.loads:
+        if not isinstance(load, UniformLoad) or load.start_loc > 0 or load.end_loc < beam.span:
+            raise NotImplementedError('Section sweeps only support full length uniform loads.')
+        load_dict[load.load_case] = load_dict.get(load.load_case, 0.0) + load.magnitude
+
+    return governing_udl(load_dict, load_combos, self_weight)
+
+def governing_udl(load_dict: dict, load_combos: dict, self_weight: np.ndarray) -> np.ndarray:
+    '''
+    Returns the governing factored UDL (klf) of full length uniform loads for each section self weight provided.
+
+    Parameters:
+        load_dict (dict): uniform load of each load case, klf. Values may be arrays with one value per section.
+        load_combos (dict): dictionary of load combinations. Refer to load_factors.py.
+        self_weight (np.ndarray): self weight of each section, klf. Added to the D and CD load cases.
+    '''
+    load_dict = dict(load_dict)
+    for case in ('D', 'CD'): # add beam self weight to DL case.
+        if case in load_dict:
+            load_dict[case] = load_dict[case] + self_weight
+
+    load_dict = {case: np.broadcast_to(value, self_weight.shape) for case, value in load_dict.items()}
+
+    return load_factors.governing_factored_load(load_dict, load_combos)[0]
+
+def full_comp_strength(beam: CompositeSteelBeam, sections: dict, beff) -> np.ndarray:
+    '''
+    Returns the full composite moment strength, phi Mn (kip-ft), of each section, as CompositeSteelBeam.calc_full_comp_moment_capacity.
+
+    Parameters:
+        beam (CompositeSteelBeam): beam providing the deck and materials.
+        sections (dict): section property arrays from section_arrays.
+        beff: effective width, in. May be an array with one value per section.
+    '''
+    t_s = beam.deck['t_s']
+    C = np.minimum(sections['area'] * beam.steel_material.fy, 0.85 * beam.concrete_material.fc * beff * t_s)
+    a = beam.calc_stress_block_depth(C, b=beff)
+    y = (sections['d'] / 2) + (t_s + beam.deck['deck_height']) - (a / 2)
+    return 0.9 * C * y / 12
+
+def sweep_sections(beam: CompositeSteelBeam, profile=None) -> dict:
+    '''
+    Evaluates the design inputs of the provided beam against every section of a profile at once. The shape assigned to the beam is ignored; span, layout, deck, materials and loads are used for every section.
+    Strength checks mirror CompositeSteelBeam.calc_pre_comp_strength and CompositeSteelBeam.calc_full_comp_moment_capacity. Demands are simple span moments, wL^2/8, of the governing factored UDL including each section's self weight.
+
+    Parameters:
+        beam (CompositeSteelBeam): beam providing the design inputs.
+        profile (SectionCatalog or Profile) Optional: section catalog or SteelPy Profile object to sweep. Defaults to the compiled W_shapes catalog.
+
+    Returns:
+        dict: dictionary of NumPy arrays, one entry per section:
+            {
+            'name': section names,
+            'weight': section weight, plf
+            'flange_is_compact': bool,
+            'flange_is_slender': bool,
+            'web_is_compact': bool,
+            'pre_comp_phi_Mn': pre-composite moment strength, kip-ft
+            'full_comp_phi_Mn': full composite moment strength, kip-ft
+            'pre_comp_Mu': pre-composite moment demand, kip-ft
+            'comp_Mu': composite moment demand, kip-ft
+            'pre_comp_ratio': pre-composite demand / capacity ratio
+            'comp_ratio': composite demand / capacity ratio
+            'passes': bool, True if both ratios are less than or equal to 1.0
+            }
+    '''
+    if beam.deck['orientation'] != 90:
+        #TODO: add logic for deck oriented parallel to beam once CompositeSteelBeam supports it.
+        raise NotImplementedError('Only deck oriented perpendicular to the beam (90 deg) is supported.')
+
+    sections = section_arrays(profile)
+    d, bf, tf, tw, T = sections['d'], sections['bf'], sections['tf'], sections['tw'], sections['T']
+    Sx, Zx = sections['Sx'], sections['Zx']
+
+    phi = 0.9
+    E = beam.steel_material.E
+    Fy = beam.steel_material.fy
+    sqrt_E_Fy = np.sqrt(E / Fy)
+
+    # Section classification, AISC Table B4.1b
+    λ = bf / (2 * tf)
+    flange_is_compact = λ <= 0.38 * sqrt_E_Fy
+    flange_is_slender = λ > 1.0 * sqrt_E_Fy
+    web_is_compact = T / tw <= 3.76 * sqrt_E_Fy
+
+    # Pre-composite strength, AISC Chapter F sections 2.1 and 3.2. Top flange is continuously braced by the deck.
+    M_p = Fy * Zx
+    yielding = phi * M_p / 12
+
+    λ_pf = 0.38 * sqrt_E_Fy
+    λ_rf = 1.0 * sqrt_E_Fy
+    non_compact_flb = phi * (M_p - (M_p - 0.7 * Fy * Sx) * ((λ - λ_pf) / (λ_rf - λ_pf))) / 12
+
+    k_c = np.clip(4 / np.sqrt((d - 2 * tf) / tw), 0.35, 0.76)
+    slender_flb = phi * ((0.9 * E * k_c * Sx) / (λ**2)) / 12
+
+    pre_comp_phi_Mn = np.where(flange_is_compact, yielding, np.where(flange_is_slender, slender_flb, non_compact_flb))
+
+    # Full composite strength
+    full_comp_phi_Mn = full_comp_strength(beam, sections, beam.calc_effective_width() * 12)
+
+    # Demands
+    self_weight = sections['weight'] / 1000
+    pre_comp_Mu = factored_udl(beam, load_factors.ASCE_7_PRE_COMP_FACTORED_LOADS, self_weight) * beam.span**2 / 8
+    comp_Mu = factored_udl(beam, load_factors.ASCE_7_LRFD_COMBOS, self_weight) * beam.span**2 / 8
+
+    pre_comp_ratio = pre_comp_Mu / pre_comp_phi_Mn
+    comp_ratio = comp_Mu / full_comp_phi_Mn
+
+    return {
+        'name': sections['name'],
+        'weight': sections['weight'],
+        'flange_is_compact': flange_is_compact,
+        'flange_is_slender': flange_is_slender,
+        'web_is_compact': web_is_compact,
+        'pre_comp_phi_Mn': pre_comp_phi_Mn,
+        'full_comp_phi_Mn': full_comp_phi_Mn,
+        'pre_comp_Mu': pre_comp_Mu,
+        'comp_Mu': comp_Mu,
+        'pre_comp_ratio': pre_comp_ratio,
+        'comp_ratio': comp_ratio,
+        'passes': (pre_comp_ratio <= 1.0) & (comp_ratio <= 1.0),
+    }
+
+def lightest_passing_section(results: dict) -> str:
+    '''
+    Returns the name of the lightest section that passes all checks in the results of sweep_sections, or None if no section passes.
+    '''
+    passing = np.flatnonzero(results['passes'])
+    if passing.size == 0:
+        return None
+
+    return str(results['name'][passing[np.argmin(results['weight'][passing])]])
@@ -1,4 +1,5 @@
 import load_factors
+import numpy as np
 
 def test_factor_load():
     test1 = load_factors.factor_load(20, 1.4)
@@ -51,4 +52,85 @@ def test_min_factored_load():
     assert load_factors.min_factored_load(load5, load_factors.ASCE_7_PRE_COMP_FACTORED_LOADS) == 24.0
     assert load_factors.min_factored_load(load6, load_factors.ASCE_7_PRE_COMP_FACTORED_LOADS) == 28.0
     assert load_factors.min_factored_load(load5, load_factors.ASCE_7_PRE_COMP_SERVICE_LOADS) == 20.0
-    assert load_factors.min_factored_load(load6, load_factors.ASCE_7_PRE_COMP_SERVICE_LOADS) == 20.0
\ No newline at end of file
+    assert load_factors.min_factored_load(load6, load_factors.ASCE_7_PRE_COMP_SERVICE_LOADS) == 20.0
+
+def test_compile_combos():
+    combo_matrix = load_factors.compile_combos(load_factors.ASCE_7_PRE_COMP_FACTORED_LOADS)
+
+    assert combo_matrix.names == ['LC1', 'LC2']
+    assert combo_matrix.load_cases == ['CD', 'CL']
+    assert combo_matrix.factors.tolist() == [[1.4, 0.0], [1.2, 1.6]]
+    assert load_factors.compile_combos(load_factors.ASCE_7_PRE_COMP_FACTORED_LOADS) is combo_matrix # compiled once
+
+def test_governing_factored_load():
+    load2 = {'D_load': 20, 'L_load': 40, 'LLR_load': 20}
+
+    assert load_factors.governing_factored_load(load2, load_factors.ASCE_7_LRFD_COMBOS) == (98, 'LC2a')
+    assert load_factors.governing_factored_load({'D': 20, 'L': 40, 'LLR': 20}, load_factors.ASCE_7_LRFD_COMBOS) == (98, 'LC2a')
+    assert load_factors.governing_factored_load(load2, load_factors.ASCE_7_LRFD_COMBOS, governing='min') == (18, 'LC5')
+
+def test_governing_factored_load_many_beams():
+    loads = {'D_load': [20, 20, 20], 'L_load': [0, 40, 40], 'LLR_load': [0, 20, 0]}
+    values, names = load_factors.governing_factored_load(loads, load_factors.ASCE_7_LRFD_COMBOS)
+
+    assert values.tolist() == [28, 98, 88]
+    assert names.tolist() == ['LC1', 'LC2a', 'LC2a']
+
+def test_prune_combos():
+    pruning = load_factors.prune_combos(load_factors.ASCE_7_LRFD_COMBOS, {'D': 'positive', 'L': 'positive'})
+
+    assert list(pruning.load_combos) == ['LC1', 'LC2a']
+    assert pruning.pruned['LC5'] == 'LC1' # 0.9 D with no wind
+    assert pruning.pruned['LC2b'] == 'LC2a' # same factors on D and L, first one kept
+    assert pruning.pruned['LC3a'] == 'LC2a'
+    assert load_factors.prune_combos(load_factors.ASCE_7_LRFD_COMBOS, {'D': 'positive', 'L': 'positive'}) is pruning # cached
+
+    # Wind of either sign keeps every combination with a distinct wind factor.
+    assert list(load_factors.prune_combos(load_factors.ASCE_7_LRFD_COMBOS, {'D': 'positive', 'L': 'positive', 'W': 'any'}).load_combos) == ['LC1', 'LC2a', 'LC3b', 'LC4a']
+    assert list(load_factors.prune_combos(load_factors.ASCE_7_LRFD_COMBOS, {'D': 'positive', 'E': 'negative'}, governing='min').load_combos) == ['LC7']
+
+def test_pruning_keeps_governing_combo():
+    rng = np.random.default_rng(0)
+    cases = ['D', 'L', 'LLR', 'S', 'R', 'W', 'E']
+    for _ in range(200):
+        loads = {case: rng.choice([0.0, rng.uniform(-50, 50)]) for case in cases}
+        for governing in ('max', 'min'):
+            for load_combos in (load_factors.ASCE_7_LRFD_COMBOS, load_factors.ASCE_7_SERVICE_COMBOS):
+                pruning = load_factors.prune_combos(load_combos, load_factors.load_signs(loads), governing)
+                value, name = load_factors.governing_factored_load(loads, pruning.load_combos, governing)
+                expected_value, expected_name = load_factors.governing_factored_load(loads, load_combos, governing)
+                assert name == expected_name and np.isclose(value, expected_value)
+
+def test_user_defined_load_cases():
+    combos = {'LC1': {'D': 1.4}, 'LC2': {'D': 1.2, 'L': 1.6, 'Lp': 1.6}}
+
+    assert load_factors.max_factored_load({'D_load': 20, 'L_load': 10, 'Lp_load': 5}, combos) == 48
+    assert load_factors.max_factored_load({'D_load': 20, 'Lp_load': 5}, load_factors.ASCE_7_LRFD_COMBOS) == 28 # cases without factors are ignored
+
+results_arrays = {
+    'LC1': [[0, 5, 10], [0.0, -8.0, 2.0]],
+    'LC2': [[0, 5, 10], [1.0, 6.0, -3.0]],
+    'LC3': [[0, 5, 10], [-1.0, 4.0, 3.0]],
+}
+
+def test_envelope():
+    results = load_factors.envelope(results_arrays)
+
+    assert results['max'].tolist() == [1.0, -8.0, -3.0]
+    assert results['min'].tolist() == [0.0, 4.0, 2.0]
+    assert results['max_combo'].tolist() == [1, 0, 1]
+    assert results['min_combo'].tolist() == [0, 2, 0]
+    assert results_arrays['LC1'][1] == [0.0, -8.0, 2.0] # input is not modified
+
+    assert load_factors.envelope_max(results_arrays)[1].tolist() == [1.0, -8.0, -3.0]
+    assert load_factors.envelope_min(results_arrays)[1].tolist() == [0.0, 4.0, 2.0]
+
+def test_envelope_accumulator():
+    accumulator = load_factors.EnvelopeAccumulator()
+    for combo_name, result_array in results_arrays.items():
+        accumulator.add(combo_name, result_array)
+
+    streamed = accumulator.result()
+    results = load_factors.envelope(results_arrays)
+    for key in ['max', 'min', 'max_combo', 'min_combo']:
+        assert streamed[key].tolist() == results[key].tolist()
@@ -0,0 +1,149 @@
+import numpy as np
+from modules.beam import CompositeSteelBeam
+from modules.serviceability import transformed_I
+from modules.sweep import section_arrays
+
+# Walking excitation, AISC Design Guide 11 (2nd ed.) chapter 4.
+G = 386.0 # acceleration of gravity, in/s^2
+P_O = 0.065 # constant walking force, kips
+DYNAMIC_EC_FACTOR = 1.35 # dynamic / static concrete modulus
+
+# Recommended tolerance limits, ap/g, keyed by occupancy. DG11 Table 4-1.
+ACCELERATION_LIMITS = {
+    'office': 0.005,
+    'shopping mall': 0.015,
+    'indoor footbridge': 0.015,
+    'outdoor footbridge': 0.05,
+}
+
+def beam_mode(Is, As, d, weight, span, spacing, t_s, deck_height, E, Ec, concrete_density, C_j=2.0,
+              dead_load=4.0, live_load=11.0, deck_weight=2.0, damping=0.025) -> dict:
+    '''
+    Returns the beam mode natural frequency and peak walking acceleration of simply supported composite floor beams per
+    AISC Design Guide 11. The composite moment of inertia is the uncracked transformed section of serviceability.transformed_I,
+    with the dynamic modular ratio and the DG11 effective slab width: the beam spacing, but not more than 0.4 times the span.
+    All arguments may be arrays and are broadcast, e.g. spans of shape (spans, 1) against section properties of shape (sections,).
+
+    Parameters:
+        Is, As, d: steel moment of inertia (in^4), area (in^2) and depth (in)
+        weight: steel self weight, plf
+        span: span length, ft
+        spacing: tributary width of the beam, ft
+        t_s: concrete thickness above the deck, in
+        deck_height: deck height, in
+        E: steel elastic modulus, ksi
+        Ec: static concrete elastic modulus, ksi. Increased by DYNAMIC_EC_FACTOR.
+        concrete_density: concrete density, pcf
+        C_j Optional = 2.0: 2.0 for beams in most areas, 1.0 for beams parallel to an edge.
+        dead_load Optional = 4.0: superimposed dead load, psf
+        live_load Optional = 11.0: live load present during vibration, psf. DG11 recommends 11 psf for offices.
+        deck_weight Optional = 2.0: deck self weight, psf
+        damping Optional = 0.025: modal damping ratio, beta
+
+    Returns:
+        dict: dictionary of arrays:
+            {
+            'fn': natural frequency, Hz
+            'ap_g': peak acceleration as a fraction of g
+            'deflection': midspan deflection under the supported weight, in
+            'I_comp': transformed moment of inertia, in^4
+            'w': supported weight, klf
+            'W': effective panel weight, kips
+            }
+    '''
+    span, spacing, weight = (np.asarray(value, dtype=float) for value in (span, spacing, weight))
+    n = E / (DYNAMIC_EC_FACTOR * Ec)
+    d_e = t_s + deck_height / 2 # effective slab depth, in
+
+    beff = np.minimum(spacing, 0.4 * span) * 12
+    I_comp = transformed_I(Is, As, d, beff, t_s, deck_height, n, cracked=False)
+
+    # Supported weight: slab, deck, superimposed dead and live load on the tributary width, plus the beam.
+    slab_weight = concrete_density * d_e / 12 + deck_weight # psf
+    w = spacing * (slab_weight + dead_load + live_load) / 1000 + weight / 1000 # klf
+    deflection = 5 * (w / 12) * (span * 12)**4 / (384 * E * I_comp)
+    fn = 0.18 * np.sqrt(G / deflection)
+
+    # Effective panel width from the slab and beam transformed moments of inertia per unit width, in^4/ft.
+    D_s = 12 * d_e**3 / (12 * n)
+    D_j = I_comp / spacing
+    B_j = C_j * (D_s / D_j)**0.25 * span
+    W = w / spacing * B_j * span
+
+    return {
+        'fn': fn,
+        'ap_g': P_O * np.exp(-0.35 * fn) / (damping * W),
+        'deflection': deflection,
+        'I_comp': I_comp,
+        'w': w,
+        'W': W,
+    }
+
+def tributary_width(beam: CompositeSteelBeam) -> tuple:
+    '''
+    Returns the tributary width of the beam (ft) and the DG11 C_j coefficient: 2.0 with beams on both sides, else 1.0.
+    '''
+    width = sum(dist / 2 if cond == 'Beam' else dist for cond, dist in beam.layout)
+    C_j = 2.0 if all(cond == 'Beam' for cond, _ in beam.layout) else 1.0
+    return width, C_j
+
+def _floor_inputs(beam: CompositeSteelBeam) -> dict:
+    # beam_mode arguments of the floor around the beam, shared by every section and span.
+    if beam.deck['orientation'] != 90:
+        #TODO: add logic for deck oriented parallel to beam once CompositeSteelBeam supports it.
+        raise NotImplementedError('Only deck oriented perpendicular to the beam (90 deg) is supported.')
+
+    spacing, C_j = tributary_width(beam)
+    return {
+        'spacing': spacing,
+        'C_j': C_j,
+        't_s': beam.deck['t_s'],
+        'deck_height': beam.deck['deck_height'],
+        'E': beam.steel_material.E,
+        'Ec': beam.concrete_material.Ec,
+        'concrete_density': beam.concrete_material.density,
+    }
+
+def check_vibration(beam: CompositeSteelBeam, occupancy: str = 'office', **kwargs) -> dict:
+    '''
+    Returns the beam mode vibration check of a beam as floats. Refer to beam_mode for the results and keyword arguments.
+    Adds 'limit', the ACCELERATION_LIMITS value of the occupancy, and 'passes', whether ap/g is at most the limit.
+    '''
+    shape = beam.shape
+    results = beam_mode(shape.Ix, shape.area, shape.d, shape.weight, beam.span, **_floor_inputs(beam), **kwargs)
+    results = {key: float(value) for key, value in results.items()}
+
+    limit = ACCELERATION_LIMITS[occupancy]
+    return {**results, 'limit': limit, 'passes': results['ap_g'] <= limit}
+
+def sweep_vibration(beam: CompositeSteelBeam, spans=None, profile=None, occupancy: str = 'office', **kwargs) -> dict:
+    '''
+    Evaluates the beam mode vibration of every section of a profile at every span in one vectorized call. Spacing, deck
+    and materials come from the beam; its shape is ignored. Sections are in the order of sweep.sweep_sections, so the
+    results can be combined with its strength checks, e.g. strength['passes'] & vibration['passes'][0].
+
+    Parameters:
+        beam (CompositeSteelBeam): beam providing the design inputs.
+        spans Optional: span lengths, ft. Defaults to the beam span.
+        profile (SectionCatalog or Profile) Optional: sections to sweep. Defaults to the compiled W_shapes catalog.
+        occupancy (str) Optional = 'office': key of ACCELERATION_LIMITS.
+        kwargs: optional arguments of beam_mode, e.g. damping.
+
+    Returns:
+        dict: arrays of shape (spans, sections) as in beam_mode, plus:
+            {
+            'name': section names,
+            'span': spans, ft
+            'limit': acceleration limit, ap/g
+            'passes': bool, ap/g at most the limit
+            }
+    '''
+    sections = section_arrays(profile)
+    spans = np.atleast_1d(np.asarray(beam.span if spans is None else spans, dtype=float))
+
+    results = beam_mode(
+        sections['Ix'], sections['area'], sections['d'], sections['weight'], spans[:, None], **_floor_inputs(beam), **kwargs,
+    )
+
+    limit = ACCELERATION_LIMITS[occupancy]
+    return {**results, 'name': sections['name'], 'span': spans, 'limit': limit, 'passes': results['ap_g'] <= limit}
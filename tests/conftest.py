@@ -0,0 +1,40 @@
+from dataclasses import replace
+import pytest
+from modules.test_beam import test_beam1
+
+DESIGN_DATA = {
+    'beam_length': 30, 'beam_section': 'W16X26', 'beam_fy': 50, 'shored': False,
+    'left_cond': 'Beam', 'left_dist': 8.0, 'right_cond': 'Beam', 'right_dist': 8.0,
+    'stud_fu': 65, 'stud_dia': '3/4"', 'stud_length': 5.0, 'min_comp': 25, 'max_comp': 100,
+    'conc_thickness': 3.5, 'fc': 4.0, 'lightweight': False, 'deck_dir': 90, 'deck_height': 3.0,
+    'uniform_dead': 0.5, 'uniform_const_dead': 0.5, 'uniform_live': 1.3, 'uniform_const_live': 0.2,
+}
+
+def copy_test_beam():
+    # Copies the studs, deck, materials and loads too, so no test can modify modules.test_beam.test_beam1.
+    return replace(
+        test_beam1, studs=dict(test_beam1.studs), deck=dict(test_beam1.deck),
+        steel_material=replace(test_beam1.steel_material), concrete_material=replace(test_beam1.concrete_material),
+        loads=[replace(load) for load in test_beam1.loads],
+    )
+
+@pytest.fixture(scope='session')
+def make_test_beam():
+    '''
+    Returns a function building a fresh copy of the sample beam, for module scoped fixtures and helpers needing several copies.
+    '''
+    return copy_test_beam
+
+@pytest.fixture
+def test_beam():
+    '''
+    Returns a fresh copy of the sample W16X26 beam, modules.test_beam.test_beam1.
+    '''
+    return copy_test_beam()
+
+@pytest.fixture
+def design_data():
+    '''
+    Returns a fresh copy of the app session state inputs of the sample beam.
+    '''
+    return dict(DESIGN_DATA)
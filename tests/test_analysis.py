@@ -0,0 +1,58 @@
+from modules.beam import CompositeSteelBeam
+from modules.load import UniformLoad
+from modules.material import Steel, Concrete
+from steelpy import aisc
+from dataclasses import replace
+import numpy as np
+import math
+import pytest
+
+test_beam = CompositeSteelBeam(
+    name='Composite Beam',
+    span=30,
+    shape=aisc.W_shapes.W16X26,
+    shored=False,
+    layout=(('Beam', 8.0), ('Beam', 8.0)),
+    studs={'fu': 65, 'dia': 0.75, 'length': 5.0, 'max_comp': 1.0, 'min_comp': 0.25},
+    deck={'t_s': 3.5, 'deck_height': 3.0, 'orientation': 90},
+    steel_material=Steel(
+        name='Steel',
+        poisson_ratio=0.3,
+        density=490,
+        E=29000,
+        fy=50,
+        fu=65),
+    concrete_material=Concrete(
+        name='Concrete',
+        poisson_ratio=0.2,
+        density=145,
+        fc=4.0),
+    loads=[
+        UniformLoad(name='Uniform Dead Load', load_case='D', magnitude=0.5, start_loc=0, end_loc=30),
+        UniformLoad(name='Uniform Construction Dead Load', load_case='CD', magnitude=0.5, start_loc=0, end_loc=30),
+        UniformLoad(name='Uniform Live Load', load_case='L', magnitude=1.3, start_loc=0, end_loc=30),
+        UniformLoad(name='Uniform Construction Live Load', load_case='CL', magnitude=0.2, start_loc=0, end_loc=30)
+    ]
+)
+
+closed_form = replace(test_beam).analyze()
+pynite = replace(test_beam).analyze(engine='pynite')
+
+def test_closed_form_moment():
+    w = 1.2 * (0.5 + 0.026) + 1.6 * 1.3
+
+    assert math.isclose(closed_form.max_moment('comp_factored'), w * 30**2 / 8)
+
+def test_engines_agree():
+    for combo in test_beam.factored_loads:
+        assert math.isclose(closed_form.max_moment(combo), pynite.max_moment(combo), rel_tol=1e-6)
+        assert math.isclose(closed_form.max_shear(combo), pynite.max_shear(combo), rel_tol=1e-6)
+        assert math.isclose(closed_form.max_deflection(combo), pynite.max_deflection(combo), rel_tol=1e-3)
+        assert np.allclose(closed_form.reactions(combo), pynite.reactions(combo))
+
+        for diagram in ['moment_array', 'shear_array', 'deflection_array']:
+            assert np.allclose(getattr(closed_form, diagram)(combo, 11), getattr(pynite, diagram)(combo, 11), atol=1e-6)
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        replace(test_beam).analyze(engine='unknown')
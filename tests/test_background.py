@@ -0,0 +1,73 @@
+import threading
+from modules.background import BackgroundRunner
+import app_logic
+
+def test_debounce_runs_newest_only():
+    calls = []
+    runner = BackgroundRunner(lambda value: calls.append(value) or value * 2, debounce=0.05)
+
+    for value in range(5):
+        runner.submit(value, value)
+    state = runner.wait(timeout=5)
+
+    assert calls == [4]
+    assert (state.result, state.key, state.pending) == (8, 4, False)
+    assert not runner.submit(4, 4) # unchanged inputs are not rerun
+    runner.shutdown()
+
+def test_superseded_run_is_discarded():
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow(value):
+        if value == 'slow':
+            started.set()
+            release.wait(5)
+        return value
+
+    runner = BackgroundRunner(slow, debounce=0.0)
+    runner.submit('slow', 'slow')
+    assert started.wait(5)
+
+    runner.submit('fast', 'fast')
+    assert runner.state().pending
+    release.set()
+    state = runner.wait(timeout=5)
+
+    assert state.result == 'fast'
+    assert state.key == 'fast'
+    runner.shutdown()
+
+def test_error_keeps_last_result():
+    def func(value):
+        if value < 0:
+            raise ValueError('negative')
+        return value
+
+    runner = BackgroundRunner(func, debounce=0.0)
+    runner.submit(1, 1)
+    runner.wait(timeout=5)
+    runner.submit(-1, -1)
+    state = runner.wait(timeout=5)
+
+    assert (state.result, state.key) == (1, 1) # the key still identifies the result
+    assert isinstance(state.error, ValueError)
+    assert not runner.submit(-1, -1) # the failing inputs are not rerun
+
+    runner.submit(2, 2)
+    state = runner.wait(timeout=5)
+    assert (state.result, state.key, state.error) == (2, 2, None)
+    runner.shutdown()
+
+def test_submit_calc_beam(design_data):
+    session_state = dict(design_data)
+    runner = app_logic.analysis_runner(session_state)
+    assert app_logic.analysis_runner(session_state) is runner
+
+    assert app_logic.submit_calc_beam(session_state, runner)
+    assert not app_logic.submit_calc_beam(session_state, runner)
+    state = runner.wait(timeout=30)
+
+    assert state.result is app_logic.calc_beam(design_data)
+    runner.shutdown()
+    assert app_logic.analysis_executor.submit(int).result() == 0 # shared by every session, so runners leave it running
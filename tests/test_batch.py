@@ -0,0 +1,51 @@
+import csv
+import json
+import batch
+
+def write_designs(path, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+
+def test_parse_design(design_data):
+    text_row = {key: str(value) for key, value in design_data.items()}
+    data = batch.parse_design(text_row)
+    assert data['beam_length'] == 30.0
+    assert data['shored'] is False
+    assert data['stud_dia'] == '3/4"'
+    assert batch.parse_design(design_data) == design_data
+
+def test_run_batch_streams_results_and_errors(tmp_path, design_data):
+    designs = tmp_path / 'designs.csv'
+    bad = dict(design_data, beam_section='W99X999')
+    write_designs(designs, [dict(design_data, id='a'), dict(bad, id='b'), dict(design_data, id='c', beam_length=24)])
+
+    for workers in (0, 2):
+        output = tmp_path / f'results_{workers}.jsonl'
+        assert batch.main([str(designs), '-o', str(output), '-w', str(workers), '-c', '1', '-q']) == 0
+        records = sorted((json.loads(line) for line in output.read_text().splitlines()), key=lambda record: record['row'])
+
+        assert [record['id'] for record in records] == ['a', 'b', 'c']
+        assert records[0]['section'] == 'W16X26' and 'error' not in records[0]
+        assert records[1]['error'].startswith('KeyError')
+        assert records[2]['comp_Mu'] < records[0]['comp_Mu']
+
+    output = tmp_path / 'results.csv'
+    batch.main([str(designs), '-o', str(output), '-w', '0', '-q'])
+    with open(output, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 3 and rows[1]['error']
+
+def test_malformed_jsonl_line_is_reported(tmp_path, design_data):
+    designs = tmp_path / 'designs.jsonl'
+    designs.write_text('\n'.join([json.dumps(dict(design_data, id='a')), '{"id": "b", "beam_length": ', json.dumps(dict(design_data, id='c'))]) + '\n')
+
+    output = tmp_path / 'results.jsonl'
+    assert batch.main([str(designs), '-o', str(output), '-w', '2', '-c', '1', '-q']) == 0
+    records = sorted((json.loads(line) for line in output.read_text().splitlines()), key=lambda record: record['row'])
+
+    assert [record['row'] for record in records] == [1, 2, 3]
+    assert records[1]['error'].startswith('JSONDecodeError')
+    assert records[0]['section'] == records[2]['section'] == 'W16X26'
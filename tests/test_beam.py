@@ -3,6 +3,8 @@ from modules.load import UniformLoad
 from modules.material import Steel, Concrete
 from steelpy import aisc
 import math
+import pytest
+from dataclasses import replace, FrozenInstanceError
 
 test_beam = CompositeSteelBeam(
     name='Composite Beam', 
@@ -69,4 +71,54 @@ def test_get_effective_width():
 def test_modular_ratio():
     n = test_beam.modular_ratio()
     
-    assert math.isclose(n, 7.56, rel_tol=0.01)
\ No newline at end of file
+    assert math.isclose(n, 7.56, rel_tol=0.01)
+
+
+def test_derived_values_invalidated():
+    beam = replace(test_beam, steel_material=replace(test_beam.steel_material))
+    assert math.isclose(beam.calc_effective_width(), 7.5, rel_tol=0.1)
+
+    beam.span = 40
+    assert math.isclose(beam.calc_effective_width(), 8.0)
+
+    beam.layout = (('Beam', 6.0), ('Beam', 6.0))
+    assert math.isclose(beam.calc_effective_width(), 6.0)
+
+    beam.steel_material.E = 30000 # in place mutation is not detected until invalidated
+    beam.invalidate('steel_material')
+    assert math.isclose(beam.modular_ratio(), 30000 / beam.concrete_material.Ec)
+
+def test_factored_loads_follow_loads():
+    beam = replace(test_beam)
+    assert math.isclose(beam.factored_loads['comp_factored']['UDL'], 1.4 * 0.026)
+
+    beam.loads = [UniformLoad(name='Uniform Dead Load', load_case='D', magnitude=1.0, start_loc=0, end_loc=30)]
+    assert math.isclose(beam.factored_loads['comp_factored']['UDL'], 1.4 * 1.026)
+
+def test_frozen_beam():
+    frozen = replace(test_beam, steel_material=replace(test_beam.steel_material)).freeze()
+
+    assert math.isclose(frozen.calc_effective_width(), test_beam.calc_effective_width())
+    with pytest.raises(FrozenInstanceError):
+        frozen.span = 40
+    with pytest.raises(TypeError):
+        frozen.deck['t_s'] = 6.0
+    with pytest.raises(FrozenInstanceError):
+        frozen.analyze()
+
+def test_frozen_beam_reads_do_not_write():
+    beam = replace(
+        test_beam, deck={**test_beam.deck, 'orientation': 90}, studs={**test_beam.studs, 'min_comp': 0.25, 'max_comp': 1.0},
+        steel_material=replace(test_beam.steel_material),
+    )
+    beam.analyze()
+    frozen = beam.freeze()
+    derived = dict(frozen._derived)
+
+    C_full = frozen.calc_full_comp_C()
+    arguments = {'calc_partial_comp_moment_capacity': (C_full / 2,), 'calc_stress_block_depth': (C_full,)}
+    for name in dir(frozen):
+        if name.startswith('calc_'):
+            getattr(frozen, name)(*arguments.get(name, ()))
+
+    assert frozen._derived == derived
@@ -0,0 +1,65 @@
+import math
+import tracemalloc
+from dataclasses import replace
+import numpy as np
+import pytest
+import modules.load_factors as load_factors
+from modules.beam_batch import BeamBatch
+from modules.catalog import load_catalog
+from modules.load import PointLoad
+
+def candidates(test_beam, n: int) -> list:
+    catalog = load_catalog('W_shapes')
+    beams = []
+    for i in range(n):
+        span = 20 + i % 15
+        loads = [replace(load, end_loc=span) for load in test_beam.loads]
+        beams.append(replace(
+            test_beam, name=f'B{i}', span=span, shape=catalog.section(catalog.names[i % len(catalog)]), loads=loads,
+            studs=dict(test_beam.studs), deck=dict(test_beam.deck),
+            steel_material=replace(test_beam.steel_material), concrete_material=replace(test_beam.concrete_material),
+        ))
+    return beams
+
+def test_slotted_types_have_no_instance_dict(test_beam):
+    beam = replace(test_beam)
+    for obj in (beam, beam.freeze(), beam.steel_material, beam.concrete_material, beam.loads[0]):
+        assert not hasattr(obj, '__dict__')
+
+    beam.concrete_material = replace(beam.concrete_material, fc=5)
+    assert math.isclose(beam.concrete_material.Ec, 33 * 145**1.5 * math.sqrt(5000) / 1000)
+
+def test_round_trip(test_beam):
+    beams = candidates(test_beam, 40)
+    batch = BeamBatch.from_beams(beams)
+    assert len(batch) == 40
+
+    for i in (0, 17, 39):
+        beam = batch[i]
+        assert (beam.name, beam.span, beam.shape.name, beam.layout) == (beams[i].name, beams[i].span, beams[i].shape.name, beams[i].layout)
+        assert beam.studs == beams[i].studs and beam.deck == beams[i].deck
+        assert beam.steel_material == beams[i].steel_material
+        assert beam.concrete_material == beams[i].concrete_material
+        assert math.isclose(beam.calc_full_comp_moment_capacity(), beams[i].calc_full_comp_moment_capacity())
+
+    assert np.allclose(batch.effective_width(), [beam.calc_effective_width() for beam in beams])
+
+    udl = batch.factored_udl(load_factors.ASCE_7_LRFD_COMBOS)
+    assert np.allclose(udl, [beam.factored_loads['comp_factored']['UDL'] for beam in beams])
+
+    heavy = batch.take(batch.section('weight') > 100)
+    assert set(heavy.name) == {beam.name for beam in beams if beam.shape.weight > 100}
+
+def test_footprint(test_beam):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    beams = candidates(test_beam, 2000)
+    objects = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, 'filename'))
+    tracemalloc.stop()
+
+    assert BeamBatch.from_beams(beams).nbytes < objects / 3
+
+def test_partial_loads_rejected(test_beam):
+    beam = replace(test_beam, loads=test_beam.loads + [PointLoad(name='P', load_case='L', magnitude=1.0, location=5.0)])
+    with pytest.raises(NotImplementedError):
+        BeamBatch.from_beams([beam])
@@ -0,0 +1,17 @@
+from benchmarks import suite
+
+def test_run_benchmarks_quick():
+    results = suite.run_benchmarks(['factored_loads_all_tables', 'render_section_250x150'], repeat=2, min_time=0.0)
+    assert set(results) == {'factored_loads_all_tables', 'render_section_250x150'}
+    assert all(result['best_s'] > 0 and result['best_s'] <= result['median_s'] for result in results.values())
+
+def test_compare_flags_regressions():
+    baseline = {'a': {'best_s': 1.0}, 'b': {'best_s': 1.0}}
+    rows = suite.compare({'a': {'best_s': 1.1}, 'b': {'best_s': 2.0}, 'c': {'best_s': 1.0}}, baseline, threshold=1.25)
+    assert [(row['name'], row['regressed']) for row in rows] == [('a', False), ('b', True)]
+
+def test_main_saves_and_compares(tmp_path):
+    baseline = str(tmp_path / 'baseline.json')
+    args = ['envelope_50x10000', '--repeat', '1', '--min-time', '0', '--baseline', baseline]
+    assert suite.main(args + ['--save']) == 0
+    assert suite.main(args + ['--threshold', '1000']) == 0
@@ -0,0 +1,40 @@
+from dataclasses import FrozenInstanceError
+import pytest
+from modules.cache import LRUCache
+import app_logic
+
+def test_lru_eviction():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+
+def test_lru_max_age():
+    now = [0.0]
+    cache = LRUCache(maxsize=2, max_age=10, clock=lambda: now[0])
+    cache.put('a', 1)
+    now[0] = 5.0
+    assert cache.get('a') == 1
+
+    now[0] = 11.0
+    assert cache.get('a') is None
+    assert cache.info()['hits'] == 1
+    assert cache.info()['misses'] == 1
+
+def test_calc_beam_memoized(design_data):
+    app_logic.calc_beam_cache.clear()
+    beam = app_logic.calc_beam(design_data)
+    same_design = {**design_data, 'beam_length': 30.0, 'unrelated_widget': 'ignored'}
+
+    assert app_logic.calc_beam(same_design) is beam
+    assert app_logic.calc_beam_cache_info()['hits'] == 1
+    assert app_logic.calc_beam_cache_info()['misses'] == 1
+    assert app_logic.calc_beam({**design_data, 'beam_length': 32}) is not beam
+
+    with pytest.raises(FrozenInstanceError): # cached beams are shared, so they cannot be modified
+        beam.span = 40
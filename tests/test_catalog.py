@@ -0,0 +1,29 @@
+from modules import catalog
+from steelpy import aisc
+import pickle
+
+w_shapes = catalog.load_catalog('W_shapes')
+
+def test_catalog_matches_steelpy():
+    assert w_shapes.names == list(aisc.W_shapes.sections)
+
+    for name, section in aisc.W_shapes.sections.items():
+        for field in catalog.CATALOG_FIELDS:
+            assert getattr(w_shapes.section(name), field) == getattr(section, field)
+
+def test_catalog_lookup():
+    shape = getattr(w_shapes, 'W16X26')
+
+    assert shape.name == 'W16X26'
+    assert shape.Zx == aisc.W_shapes.W16X26.Zx
+    assert shape == w_shapes.sections['W16X26']
+    assert pickle.loads(pickle.dumps(shape)) == shape
+    assert 'W16X26' in w_shapes
+    assert 'W16X27' not in w_shapes
+
+def test_build_catalog(tmp_path):
+    path = catalog.build_catalog('W_shapes', path=str(tmp_path / 'W_shapes.cbcat'), fields=('d', 'Zx'))
+    built = catalog.SectionCatalog(path)
+
+    assert built.fields == ['d', 'Zx']
+    assert built.column('Zx').tolist() == w_shapes.column('Zx').tolist()
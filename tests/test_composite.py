@@ -0,0 +1,43 @@
+from modules import composite
+import numpy as np
+import math
+
+def test_full_composite_matches_beam(test_beam):
+    # W16X26 steel governs the full composite force, so the PNA is in the slab.
+    C = test_beam.calc_full_comp_C()
+
+    assert math.isclose(test_beam.calc_partial_comp_moment_capacity(C), test_beam.calc_full_comp_moment_capacity())
+    assert math.isclose(test_beam.calc_PNA(), test_beam.calc_stress_block_depth(C))
+
+def test_pna_in_flange():
+    # W16X26: As = 7.68, bf = 5.5, tf = 0.345, d = 15.7. Py = 384 kips and the flange yields at 94.875 kips.
+    sum_Qn = 300
+    C_steel = (384 - sum_Qn) / 2
+    y_p = C_steel / (5.5 * 50)
+    a = sum_Qn / (0.85 * 4 * 48)
+    Mn = sum_Qn * (3.5 + 3.0 - a / 2 + y_p / 2) + 384 * (15.7 / 2 - y_p / 2)
+    strength = composite.partial_comp_strength(sum_Qn, 7.68, 50, 15.7, 5.5, 0.345, 0.25, 4.0, 48, 3.5, 3.0)
+
+    assert strength['PNA_location'] == composite.PNA_IN_FLANGE
+    assert math.isclose(strength['PNA'], 6.5 + y_p)
+    assert math.isclose(strength['phi_Mn'], 0.9 * Mn / 12)
+
+def test_partial_comp_curve(test_beam):
+    curve = test_beam.calc_partial_comp_curve(n_points=21)
+
+    assert math.isclose(curve['percent_comp'][0], 0.25)
+    assert math.isclose(curve['percent_comp'][-1], 1.0)
+    assert np.all(np.diff(curve['phi_Mn']) > 0)
+    assert composite.PNA_IN_WEB in curve['PNA_location']
+    assert composite.PNA_IN_FLANGE in curve['PNA_location']
+    assert curve['PNA_location'][-1] == composite.PNA_IN_SLAB
+
+def test_required_sum_Qn(test_beam):
+    curve = test_beam.calc_partial_comp_curve(n_points=200)
+    Mu = [curve['phi_Mn'][0] - 1, curve['phi_Mn'][100], curve['phi_Mn'][-1] + 1]
+    required = composite.required_sum_Qn(curve, Mu)
+
+    assert required[0] == curve['sum_Qn'][0]
+    assert math.isclose(required[1], curve['sum_Qn'][100])
+    assert np.isnan(required[2])
+    assert test_beam.calc_partial_comp_moment_capacity(composite.required_sum_Qn(curve, 300.0)) >= 300.0 - 1e-6
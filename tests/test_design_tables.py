@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from modules.design_tables import DesignTable, build_design_table, comp_ratios, design_beam, sweep_ratios, verify_beam
+from modules.sweep import sweep_sections
+
+area_loads = {'D': 60, 'CD': 50, 'CL': 20}
+
+@pytest.fixture(scope='module')
+def table(tmp_path_factory, make_test_beam):
+    path = tmp_path_factory.mktemp('tables') / 'table.npz'
+    build_design_table(make_test_beam(), [20, 30, 40], [6, 10], [50, 100, 150], area_loads).save(path)
+    return DesignTable.load(path)
+
+def test_grid_points_match_exact_checks(table):
+    ratios = table.interpolate(30, 10, 100)
+    index = list(table.names).index('W16X26')
+    exact = verify_beam(design_beam(table.basis, 30, 10, 100, 'W16X26'))
+
+    assert table.ratios.shape == (3, 2, 3, len(table.names))
+    assert np.isclose(ratios[index], max(exact['pre_comp_ratio'], exact['comp_ratio']), rtol=1e-6)
+
+def exact_lightest(table, span, spacing, live_load):
+    for index in np.argsort(table.weights, kind='stable'):
+        if verify_beam(design_beam(table.basis, span, spacing, live_load, str(table.names[index])))['passes']:
+            return str(table.names[index])
+
+@pytest.mark.parametrize('point', [(27.5, 8.0, 80), (25, 10, 75), (32.5, 10, 150), (22.5, 7, 120), (37.5, 9, 60), (30, 7.5, 50)])
+def test_select_matches_exact_lightest_pass(table, point):
+    pick = table.select(*point)
+    assert pick['verified']['passes']
+    assert pick['section'] == exact_lightest(table, *point)
+    assert pick['checked'] < len(table.names) / 4 # sections that fail at every corner of the cell are skipped
+
+def test_lower_bound_brackets_interpolation(table):
+    assert np.all(table.lower_bound(25, 10, 75) <= table.interpolate(25, 10, 75))
+
+def test_lower_bound_across_effective_width_limit(table):
+    # From 6 to 10 ft spacing on a 30 ft span the effective width stops growing at 7.5 ft. Ratios of sections where the
+    # concrete controls fall with spacing until then, or until the steel controls, and dip below every corner of the cell.
+    bound = table.lower_bound(32.5, 8.0, 75)
+    samples = np.array([
+        sweep_ratios(table.basis, span, spacing, live_load)
+        for span in (30, 32.5, 35) for spacing in np.linspace(6, 10, 33) for live_load in (50, 100)
+    ]).min(axis=0)
+    corners = table.ratios[1:3, :, 0:2].min(axis=(0, 1, 2))
+
+    assert np.any(samples < corners * (1 - 1e-3))
+    assert np.all(bound <= samples * (1 + 1e-9))
+
+def test_comp_ratios_match_sweep(table):
+    beam = design_beam(table.basis, 30, 7.0, 100, 'W16X26')
+    assert np.allclose(comp_ratios(table.basis, 30, 7.0, 100), sweep_sections(beam)['comp_ratio'])
+
+def test_query_outside_grid(table):
+    with pytest.raises(ValueError):
+        table.select(45, 8.0, 80)
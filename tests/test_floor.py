@@ -0,0 +1,68 @@
+import math
+from dataclasses import replace
+import pytest
+from modules.floor import Floor
+from modules.load import PointLoad, UniformLoad
+
+def infill(test_beam, name, live=1.3):
+    loads = [load for load in test_beam.loads if load.load_case != 'L'] + [UniformLoad('Live', 'L', live, 0, test_beam.span)]
+    return replace(test_beam, name=name, loads=loads)
+
+def build_floor(test_beam, engine='closed_form'):
+    floor = Floor(engine=engine, workers=2)
+    girder = replace(test_beam, name='G1', span=30.0, loads=[UniformLoad('Dead', 'D', 0.1, 0, 30.0)])
+    floor.add_member(girder)
+    floor.add_member(infill(test_beam, 'B1'), left=('G1', 10.0))
+    floor.add_member(infill(test_beam, 'B2'), left=('G1', 20.0))
+    return floor
+
+def test_point_loads_superpose(test_beam):
+    beam = replace(test_beam, loads=[PointLoad('P', 'D', 10.0, 10.0)])
+    results = beam.analyze()
+    w = beam.shape.weight / 1000 * 1.4 # self weight only carried by the D case
+    assert beam.factored_loads['comp_factored']['point_loads'] == [(10.0, 14.0)]
+    assert math.isclose(results.reactions('comp_factored')[0], 14.0 * 20 / 30 + w * 15)
+
+    x = 10.0 # moment peaks under the load
+    expected = 14.0 * 20 * 10 / 30 + w * x * (30 - x) / 2
+    assert math.isclose(results.max_moment('comp_factored'), expected)
+    assert math.isclose(results.max_moment('comp_factored'), beam.analyze('pynite').max_moment('comp_factored'))
+
+def test_reactions_propagate_to_girder(test_beam):
+    floor = build_floor(test_beam)
+    assert floor.levels() == [['B1', 'B2'], ['G1']]
+    assert floor.analyze() == ['B1', 'B2', 'G1']
+
+    beam = floor.members['B1']
+    left = beam.calc_case_reactions()
+    factored = beam.results.reactions('comp_factored')[0]
+    factors = {'D': 1.2, 'L': 1.6}
+    assert math.isclose(factored, sum(factors.get(case, 0) * R[0] for case, R in left.items()))
+
+    girder = floor.members['G1']
+    points = girder.factored_loads['comp_factored']['point_loads']
+    assert sorted(location for location, _ in points) == [10.0, 10.0, 20.0, 20.0]
+    assert math.isclose(sum(P for _, P in points), 2 * factored)
+
+def test_incremental_recompute(test_beam):
+    floor = build_floor(test_beam)
+    floor.analyze()
+    assert floor.analyze() == []
+
+    before = floor.members['G1'].results.max_moment('comp_factored')
+    floor.update_member('B2', loads=infill(test_beam, 'B2', live=2.0).loads)
+    assert floor.analyze() == ['B2', 'G1']
+    assert floor.members['G1'].results.max_moment('comp_factored') > before
+    assert len([load for load in floor.members['G1'].loads if isinstance(load, PointLoad)]) == 2 * 4
+
+def test_invalid_graphs(test_beam):
+    floor = build_floor(test_beam)
+    floor.add_member(infill(test_beam, 'B3'), left=('G9', 5.0))
+    with pytest.raises(ValueError):
+        floor.levels()
+
+    floor = Floor()
+    floor.add_member(infill(test_beam, 'A'), left=('B', 5.0))
+    floor.add_member(infill(test_beam, 'B'), left=('A', 5.0))
+    with pytest.raises(ValueError):
+        floor.analyze()
@@ -0,0 +1,45 @@
+from dataclasses import replace
+import json
+from modules.instrument import Tracer
+import modules.instrument as instrument
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    with tracer.span('outer'):
+        tracer.count('calls')
+    assert tracer.spans == [] and not tracer.counters
+    assert tracer.span('a') is tracer.span('b')
+
+def test_nested_spans_and_exports():
+    tracer = Tracer(enabled=True)
+    with tracer.span('outer', beam='B1'):
+        with tracer.span('inner'):
+            tracer.count('calls', 2)
+
+    inner, outer = tracer.spans
+    assert inner['stack'] == ['outer', 'inner']
+    assert outer['self_ns'] == outer['duration_ns'] - inner['duration_ns']
+
+    summary = tracer.summary()
+    assert summary['spans']['outer']['calls'] == 1
+    assert summary['counters'] == {'calls': 2}
+
+    trace = json.loads(json.dumps(tracer.chrome_trace()))
+    assert [event['ph'] for event in trace['traceEvents']] == ['X', 'X', 'C']
+    assert trace['traceEvents'][1]['args'] == {'beam': 'B1'}
+
+    stacks = [line.rsplit(' ', 1)[0] for line in tracer.folded_stacks().splitlines()]
+    assert stacks == ['outer;inner', 'outer']
+
+def test_beam_hot_path_is_traced(test_beam):
+    instrument.tracer.clear()
+    instrument.tracer.enabled = True
+    try:
+        beam = replace(test_beam)
+        beam.analyze('pynite')
+        beam.calc_pre_comp_strength()
+    finally:
+        instrument.tracer.enabled = False
+
+    names = {span['name'] for span in instrument.tracer.spans}
+    assert {'beam.analyze', 'pynite.build_model', 'pynite.analyze_linear', 'beam.pre_comp_strength'} <= names
@@ -0,0 +1,84 @@
+import io
+from dataclasses import replace
+import pytest
+import app_logic
+from modules.project import Project, ProjectWriter, beam_record, record_beam, write_project
+from modules.load import PointLoad
+
+def test_round_trip(tmp_path, test_beam):
+    beams = [replace(test_beam, name=f'B{i}', span=20 + i, loads=test_beam.loads + [PointLoad(name='P', load_case='L', magnitude=i, location=5.0)]) for i in range(50)]
+    path = write_project(tmp_path / 'floor.cbproj', beams, summaries=[{'passes': True, 'ratio': i / 50} for i in range(50)])
+
+    with Project(path) as project:
+        assert len(project) == 50
+        assert project.names[7] == 'B7'
+
+        beam = project['B31']
+        assert beam_record(beam) == beam_record(beams[31])
+        assert beam.shape.name == 'W16X26'
+        assert project.summary(-1) == {'passes': True, 'ratio': 49 / 50}
+
+        with pytest.raises(KeyError):
+            project.record('missing')
+
+    # Reloaded beams analyze like the originals.
+    assert record_beam(beam_record(test_beam)).analyze().max_moment('comp_factored') == replace(test_beam).analyze().max_moment('comp_factored')
+
+def test_writer_leaves_file_objects_open(test_beam):
+    buffer = io.BytesIO()
+    with ProjectWriter(buffer) as writer:
+        writer.add(test_beam)
+
+    assert not buffer.closed
+    assert Project.from_bytes(buffer.getvalue()).record(0)['name'] == test_beam.name
+
+def test_unfinished_file_is_rejected(tmp_path, test_beam):
+    writer = ProjectWriter(tmp_path / 'open.cbproj')
+    writer.add(test_beam)
+    writer.file.flush()
+
+    with pytest.raises(ValueError):
+        Project(tmp_path / 'open.cbproj')
+    writer.close()
+
+def test_restore_session_inputs(design_data):
+    beam = app_logic.calc_beam(design_data)
+    upload = io.BytesIO(app_logic.project_bytes(beam, {**design_data, 'beam_length': 32}))
+    session_state = {'project_upload': upload}
+
+    app_logic.restore_project_inputs(session_state)
+
+    assert session_state['beam_length'] == 32
+    assert session_state['beam_section'] == 'W16X26'
+
+def test_restore_from_key_keeps_integer_widgets(design_data):
+    key = app_logic.design_key(design_data)
+    upload = io.BytesIO(app_logic.project_bytes(app_logic.calc_beam(design_data), dict(key)))
+    session_state = {'project_upload': upload}
+
+    app_logic.restore_project_inputs(session_state)
+
+    assert session_state['project_error'] is None
+    assert type(session_state['beam_length']) is int and session_state['beam_length'] == 30
+    assert app_logic.design_key(session_state) == key
+
+def test_restore_project_without_inputs(tmp_path, design_data):
+    design = {**design_data, 'beam_length': 34, 'beam_section': 'W18X35', 'uniform_live': 0.9, 'lightweight': True}
+    path = write_project(tmp_path / 'batch.cbproj', [app_logic.generate_comp_beam(design)])
+    session_state = {'project_upload': io.BytesIO(open(path, 'rb').read())}
+
+    app_logic.restore_project_inputs(session_state)
+
+    assert session_state['project_error'] is None
+    assert app_logic.design_key(session_state) == app_logic.design_key(design)
+
+def test_restore_reports_beams_the_app_cannot_show(tmp_path, design_data):
+    beam = replace(app_logic.generate_comp_beam(design_data))
+    beam.loads = beam.loads + [PointLoad(name='Point Live Load', load_case='L', magnitude=5.0, location=10.0)]
+    path = write_project(tmp_path / 'point.cbproj', [beam])
+    session_state = {'project_upload': io.BytesIO(open(path, 'rb').read()), 'beam_length': 30}
+
+    app_logic.restore_project_inputs(session_state)
+
+    assert 'Point Live Load' in session_state['project_error']
+    assert set(session_state) == {'project_upload', 'beam_length', 'project_error'} # inputs unchanged
@@ -0,0 +1,32 @@
+from dataclasses import replace
+from io import BytesIO
+from PIL import Image
+import modules.render as render
+
+def test_section_png_is_cached_by_geometry(test_beam):
+    render.png_cache.clear()
+    png = render.render_beam_section_png(test_beam, 200, 120)
+    assert Image.open(BytesIO(png)).size == (200, 120)
+    assert render.render_beam_section_png(replace(test_beam, name='copy'), 200, 120) is png
+    assert render.png_cache.info()['hits'] == 1
+
+    deeper = replace(test_beam, deck=dict(test_beam.deck, t_s=5.0))
+    assert render.render_beam_section_png(deeper, 200, 120) != png
+
+def test_vectorized_polygons_match_single_section(test_beam):
+    geometry = render.section_geometry(test_beam)
+    steel, slab = render.section_polygons(*geometry, 500, 300)
+    batch_steel, batch_slab = render.section_polygons(*[[value, value] for value in geometry], 500, 300)
+    assert steel.shape == (12, 2) and batch_steel.shape == (2, 12, 2)
+    assert (batch_steel[1] == steel).all() and (batch_slab[0] == slab).all()
+
+def test_catalog_sprite_sheet_and_thumbnails(tmp_path):
+    png, boxes = render.catalog_sprite_sheet(thumb_width=32, thumb_height=32, columns=10)
+    sheet = Image.open(BytesIO(png))
+    assert len(boxes) == 289
+    assert sheet.size == (320, 29 * 32)
+    assert boxes['W16X26'][2] - boxes['W16X26'][0] == 32
+
+    paths = render.write_section_thumbnails(str(tmp_path), thumb_width=32, thumb_height=32)
+    assert len(paths) == 289
+    assert Image.open(tmp_path / 'W16X26.png').size == (32, 32)
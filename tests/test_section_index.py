@@ -0,0 +1,44 @@
+from dataclasses import replace
+import numpy as np
+from modules.catalog import load_catalog
+from modules.section_index import SectionIndex, get_section_index, beam_candidates
+
+def test_matches_beam_checks(test_beam):
+    catalog = load_catalog('W_shapes')
+    index = SectionIndex(catalog)
+    assert get_section_index() is get_section_index()
+
+    for fy in (36, 50, 65):
+        expected = []
+        for name in catalog.names:
+            beam = replace(test_beam, shape=catalog.section(name), steel_material=replace(test_beam.steel_material, fy=fy))
+            section = catalog.section(name)
+            if beam.flange_is_compact() and beam.web_is_compact() and section.d <= 21.5 and section.Zx >= 60:
+                expected.append((section.weight, name))
+
+        names = index.query(fy=fy, compact_flange=True, compact_web=True, max_depth=21.5, min_Zx=60)
+        assert sorted(names) == sorted(name for _, name in expected)
+
+        weights = [catalog.section(name).weight for name in names]
+        assert weights == sorted(weights)
+
+def test_nominal_depth_and_limit():
+    index = get_section_index()
+    names = index.query(max_nominal_depth=16, min_area=7.0, limit=5)
+    assert len(names) == 5
+    assert all(int(name[1:].split('X')[0]) <= 16 for name in names)
+    assert names[0] == index.query(max_nominal_depth=16, min_area=7.0)[0]
+
+    positions = index.positions(max_nominal_depth=16, min_area=7.0)
+    assert np.asarray(load_catalog('W_shapes').names)[positions[:5]].tolist() == names
+
+def test_beam_candidates(test_beam):
+    beam = replace(test_beam)
+    names = beam_candidates(beam, max_nominal_depth=18)
+    area = beam.calc_req_steel_area()
+
+    assert names
+    for name in names[:10]:
+        candidate = replace(test_beam, shape=load_catalog('W_shapes').section(name))
+        assert candidate.shape.area >= area
+        assert candidate.flange_is_compact() and candidate.web_is_compact()
@@ -0,0 +1,67 @@
+import math
+from dataclasses import replace
+import numpy as np
+import modules.serviceability as serviceability
+from modules.catalog import load_catalog
+from modules.superposition import SpanLoads
+
+def test_udl_shape_matches_midspan_formula():
+    EI = 29000 * 301.0
+    midspan = serviceability.udl_shape(30, 15) * 1.3 / EI
+    assert math.isclose(midspan, 5 * (1.3 / 12) * 360**4 / (384 * EI))
+    assert math.isclose(SpanLoads(30, point_x=[15], point_P=[1]).deflection(15, EI), 360**3 / (48 * EI))
+
+def test_lower_bound_I_limits(test_beam):
+    beam = replace(test_beam)
+    assert math.isclose(beam.calc_lower_bound_I(sum_Qn=0.0), beam.shape.Ix)
+    I_LB = [beam.calc_lower_bound_I(sum_Qn) for sum_Qn in (100, 200, beam.calc_full_comp_C())]
+    assert I_LB == sorted(I_LB)
+    assert I_LB[-1] < beam.calc_transformed_I()
+
+def test_uncracked_transformed_I():
+    # W12X14 under a 10 ft slab: the neutral axis falls in the slab.
+    args = (88.6, 4.16, 11.9, 120, 3.5, 3.0, 7.0)
+    cracked = serviceability.transformed_I(*args)
+    uncracked = serviceability.transformed_I(*args, cracked=False)
+    assert uncracked > cracked
+
+    shallow = (88.6, 4.16, 11.9, 12, 3.5, 3.0, 7.0) # narrow slab, neutral axis in the steel
+    assert math.isclose(serviceability.transformed_I(*shallow), serviceability.transformed_I(*shallow, cracked=False))
+
+def test_beam_deflection_checks(test_beam):
+    beam = replace(test_beam)
+    beam.analyze()
+    checks = beam.check_deflections()
+    assert checks['x'].shape == (21,)
+    assert checks['total']['deflection'].shape == (len(checks['total']['combos']), 21)
+    assert math.isclose(checks['construction']['max'], beam.results.max_deflection('pre_comp_service'))
+    assert math.isclose(checks['total']['limit'], 30 * 12 / 240)
+
+    relaxed = beam.check_deflections(limits={'construction': 180, 'live': 240, 'total': 120})
+    assert relaxed['passes'] and not checks['passes']
+
+    shored = replace(beam, shored=True)
+    shored.analyze()
+    shored_checks = shored.check_deflections()
+    assert shored_checks['construction']['max'] == 0
+    assert shored_checks['total']['max'] < checks['total']['max']
+
+def test_batch_across_catalog(test_beam):
+    catalog = load_catalog()
+    columns = {field: catalog.column(field) for field in ('Ix', 'area', 'd', 'weight')}
+    beff = test_beam.calc_effective_width() * 12
+    x = np.linspace(0, 30, 21)
+    E = test_beam.steel_material.E
+
+    C_full = np.minimum(columns['area'] * 50, 0.85 * 4.0 * beff * 3.5)
+    I_LB = serviceability.lower_bound_I(columns['Ix'], columns['area'], columns['d'], 50, C_full, 4.0, beff, 3.5, 3.0)
+    shape = serviceability.udl_shape(30, x)
+    self_weight = columns['weight'][:, None] / 1000 * shape
+    shapes = {'D': 0.5 * shape + self_weight, 'CD': 0.5 * shape + self_weight, 'L': np.broadcast_to(1.3 * shape, self_weight.shape), 'CL': np.broadcast_to(0.2 * shape, self_weight.shape)}
+
+    checks = serviceability.check_deflections(shapes, 30, E * columns['Ix'], E * I_LB, False)
+    assert checks['passes'].shape == (len(catalog),)
+
+    single = replace(test_beam).check_deflections(sum_Qn=test_beam.calc_full_comp_C())
+    i = catalog.index('W16X26')
+    assert math.isclose(checks['total']['max'][i], single['total']['max'], rel_tol=1e-3)
@@ -0,0 +1,11 @@
+from modules import startup
+import os
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_no_heavy_dependencies_at_startup():
+    for module in ['app_logic', 'modules.beam']:
+        report = startup.startup_report(module, cwd=repo_dir)
+
+        assert report['heavy_dependencies'] == []
+        assert report['slowest'][0]['cumulative_us'] >= report['slowest'][-1]['cumulative_us']
@@ -0,0 +1,58 @@
+import math
+from dataclasses import replace
+import numpy as np
+import modules.stiffness as stiffness
+from modules.analysis import StiffnessResults
+from modules.superposition import SpanLoads
+from modules.load import PointLoad, UniformLoad
+
+EI = 29000 * 301.0
+
+def test_matches_closed_form(test_beam):
+    beam = replace(test_beam, loads=test_beam.loads + [
+        UniformLoad(name='Partial', load_case='L', magnitude=0.8, start_loc=4.5, end_loc=17.3),
+        PointLoad(name='Point', load_case='D', magnitude=6.0, location=11.1),
+    ])
+    closed_form = replace(beam).analyze()
+    results = replace(beam).analyze(engine='stiffness')
+
+    assert results.combos() == closed_form.combos()
+    for combo in results.combos():
+        assert np.allclose(results.reactions(combo), closed_form.reactions(combo))
+        assert math.isclose(results.max_moment(combo), closed_form.max_moment(combo))
+        assert math.isclose(results.max_shear(combo), closed_form.max_shear(combo))
+        assert math.isclose(results.min_shear(combo), closed_form.min_shear(combo))
+        assert math.isclose(results.max_deflection(combo), closed_form.max_deflection(combo), rel_tol=1e-4)
+
+        for diagram in ['moment_array', 'shear_array', 'deflection_array']:
+            assert np.allclose(getattr(results, diagram)(combo, 13), getattr(closed_form, diagram)(combo, 13), atol=1e-6)
+
+def test_fixed_ends_match_handbook():
+    w = 1.2
+    udl = {'udl': SpanLoads(30, dist_start=[0], dist_end=[30], dist_w=[w])}
+    L_in = 360
+
+    fixed = StiffnessResults(stiffness.StiffnessModel(30, EI, ('fixed', 'fixed')), udl)
+    assert math.isclose(fixed.min_moment('udl'), -w * 30**2 / 12)
+    assert math.isclose(fixed.max_moment('udl'), w * 30**2 / 24)
+    assert math.isclose(fixed.max_deflection('udl'), w / 12 * L_in**4 / (384 * EI))
+
+    propped = StiffnessResults(stiffness.StiffnessModel(30, EI, ('fixed', 'pin')), udl)
+    assert np.allclose(propped.reactions('udl'), (5 / 8 * w * 30, 3 / 8 * w * 30))
+    assert math.isclose(propped.moment('udl', 0.0), -w * 30**2 / 8)
+    assert math.isclose(propped.max_moment('udl'), 9 / 128 * w * 30**2)
+
+def test_many_load_sets_share_one_factorization():
+    stiffness.model_cache.clear()
+    rng = np.random.default_rng(0)
+    loads = {f'LC{i}': SpanLoads(30, point_x=rng.uniform(0, 30, 3), point_P=rng.uniform(0, 10, 3)) for i in range(200)}
+
+    model = stiffness.get_model(30, EI)
+    results = StiffnessResults(model, loads)
+    assert stiffness.get_model(30, EI) is model
+    assert stiffness.model_cache.info()['hits'] == 1
+    assert results.displacements.shape == (model.n_dof, 200)
+
+    x = np.linspace(0, 30, 7)
+    for combo in ('LC0', 'LC199'):
+        assert np.allclose(results.deflection_array(combo, 7)[1], loads[combo].deflection(x, EI))
@@ -0,0 +1,43 @@
+import pytest
+from modules import studs
+import numpy as np
+import math
+
+@pytest.fixture
+def analyzed_beam(test_beam):
+    test_beam.analyze()
+    return test_beam
+
+def test_stud_strength(analyzed_beam):
+    test_beam = analyzed_beam
+    # AISC Manual Table 3-21: 3/4 in. stud, one per rib in the weak position, 4 ksi normal weight concrete.
+    assert math.isclose(test_beam.calc_stud_strength(), 17.2, rel_tol=0.01)
+
+def test_min_studs_matches_enumeration(analyzed_beam):
+    test_beam = analyzed_beam
+    Qn = test_beam.calc_stud_strength()
+    C_full = test_beam.calc_full_comp_C()
+
+    for Mu in [100, 250, 305.01, 330, 380]:
+        solution = test_beam.calc_min_studs(Mu)
+
+        count = math.ceil(0.25 * C_full / Qn)
+        while count * Qn < C_full and test_beam.calc_partial_comp_moment_capacity(count * Qn) < Mu:
+            count += 1
+
+        assert solution['adequate'] == (test_beam.calc_partial_comp_moment_capacity(count * Qn) >= Mu)
+        if solution['adequate']:
+            assert solution['studs_per_half_span'] == count
+            assert solution['phi_Mn'] >= Mu
+            assert math.isclose(solution['percent_comp'], min(count * Qn / C_full, 1.0))
+
+def test_min_studs_batch(analyzed_beam):
+    test_beam = analyzed_beam
+    Mu = np.linspace(100, 350, 1000)
+    single = [test_beam.calc_min_studs(value)['studs_per_half_span'] for value in Mu[::100]]
+    batch = studs.min_studs(
+        Mu=Mu, Qn=test_beam.calc_stud_strength(), C_full=test_beam.calc_full_comp_C(), min_comp=0.25, max_comp=1.0,
+        As=7.68, Fy=50, d=15.7, bf=5.5, tf=0.345, tw=0.25, fc=4.0, beff=90, t_s=3.5, deck_height=3.0)
+
+    assert batch['studs_per_half_span'][::100].tolist() == single
+    assert np.all(np.diff(batch['studs_per_half_span']) >= 0)
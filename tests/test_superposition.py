@@ -0,0 +1,79 @@
+import math
+from dataclasses import replace
+import numpy as np
+import modules.load_factors as load_factors
+from modules.superposition import SpanLoads
+from modules.load import PointLoad, UniformLoad
+
+def test_single_loads_match_handbook():
+    EI = 29000 * 301.0
+    point = SpanLoads(30, point_x=[10], point_P=[12])
+    assert point.reactions() == (8.0, 4.0)
+    assert math.isclose(point.moment(point.critical_x()).max(), 12 * 10 * 20 / 30)
+    assert point.shear(10, right=False) == 8.0 and point.shear(10) == -4.0
+
+    # Partial uniform load from a to b: maximum moment where shear is zero, x = a + R1 / w.
+    partial = SpanLoads(30, dist_start=[6], dist_end=[18], dist_w=[2.0])
+    R1, R2 = partial.reactions()
+    assert math.isclose(R1, 24 * 18 / 30) and math.isclose(R1 + R2, 24)
+    x_max = 6 + R1 / 2
+    assert math.isclose(partial.moment(partial.critical_x()).max(), R1 * x_max - 2 * (x_max - 6)**2 / 2)
+
+    full = SpanLoads(30, dist_start=[0], dist_end=[30], dist_w=[1.2])
+    assert math.isclose(full.extreme_deflections(EI)[0], 5 * 0.1 * 360**4 / (384 * EI))
+
+def test_many_loads_in_one_pass():
+    rng = np.random.default_rng(0)
+    x_P, P = rng.uniform(0, 30, 2000), rng.uniform(0, 1, 2000)
+    starts = rng.uniform(0, 25, 500)
+    w = rng.uniform(0, 0.2, 500)
+    loads = SpanLoads(30, point_x=x_P, point_P=P, dist_start=starts, dist_end=starts + 5, dist_w=w)
+
+    # Reference: the dense matrix form of each singularity function.
+    x = np.linspace(0, 30, 41)
+    R1 = loads.reactions()[0]
+    reference = R1 * x - np.clip(x[:, None] - x_P, 0, None) @ P \
+        - (np.clip(x[:, None] - starts, 0, None)**2 - np.clip(x[:, None] - starts - 5, 0, None)**2) @ w / 2
+    assert np.allclose(loads.moment(x), reference)
+    assert math.isclose(sum(loads.reactions()), P.sum() + 5 * w.sum())
+
+    M_max = loads.moment(loads.critical_x()).max()
+    assert M_max >= loads.moment(np.linspace(0, 30, 5001)).max() - 1e-9
+
+def test_beam_partial_and_point_loads_match_pynite(test_beam):
+    beam = replace(test_beam, loads=test_beam.loads + [
+        UniformLoad('Partial', 'L', 2.0, 5.0, 12.0),
+        PointLoad('Point', 'D', 6.0, 20.0),
+    ])
+    factored = beam.factored_loads['comp_factored']
+    assert factored['partial_loads'] == [(5.0, 12.0, 3.2)]
+
+    closed_form = beam.analyze()
+    pynite = beam.analyze('pynite')
+    for combo in closed_form.combos():
+        assert math.isclose(closed_form.max_moment(combo), pynite.max_moment(combo))
+        assert np.allclose(closed_form.reactions(combo), pynite.reactions(combo))
+        assert np.allclose(closed_form.deflection_array(combo, 30), pynite.deflection_array(combo, 30))
+
+def brute_force_max_moment(beam, load_combos):
+    # Largest moment of every combination, pruned or not, on a dense grid.
+    x = np.linspace(0, beam.span, 3001)
+    moments = {}
+    for name, factors in load_combos.items():
+        loads = SpanLoads.from_factored_loads(beam.span, beam.generate_factored_loads({name: factors}))
+        moments[name] = loads.moment(x).max()
+    return max(moments.values())
+
+def test_point_load_near_support_governs_by_moment(test_beam):
+    beam = replace(test_beam, loads=[UniformLoad('D', 'D', 1.0, 0, 30), PointLoad('L', 'L', 10.0, 1.0)])
+    results = beam.analyze()
+
+    assert beam.factored_loads['comp_factored']['combo'] == 'LC1' # 1.4D, though 1.2D + 1.6L has the larger total load
+    assert math.isclose(results.max_moment('comp_factored'), brute_force_max_moment(beam, load_factors.ASCE_7_LRFD_COMBOS), rel_tol=1e-6)
+
+def test_partial_load_near_support_governs_by_moment(test_beam):
+    beam = replace(test_beam, loads=[UniformLoad('D', 'D', 1.0, 0, 30), UniformLoad('L', 'L', 6.0, 0, 2.0)])
+    results = beam.analyze()
+
+    assert beam.factored_loads['comp_factored']['combo'] == 'LC1'
+    assert math.isclose(results.max_moment('comp_factored'), brute_force_max_moment(beam, load_factors.ASCE_7_LRFD_COMBOS), rel_tol=1e-6)
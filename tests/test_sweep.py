@@ -0,0 +1,66 @@
+from modules.beam import CompositeSteelBeam
+from modules.load import UniformLoad
+from modules.material import Steel, Concrete
+from modules import sweep
+from steelpy import aisc
+import numpy as np
+from dataclasses import replace
+import math
+
+test_beam = CompositeSteelBeam(
+    name='Composite Beam',
+    span=30,
+    shape=aisc.W_shapes.W16X26,
+    shored=False,
+    layout=(('Beam', 8.0), ('Beam', 8.0)),
+    studs={'fu': 65, 'dia': 0.75, 'length': 5.0, 'max_comp': 1.0, 'min_comp': 0.25},
+    deck={'t_s': 3.5, 'deck_height': 3.0, 'orientation': 90},
+    steel_material=Steel(
+        name='Steel',
+        poisson_ratio=0.3,
+        density=490,
+        E=29000,
+        fy=50,
+        fu=65),
+    concrete_material=Concrete(
+        name='Concrete',
+        poisson_ratio=0.2,
+        density=145,
+        fc=4.0),
+    loads=[
+        UniformLoad(name='Uniform Dead Load', load_case='D', magnitude=0.5, start_loc=0, end_loc=30),
+        UniformLoad(name='Uniform Construction Dead Load', load_case='CD', magnitude=0.5, start_loc=0, end_loc=30),
+        UniformLoad(name='Uniform Live Load', load_case='L', magnitude=1.3, start_loc=0, end_loc=30),
+        UniformLoad(name='Uniform Construction Live Load', load_case='CL', magnitude=0.2, start_loc=0, end_loc=30)
+    ]
+)
+
+results = sweep.sweep_sections(test_beam)
+
+def test_sweep_covers_catalog():
+    assert len(results['name']) == len(aisc.W_shapes.sections)
+
+def test_sweep_matches_scalar_checks():
+    for section in ['W16X26', 'W12X26', 'W21X48', 'W14X90']:
+        beam = replace(test_beam, shape=getattr(aisc.W_shapes, section))
+        i = list(results['name']).index(section)
+
+        assert results['flange_is_compact'][i] == beam.flange_is_compact()
+        assert results['flange_is_slender'][i] == beam.flange_is_slender()
+        assert results['web_is_compact'][i] == beam.web_is_compact()
+        assert math.isclose(results['pre_comp_phi_Mn'][i], beam.calc_pre_comp_strength())
+        assert math.isclose(results['full_comp_phi_Mn'][i], beam.calc_full_comp_moment_capacity())
+
+def test_sweep_demand():
+    i = list(results['name']).index('W16X26')
+    w = 1.2 * (0.5 + 0.026) + 1.6 * 1.3
+
+    assert math.isclose(results['comp_Mu'][i], w * 30**2 / 8)
+    assert math.isclose(results['comp_ratio'][i], results['comp_Mu'][i] / results['full_comp_phi_Mn'][i])
+
+def test_lightest_passing_section():
+    name = sweep.lightest_passing_section(results)
+    passing_weights = results['weight'][results['passes']]
+
+    assert name in results['name'][results['passes']]
+    assert aisc.W_shapes.sections[name].weight == np.min(passing_weights)
@@ -0,0 +1,49 @@
+import math
+from dataclasses import replace
+import numpy as np
+from modules.catalog import load_catalog
+from modules.sweep import sweep_sections
+from modules.vibration import beam_mode, check_vibration, sweep_vibration
+
+def test_beam_mode_by_hand():
+    # W21X44 at 10 ft spacing, 36 ft span, 3.25 in normal weight slab on 3 in deck.
+    Is, As, d, E, Ec = 843, 13.0, 20.7, 29000, 3644
+    results = beam_mode(Is, As, d, 44, 36, 10, 3.25, 3, E, Ec, 145, dead_load=4, live_load=11, deck_weight=2, damping=0.025)
+
+    n = E / (1.35 * Ec)
+    b_t = 10 * 12 / n # spacing governs the effective width, 0.4 L = 14.4 ft
+    y_slab = d + 3 + 3.25 / 2
+    y_bar = (As * d / 2 + b_t * 3.25 * y_slab) / (As + b_t * 3.25)
+    I_comp = Is + As * (y_bar - d / 2)**2 + b_t * 3.25**3 / 12 + b_t * 3.25 * (y_slab - y_bar)**2
+    w = 10 * (145 * 4.75 / 12 + 2 + 4 + 11) / 1000 + 0.044
+    fn = 0.18 * math.sqrt(386 / (5 * w / 12 * (36 * 12)**4 / (384 * E * I_comp)))
+    W = w / 10 * 2.0 * ((4.75**3 / n) / (I_comp / 10))**0.25 * 36 * 36
+
+    assert math.isclose(results['I_comp'], I_comp)
+    assert math.isclose(results['fn'], fn)
+    assert math.isclose(results['ap_g'], 0.065 * math.exp(-0.35 * fn) / (0.025 * W))
+
+def test_sweep_matches_single_beam(test_beam):
+    catalog = load_catalog('W_shapes')
+    spans = np.array([20.0, 30.0, 40.0])
+    results = sweep_vibration(test_beam, spans=spans)
+    assert results['fn'].shape == (3, len(catalog))
+    assert np.array_equal(results['name'], sweep_sections(test_beam)['name'])
+
+    # Frequency drops and acceleration rises with span.
+    assert np.all(np.diff(results['fn'], axis=0) < 0)
+
+    for name in ('W16X26', 'W24X55'):
+        i = catalog.index(name)
+        for j, span in enumerate(spans):
+            beam = replace(test_beam, span=float(span), shape=catalog.section(name))
+            single = check_vibration(beam)
+            assert math.isclose(results['fn'][j, i], single['fn'])
+            assert math.isclose(results['ap_g'][j, i], single['ap_g'])
+            assert results['passes'][j, i] == single['passes']
+
+def test_edge_beam_and_damping(test_beam):
+    interior = check_vibration(test_beam)
+    edge = check_vibration(replace(test_beam, layout=(('Edge', 1.0), ('Beam', 8.0))))
+    assert edge['W'] < interior['W']
+    assert math.isclose(check_vibration(test_beam, damping=0.05)['ap_g'], interior['ap_g'] / 2)